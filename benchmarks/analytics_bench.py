@@ -0,0 +1,112 @@
+"""NumPy analytics engine against the snapshot's SQL on the same tables.
+
+Loads a generated dataset (see dataset.py) into analytics.AnalyticsEngine
+and times every aggregate view, plus a few ad-hoc group-by/top-K queries,
+against the equivalent query on the SQLite snapshot. Each pair is checked
+for the same rows; "ties" marks results that only differ in the order of
+rows with equal counts, which SQL leaves unspecified.
+
+    python benchmarks/analytics_bench.py --scale 1000000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import dataset
+from analytics import AnalyticsEngine, np
+from snapshot import SnapshotStore
+
+ROLES = {"director": "Best Director", "actor": "Best Actor", "actress": "Best Actress"}
+
+def cases(engine, store):
+    """(name, engine call, SQL call) for every compared query"""
+    return [
+        ("top_actor_birth_countries", engine.top_actor_birth_countries, store.get_top_actor_birth_countries),
+        ("top_production_companies", engine.top_production_companies, store.get_top_production_companies),
+        ("staff_by_country('France')", lambda: engine.staff_by_country("France"),
+         lambda: store.get_staff_by_country("France")),
+        ("dream_team_rows(top_k=3)", lambda: engine.dream_team_rows(ROLES, 3),
+         lambda: store.get_dream_team_rows(ROLES, 3)),
+        ("non_english_oscar_winners", engine.non_english_oscar_winners, store.get_non_english_oscar_winners),
+        ("nominations per category, 1990s",
+         lambda: engine.count_by("nominations", "category", {"year": list(range(1990, 2000))}),
+         lambda: store._query("""
+             SELECT category, COUNT(*) AS count FROM nominations
+             WHERE year BETWEEN 1990 AND 1999
+             GROUP BY category ORDER BY count DESC, category
+         """)),
+        ("oscars per nominee country",
+         lambda: engine.count_by("oscars", "staff.birth_country"),
+         lambda: store._query("""
+             SELECT s.birth_country, COUNT(*) AS count FROM oscars o
+             JOIN staff s ON o.staff_id = s.id
+             GROUP BY s.birth_country ORDER BY count DESC
+         """)),
+        ("top 10 movies by nominations, Best Picture",
+         lambda: engine.top_nominated_movies("Best Picture"),
+         lambda: store._query("""
+             SELECT m.title, COUNT(*) AS nomination_count FROM nominations n
+             JOIN movies m ON n.movie_id = m.id
+             WHERE n.category = 'Best Picture'
+             GROUP BY m.id ORDER BY nomination_count DESC, m.id LIMIT 10
+         """)),
+    ]
+
+def timed(call, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = call()
+        times.append(time.perf_counter() - started)
+    return result, statistics.median(times)
+
+def compare(engine_result, sql_result):
+    engine_rows = list(engine_result.tuples())
+    sql_rows = list(sql_result.tuples())
+    if engine_rows == sql_rows:
+        return "same"
+    if sorted(map(repr, engine_rows)) == sorted(map(repr, sql_rows)):
+        return "same, ties"
+    counts = [row[-1] for row in engine_rows]
+    # Top-K cut inside a tie: the same counts, different rows at the boundary
+    if counts == [row[-1] for row in sql_rows]:
+        return "ties"
+    return "DIFFERENT"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the NumPy analytics engine with snapshot SQL")
+    parser.add_argument("--scale", type=int, default=1_000_000, help="nominations rows (default 1000000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data", help="dataset path (default: generated in the temp directory)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per query (median reported)")
+    args = parser.parse_args(argv)
+    if np is None:
+        print("numpy is not installed")
+        return 1
+
+    path = dataset.ensure(args.scale, args.seed, args.data,
+                          progress=lambda table, rows: print(f"  generated {rows:,} {table}"))
+    engine = AnalyticsEngine.load(path)
+    print(f"engine: {len(engine):,} rows loaded in {engine.load_seconds:.2f}s, "
+          f"{engine.nbytes / 1e6:.1f} MB of numeric arrays\n")
+    store = SnapshotStore(path)
+    failed = 0
+    try:
+        print(f"{'query':<44}{'engine':>12}{'sql':>12}{'speedup':>10}  result")
+        for name, engine_call, sql_call in cases(engine, store):
+            engine_result, engine_time = timed(engine_call, args.repeat)
+            sql_result, sql_time = timed(sql_call, args.repeat)
+            outcome = compare(engine_result, sql_result)
+            failed += outcome == "DIFFERENT"
+            print(f"{name:<44}{engine_time * 1000:>10.2f}ms{sql_time * 1000:>10.1f}ms"
+                  f"{sql_time / engine_time if engine_time else 0:>9.0f}x  {outcome}")
+    finally:
+        store.close()
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Throughput of bulk registration: the validation pass and the real insert.
+
+Measures the chunked validation that Database.bulk_register_users runs before
+its per-chunk duplicate query and executemany insert, then the whole
+bulk_register_users call (validation, duplicate query, executemany and a
+commit per chunk) against a fresh embedded SQLite database.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from database import Database, SQLiteBackend, _chunks, _prepare_registrations
+
+SIZES = [10_000, 100_000, 1_000_000]
+CHUNK_SIZE = 1000
+
+def make_rows(count):
+    """Registration rows with roughly 1% invalid emails and dates"""
+    rows = []
+    for i in range(count):
+        rows.append({
+            'username': f"user{i}",
+            'email': f"user{i}@example.com" if i % 100 else f"user{i}-at-example",
+            'birth_date': f"19{50 + i % 50}-{1 + i % 12:02d}-{1 + i % 28:02d}" if i % 97 else "not-a-date",
+            'gender': "Other",
+            'country': "USA"
+        })
+    return rows
+
+def batched(rows, today):
+    """Validate rows through the chunked bulk-registration pass"""
+    valid = 0
+    rejected = []
+    for chunk in _chunks(enumerate(rows, 1), CHUNK_SIZE):
+        valid += len(_prepare_registrations(chunk, today, rejected))
+    return valid
+
+def inserted(rows):
+    """Register rows into an empty SQLite database; return (inserted, seconds)"""
+    directory = tempfile.mkdtemp(prefix="movie-awards-bench-")
+    db = Database(SQLiteBackend(os.path.join(directory, "users.db")))
+    try:
+        if not db.connect():
+            raise RuntimeError("could not open the SQLite database")
+        db.cache = None
+        start = time.perf_counter()
+        report = db.bulk_register_users(rows, chunk_size=CHUNK_SIZE)
+        elapsed = time.perf_counter() - start
+        if report.error:
+            raise RuntimeError(report.error)
+        return report.inserted, elapsed
+    finally:
+        db.close()
+        shutil.rmtree(directory)
+
+def main():
+    today = date.today()
+    print(f"{'rows':>9} {'valid':>9} {'validate/s':>12} {'inserted':>9} {'insert/s':>12}")
+    for size in SIZES:
+        rows = make_rows(size)
+        start = time.perf_counter()
+        valid = batched(rows, today)
+        elapsed = time.perf_counter() - start
+        count, seconds = inserted(rows)
+        print(f"{size:>9} {valid:>9} {size / elapsed:>12,.0f} {count:>9} {count / seconds:>12,.0f}")
+
+if __name__ == "__main__":
+    main()
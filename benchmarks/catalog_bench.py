@@ -0,0 +1,139 @@
+"""Open and lookup cost of the memory-mapped staff catalog against loading it.
+
+Generates a staff table of --rows seeded rows into a SQLite file with the
+snapshot schema, then compares the two ways the app can hold it:
+
+- load: SELECT the whole table and build StaffRecords, i.e. deserializing
+  the catalog into Python objects on every launch
+- catalog: write the catalog file once (catalog.write_catalog), then open
+  it with mmap and look rows up by id and by row index
+
+The catalog is also opened from a second process, which maps the same file
+and so reads the pages the first one already brought into the page cache.
+
+    python benchmarks/catalog_bench.py --rows 5000000
+"""
+import argparse
+import gc
+import os
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+import dataset
+from catalog import Catalog, CATALOGS, write_catalog
+from models import StaffRecord
+from snapshot import SCHEMA, CATALOG_SQL
+
+LOOKUPS = 100_000
+
+CHILD = """
+import random, sys, time
+sys.path.insert(0, {src!r})
+from catalog import Catalog
+started = time.perf_counter()
+catalog = Catalog({path!r})
+opened = time.perf_counter() - started
+rng = random.Random(1)
+ids = [rng.randint(1, len(catalog)) for _ in range(10000)]
+started = time.perf_counter()
+for record_id in ids:
+    catalog.get(record_id)
+print(opened * 1000, (time.perf_counter() - started) / len(ids) * 1e6)
+"""
+
+def generate(path, rows):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    rng = random.Random(0)
+    staff = dataset._staff(rng, rows)
+    columns = CATALOGS["staff"].names
+    conn.executemany("INSERT INTO staff (id, name, birth_country, role, is_alive) VALUES (?, ?, ?, ?, ?)",
+                     (tuple(row[name] for name in columns) for row in staff))
+    conn.commit()
+    conn.close()
+
+def load_records(path):
+    conn = sqlite3.connect(path)
+    try:
+        return [StaffRecord(*row) for row in conn.execute(CATALOG_SQL["staff"])]
+    finally:
+        conn.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the mmap staff catalog with loading the table")
+    parser.add_argument("--rows", type=int, default=5_000_000, help="staff rows (default 5000000)")
+    parser.add_argument("--opens", type=int, default=20, help="catalog opens to time")
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(prefix="movie-awards-catalog-")
+    database = os.path.join(directory, "staff.db")
+    path = os.path.join(directory, "staff.catalog")
+    try:
+        started = time.perf_counter()
+        generate(database, args.rows)
+        print(f"{args.rows:,} staff rows generated in {time.perf_counter() - started:.1f}s")
+
+        gc.collect()
+        tracemalloc.start()
+        started = time.perf_counter()
+        records = load_records(database)
+        load_time = time.perf_counter() - started
+        load_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del records
+        gc.collect()
+
+        conn = sqlite3.connect(database)
+        started = time.perf_counter()
+        write_catalog(path, CATALOGS["staff"], conn.execute(CATALOG_SQL["staff"]))
+        write_time = time.perf_counter() - started
+        conn.close()
+
+        opens = []
+        for _ in range(args.opens):
+            started = time.perf_counter()
+            catalog = Catalog(path)
+            opens.append(time.perf_counter() - started)
+            catalog.close()
+
+        catalog = Catalog(path)
+        rng = random.Random(0)
+        ids = [rng.randint(1, args.rows) for _ in range(LOOKUPS)]
+        started = time.perf_counter()
+        for record_id in ids:
+            catalog.get(record_id)
+        get_time = (time.perf_counter() - started) / LOOKUPS
+        started = time.perf_counter()
+        for record_id in ids:
+            catalog.row(record_id - 1)
+        row_time = (time.perf_counter() - started) / LOOKUPS
+
+        child = subprocess.run([sys.executable, "-c", CHILD.format(src=SRC, path=path)],
+                               capture_output=True, text=True, check=True)
+        child_open, child_get = (float(value) for value in child.stdout.split())
+
+        print(f"\nload table into StaffRecords  {load_time * 1000:>10.1f} ms  {load_memory / 1e6:>8.1f} MB")
+        print(f"write catalog (one pass)      {write_time * 1000:>10.1f} ms  "
+              f"{os.path.getsize(path) / 1e6:>8.1f} MB on disk")
+        print(f"open catalog (median)         {statistics.median(opens) * 1000:>10.3f} ms")
+        print(f"catalog.get(id)               {get_time * 1e6:>10.2f} us")
+        print(f"catalog.row(index)            {row_time * 1e6:>10.2f} us")
+        print(f"second process: open {child_open:.3f} ms, get(id) {child_get:.2f} us")
+        catalog.close()
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""Seeded synthetic Oscars dataset for the benchmark suite.
+
+Writes staff, movies, production companies, nominations and Oscars into a
+local SQLite file with the snapshot schema, so Database can answer every
+reference query offline through open_snapshot(). The app's user and
+user_nominations tables are seeded too, so the same file opened with the
+SQLite backend serves the user-facing queries. The same scale and seed
+always produce the same rows. Further registrations and user nominations
+are produced as in-memory records for the bulk write paths.
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+from datetime import date
+from itertools import islice
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from database import SQLiteBackend, _age_on
+from snapshot import SnapshotStore, MIRRORED_TABLES
+
+CATEGORIES = ["Best Picture", "Best Director", "Best Actor", "Best Actress",
+              "Best Supporting Actor", "Best Supporting Actress", "Best Original Song",
+              "Best Original Screenplay", "Best Adapted Screenplay", "Best Cinematography",
+              "Best Original Score", "Best Film Editing"]
+ROLES = ["Actor", "Actress", "Director", "Producer", "Singer", "Writer", "Composer", "Editor"]
+# Weighted so a few countries dominate, like the real data
+COUNTRIES = ["USA"] * 12 + ["UK"] * 5 + ["France"] * 3 + ["Italy", "Germany", "Canada", "Australia",
+             "Japan", "South Korea", "Mexico", "Spain", "India", "Ireland", "Sweden", "Brazil"]
+LANGUAGES = ["English"] * 8 + ["French", "Korean", "Spanish", "Italian", "Japanese", "German"]
+FIRST = ["Meryl", "Denzel", "Frances", "Daniel", "Cate", "Tom", "Penélope", "Joaquin",
+         "Olivia", "Bong", "Kathryn", "Alfonso", "Guillermo", "Chloé", "Emma", "Anthony"]
+LAST = ["Streep", "Washington", "McDormand", "Day-Lewis", "Blanchett", "Hanks", "Cruz",
+        "Phoenix", "Colman", "Joon-ho", "Bigelow", "Cuarón", "del Toro", "Zhao", "Stone"]
+WORDS = ["Night", "River", "Star", "Last", "City", "Dream", "Silent", "Golden", "King",
+         "Road", "Summer", "Ghost", "Heart", "Shadow", "Glory", "Parasite"]
+
+GENDERS = ["Male", "Female", "Other"]
+
+BATCH_SIZE = 50_000
+# Seeded ages are computed on a fixed day so the rows stay reproducible
+AGE_ON = date(2025, 1, 1)
+
+def table_sizes(scale):
+    """Row counts per table for a given scale (the nominations row count)"""
+    return {
+        'production_companies': max(10, scale // 1000),
+        'staff': max(100, scale // 10),
+        'movies': max(100, scale // 10),
+        'nominations': scale,
+        'oscars': max(20, scale // 20),
+        'user': max(1000, scale // 100),
+        'user_nominations': max(100, scale // 10),
+    }
+
+def default_path(scale, seed):
+    return os.path.join(tempfile.gettempdir(), f"movie-awards-bench-{scale}-{seed}.db")
+
+def _staff(rng, count):
+    for i in range(1, count + 1):
+        yield {'id': i, 'name': f"{rng.choice(FIRST)} {rng.choice(LAST)} {i}",
+               'birth_country': rng.choice(COUNTRIES), 'role': rng.choice(ROLES),
+               'is_alive': int(rng.random() < 0.7)}
+
+def _movies(rng, count, companies):
+    for i in range(1, count + 1):
+        released = date(rng.randint(1929, 2024), rng.randint(1, 12), rng.randint(1, 28))
+        yield {'id': i, 'title': f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}",
+               'release_date': released, 'language': rng.choice(LANGUAGES),
+               'production_company_id': rng.randint(1, companies)}
+
+def _companies(count):
+    for i in range(1, count + 1):
+        yield {'id': i, 'name': f"Studio {i}"}
+
+def _awards(rng, count, staff, movies):
+    for i in range(1, count + 1):
+        yield {'id': i, 'staff_id': rng.randint(1, staff), 'movie_id': rng.randint(1, movies),
+               'category': rng.choice(CATEGORIES), 'year': rng.randint(1929, 2024)}
+
+def _users(rng, count):
+    for i in range(1, count + 1):
+        born = date(rng.randint(1940, 2005), rng.randint(1, 12), rng.randint(1, 28))
+        yield (i, f"member{i}", f"member{i}@example.com", born.isoformat(), _age_on(born, AGE_ON),
+               rng.choice(GENDERS), rng.choice(COUNTRIES))
+
+def _user_nominations(rng, count, sizes):
+    for i in range(1, count + 1):
+        yield (i, rng.randint(1, sizes['user']), rng.randint(1, sizes['staff']),
+               rng.randint(1, sizes['movies']), rng.choice(CATEGORIES))
+
+USER_TABLES = [
+    ('user', "INSERT INTO user (id, Username, EmailAddress, BirthDate, Age, Gender, Country) "
+             "VALUES (?, ?, ?, ?, ?, ?, ?)"),
+    ('user_nominations', "INSERT INTO user_nominations (id, user_id, staff_id, movie_id, category) "
+                         "VALUES (?, ?, ?, ?, ?)"),
+]
+
+def _seed_users(path, sizes, seed, progress=None):
+    """Fill the app's user tables through the SQLite backend's schema"""
+    # A separate stream keeps the reference rows identical to older datasets
+    rng = random.Random(f"{seed}:users")
+    rows = {
+        'user': _users(rng, sizes['user']),
+        'user_nominations': _user_nominations(rng, sizes['user_nominations'], sizes),
+    }
+    connection = SQLiteBackend(path).connect()
+    try:
+        raw = connection.raw
+        for table, sql in USER_TABLES:
+            source = rows[table]
+            while True:
+                batch = list(islice(source, BATCH_SIZE))
+                if not batch:
+                    break
+                raw.execute("BEGIN")
+                raw.executemany(sql, batch)
+                raw.execute("COMMIT")
+            if progress:
+                progress(table, sizes[table])
+    finally:
+        connection.close()
+
+def _user_nomination_count(path):
+    """Seeded user nominations in a dataset file; 0 for files without user tables"""
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute("SELECT COUNT(*) FROM user_nominations").fetchone()[0]
+    except sqlite3.OperationalError:
+        return 0
+    finally:
+        connection.close()
+
+def generate(path, scale, seed=0, progress=None):
+    """Write a complete dataset to path (replacing any existing file)"""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    sizes = table_sizes(scale)
+    rng = random.Random(seed)
+    rows = {
+        'production_companies': _companies(sizes['production_companies']),
+        'staff': _staff(rng, sizes['staff']),
+        'movies': _movies(rng, sizes['movies'], sizes['production_companies']),
+        'nominations': _awards(rng, sizes['nominations'], sizes['staff'], sizes['movies']),
+        'oscars': _awards(rng, sizes['oscars'], sizes['staff'], sizes['movies']),
+    }
+    store = SnapshotStore(path)
+    try:
+        for spec in MIRRORED_TABLES:
+            source = rows[spec.name]
+            while True:
+                batch = list(islice(source, BATCH_SIZE))
+                if not batch:
+                    break
+                store.apply_batch(spec, batch, batch[-1]['id'])
+            if progress:
+                progress(spec.name, sizes[spec.name])
+    finally:
+        store.close()
+    _seed_users(path, sizes, seed, progress)
+    return path
+
+def ensure(scale, seed=0, path=None, progress=None):
+    """Return the path of a complete dataset, generating it if needed"""
+    path = path or default_path(scale, seed)
+    if os.path.exists(path):
+        store = SnapshotStore(path)
+        try:
+            complete = store.is_ready() and store.watermarks().get('nominations') == scale
+        finally:
+            store.close()
+        if complete and _user_nomination_count(path) == table_sizes(scale)['user_nominations']:
+            return path
+    return generate(path, scale, seed, progress)
+
+def registrations(count, seed=0, start=0):
+    """Registration records with roughly 1% invalid and 1% duplicate rows
+
+    Usernames and emails are numbered from start, so successive batches
+    can be inserted into the same database without colliding.
+    """
+    rng = random.Random(f"{seed}:{start}" if start else seed)
+    rows = []
+    for i in range(start, start + count):
+        n = i if i % 100 else i - 1
+        rows.append({
+            'username': f"user{n}",
+            'email': f"user{n}@example.com" if i % 97 else f"user{n}-at-example",
+            'birth_date': f"{rng.randint(1940, 2005)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            'gender': rng.choice(["Male", "Female", "Other"]),
+            'country': rng.choice(COUNTRIES)
+        })
+    return rows
+
+def user_nominations(count, scale, seed=0):
+    """User nomination records referencing existing users, staff and movies by id"""
+    rng = random.Random(seed)
+    sizes = table_sizes(scale)
+    return [{'user_id': rng.randint(1, sizes['user']), 'staff_id': rng.randint(1, sizes['staff']),
+             'movie_id': rng.randint(1, sizes['movies']), 'category': rng.choice(CATEGORIES)}
+            for _ in range(count)]
@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from results_view import VirtualResultsView
+
+COLUMNS = ["title", "language", "year", "category"]
+SIZES = [1_000, 10_000, 100_000]
+
+def make_rows(count):
+    """Build result rows shaped like get_non_english_oscar_winners output"""
+    return [
+        {'title': f"Movie {i}", 'language': "Korean", 'year': 1950 + i % 75, 'category': "Best Picture"}
+        for i in range(count)
+    ]
+
+def bench_plain_treeview(root, rows):
+    """Insert and clear every row the way the results pane used to"""
+    tree = ttk.Treeview(root, show="headings", columns=COLUMNS)
+    tree.pack(fill=tk.BOTH, expand=True)
+    root.update()
+    
+    start = time.perf_counter()
+    for i, item in enumerate(rows):
+        tree.insert("", tk.END, iid=i, values=[item.get(col, "") for col in COLUMNS])
+    root.update()
+    insert_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for item in tree.get_children():
+        tree.delete(item)
+    root.update()
+    clear_time = time.perf_counter() - start
+    
+    tree.destroy()
+    return insert_time, clear_time
+
+def bench_virtual_view(root, rows):
+    """Load and clear the same rows through VirtualResultsView"""
+    view = VirtualResultsView(root)
+    view.pack(fill=tk.BOTH, expand=True)
+    root.update()
+    
+    start = time.perf_counter()
+    view.set_rows(rows, COLUMNS)
+    root.update()
+    insert_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    view.clear()
+    root.update()
+    clear_time = time.perf_counter() - start
+    
+    view.frame.destroy()
+    return insert_time, clear_time
+
+def main():
+    root = tk.Tk()
+    root.geometry("800x600")
+    
+    print(f"{'rows':>8} {'view':>8} {'insert ms':>10} {'clear ms':>10}")
+    for size in SIZES:
+        rows = make_rows(size)
+        for name, bench in (("plain", bench_plain_treeview), ("virtual", bench_virtual_view)):
+            insert_time, clear_time = bench(root, rows)
+            print(f"{size:>8} {name:>8} {insert_time * 1000:>10.1f} {clear_time * 1000:>10.1f}")
+    
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
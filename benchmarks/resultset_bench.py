@@ -0,0 +1,113 @@
+"""Memory and build cost of result representations at large row counts.
+
+Builds the same staff-shaped result (id, name, birth_country, role,
+is_alive) as a list of per-row dicts (what the DictCursor used to return),
+a plain ResultSet over the driver's row tuples, a ResultSet with the
+low-cardinality columns dictionary-encoded (what the data-access layer
+returns), slot records (StaffRecord.from_rows) and plain dataclasses
+(Staff.from_rows). For each it reports the Python memory still held once
+the driver's rows are released (tracemalloc), the time to build it, to
+read one column back out and to filter on birth_country.
+
+    python benchmarks/resultset_bench.py --rows 1000000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from models import Staff, StaffRecord
+from resultset import ResultSet
+
+COLUMNS = ("id", "name", "birth_country", "role", "is_alive")
+COUNTRIES = ["USA", "UK", "France", "Italy", "Japan", "India", "Mexico", "Korea"]
+ROLES = ["Actor", "Director", "Producer", "Singer"]
+
+def make_tuples(count):
+    """Row tuples as a tuple cursor's fetchall() returns them
+
+    Drivers decode every value into a fresh string, so repeated countries
+    and roles are separate objects here too.
+    """
+    return [(i, f"Person {i}", COUNTRIES[i % len(COUNTRIES)].encode().decode(),
+             ROLES[i % len(ROLES)].encode().decode(), i % 7 != 0)
+            for i in range(1, count + 1)]
+
+def build_dicts(tuples):
+    return [dict(zip(COLUMNS, values)) for values in tuples]
+
+def build_resultset(tuples):
+    return ResultSet(COLUMNS, tuples)
+
+def build_encoded(tuples):
+    return ResultSet.from_description([(name,) for name in COLUMNS], tuples)
+
+def build_records(tuples):
+    return StaffRecord.from_rows(ResultSet(COLUMNS, tuples))
+
+def build_dataclasses(tuples):
+    return Staff.from_rows(ResultSet(COLUMNS, tuples))
+
+def read_names(result):
+    if isinstance(result, ResultSet):
+        return result.column("name")
+    if result and isinstance(result[0], dict):
+        return [row["name"] for row in result]
+    return [row.name for row in result]
+
+def filter_country(result, country="France"):
+    if isinstance(result, ResultSet):
+        return result.where("birth_country", country)
+    if result and isinstance(result[0], dict):
+        return [row for row in result if row["birth_country"] == country]
+    return [row for row in result if row.birth_country == country]
+
+CASES = [
+    ("list of dicts", build_dicts),
+    ("ResultSet", build_resultset),
+    ("encoded", build_encoded),
+    ("slot records", build_records),
+    ("dataclasses", build_dataclasses),
+]
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def measure(build, count):
+    """(retained bytes, build seconds, column read seconds, filter seconds)"""
+    gc.collect()
+    tracemalloc.start()
+    tuples = make_tuples(count)
+    result, build_time = timed(build, tuples)
+    # What the result still holds once the driver's rows are dropped
+    del tuples
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    _, read_time = timed(read_names, result)
+    _, filter_time = timed(filter_country, result)
+    return retained, build_time, read_time, filter_time
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare result representations by memory and build time")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows per result (default 1000000)")
+    args = parser.parse_args(argv)
+
+    print(f"{args.rows:,} staff rows")
+    print(f"{'representation':<16} {'memory MB':>10} {'bytes/row':>10} {'build ms':>10} "
+          f"{'read column ms':>15} {'filter ms':>10}")
+    for name, build in CASES:
+        retained, build_time, read_time, filter_time = measure(build, args.rows)
+        print(f"{name:<16} {retained / 1e6:>10.1f} {retained / args.rows:>10.1f} "
+              f"{build_time * 1000:>10.1f} {read_time * 1000:>15.1f} {filter_time * 1000:>10.1f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
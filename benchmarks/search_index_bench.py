@@ -0,0 +1,67 @@
+"""Build time and query latency of the in-memory name search index.
+
+Indexes synthetic staff names at increasing sizes and times autocomplete
+lookups for one- to three-letter prefixes and two-word queries, the inputs
+the dialog fields send while the user types.
+"""
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from search_index import SearchIndex
+
+SIZES = [10_000, 100_000, 1_000_000]
+QUERIES = 2000
+
+FIRST = ["Meryl", "Denzel", "Frances", "Daniel", "Cate", "Tom", "Penélope", "Joaquin",
+         "Olivia", "Bong", "Kathryn", "Alfonso", "Guillermo", "Chloé", "Emma", "Anthony"]
+LAST = ["Streep", "Washington", "McDormand", "Day-Lewis", "Blanchett", "Hanks", "Cruz",
+        "Phoenix", "Colman", "Joon-ho", "Bigelow", "Cuarón", "del Toro", "Zhao", "Stone"]
+
+def make_names(count, rng):
+    """Two- or three-token names with a numeric suffix so most are distinct"""
+    names = []
+    for i in range(count):
+        name = f"{rng.choice(FIRST)} {rng.choice(LAST)} {i:x}"
+        names.append((i + 1, name))
+    return names
+
+def make_queries(names, rng):
+    queries = []
+    for _ in range(QUERIES):
+        _, name = rng.choice(names)
+        first, last = name.split(" ")[:2]
+        queries.append(rng.choice([first[:1], first[:3], last[:2], f"{first} {last[:2]}"]))
+    return queries
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+def main():
+    rng = random.Random(13)
+    print(f"{'names':>9} {'build s':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for size in SIZES:
+        names = make_names(size, rng)
+        queries = make_queries(names, rng)
+        index = SearchIndex()
+        start = time.perf_counter()
+        index.build(names)
+        built = time.perf_counter() - start
+        # Settle the collector so a gen-2 pass over the new index is not timed as a query
+        gc.collect()
+
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        print(f"{size:>9} {built:>9.2f} {percentile(timings, 0.5):>8.3f} "
+              f"{percentile(timings, 0.99):>8.3f} {timings[-1]:>8.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Staff statistics index against the per-lookup SQL it replaces.
+
+Builds staff_stats.StaffStatsIndex from a generated dataset (see
+dataset.py) in one pass and times single lookups and a batch of 10k ids,
+both from the index and from the snapshot's SQL (one grouped join per
+lookup). It then appends rows to the dataset and times an
+incremental refresh. The sampled ids and the batch are checked to give
+the same stats either way.
+
+    python benchmarks/staff_stats_bench.py --scale 1000000
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import dataset
+from snapshot import SnapshotStore, MIRRORED_TABLES
+from staff_stats import StaffStatsIndex, STAFF_STATS_COLUMNS
+
+def refresh(index, store):
+    return index.update(**{table: store.iter_staff_stats_rows(table, index.watermarks[table])
+                           for table in STAFF_STATS_COLUMNS})
+
+def append_nominations(store, count, rng, staff_count, movie_count):
+    """Add count nominations after the current ones, as a sync would"""
+    start = store.watermarks()['nominations'] + 1
+    rows = [{'id': start + i, 'staff_id': rng.randint(1, staff_count), 'movie_id': rng.randint(1, movie_count),
+             'category': rng.choice(dataset.CATEGORIES), 'year': rng.randint(1929, 2025)}
+            for i in range(count)]
+    spec = next(spec for spec in MIRRORED_TABLES if spec.name == 'nominations')
+    store.apply_batch(spec, rows, rows[-1]['id'])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the staff statistics index with per-lookup SQL")
+    parser.add_argument("--scale", type=int, default=1_000_000, help="nominations rows (default 1000000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data", help="dataset path (default: generated in the temp directory)")
+    parser.add_argument("--lookups", type=int, default=1000, help="single SQL lookups to time")
+    parser.add_argument("--batch", type=int, default=10_000, help="ids per batch lookup")
+    args = parser.parse_args(argv)
+
+    source = dataset.ensure(args.scale, args.seed, args.data,
+                            progress=lambda table, rows: print(f"  generated {rows:,} {table}"))
+    sizes = dataset.table_sizes(args.scale)
+    # The incremental step appends rows, so work on a copy
+    directory = tempfile.mkdtemp(prefix="movie-awards-stats-")
+    path = os.path.join(directory, "stats.db")
+    shutil.copy(source, path)
+    store = SnapshotStore(path)
+    try:
+        index = StaffStatsIndex()
+        started = time.perf_counter()
+        refresh(index, store)
+        build_time = time.perf_counter() - started
+
+        rng = random.Random(args.seed)
+        ids = [rng.randint(1, sizes['staff']) for _ in range(args.lookups)]
+        started = time.perf_counter()
+        expected = [store.get_staff_stats(staff_id) for staff_id in ids]
+        sql_single = (time.perf_counter() - started) / len(ids)
+        mismatches = sum(index.get(staff_id) != stats for staff_id, stats in zip(ids, expected))
+
+        get = index.get
+        rounds = 1_000_000
+        probe = ids * (rounds // len(ids) + 1)
+        started = time.perf_counter()
+        for staff_id in probe[:rounds]:
+            get(staff_id)
+        index_single = (time.perf_counter() - started) / rounds
+
+        batch = [rng.randint(1, sizes['staff']) for _ in range(args.batch)]
+        timings = []
+        for _ in range(5):
+            started = time.perf_counter()
+            found = index.get_many(batch)
+            timings.append(time.perf_counter() - started)
+        index_batch = min(timings)
+        started = time.perf_counter()
+        sql_found = {}
+        for offset in range(0, len(batch), 500):
+            sql_found.update(store.get_staff_stats_many(batch[offset:offset + 500]))
+        sql_batch = time.perf_counter() - started
+        mismatches += found != sql_found
+
+        append_nominations(store, 10_000, rng, sizes['staff'], sizes['movies'])
+        started = time.perf_counter()
+        touched = refresh(index, store)
+        refresh_time = time.perf_counter() - started
+
+        print(f"\nbuild index (one pass)      {build_time * 1000:>10.0f} ms  {len(index):,} staff")
+        print(f"get_staff_stats: SQL        {sql_single * 1e6:>10.1f} us")
+        print(f"get_staff_stats: index      {index_single * 1e9:>10.0f} ns")
+        print(f"{args.batch:,} ids: SQL (IN lists)  {sql_batch * 1000:>10.1f} ms")
+        print(f"{args.batch:,} ids: index           {index_batch * 1000:>10.2f} ms")
+        print(f"refresh after 10,000 rows   {refresh_time * 1000:>10.1f} ms  {touched:,} staff updated")
+        print(f"mismatches                  {mismatches:>10}")
+    finally:
+        store.close()
+        shutil.rmtree(directory)
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Cold-start cost of the application: import time and time to first window.
+
+Import phase: runs ``python -X importtime -c "import gui"`` in fresh
+interpreters and reports the median total plus the modules with the largest
+self time, i.e. the candidates for deferring.
+
+First window: launches the app (``src/main.py``, or a built executable with
+--exe) with MOVIE_AWARDS_STARTUP_EXIT set, so it prints its startup
+milestones once the window is idle and quits. The wall time is measured
+from process spawn, so it includes interpreter start-up and, for a onefile
+build, unpacking. The app runs against a throwaway SQLite database with the
+warm-up off, so no server is contacted. Needs a display; without one only
+the import phase is reported.
+
+    python benchmarks/startup_bench.py --runs 10
+    python benchmarks/startup_bench.py --exe "dist/Movie Awards Oracle/Movie Awards Oracle"
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+def parse_importtime(stderr):
+    """(self_us, cumulative_us, module) for each -X importtime line"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+def import_run(module):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=SRC, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return parse_importtime(result.stderr)
+
+def first_window_run(command, env):
+    started = time.perf_counter()
+    result = subprocess.run(command, env=env, capture_output=True, text=True, timeout=60)
+    wall = time.perf_counter() - started
+    for line in result.stdout.splitlines():
+        if line.startswith("STARTUP "):
+            return wall, json.loads(line[len("STARTUP "):])
+    tail = (result.stderr.strip().splitlines() or ["no output"])[-1]
+    raise RuntimeError(f"no startup report ({tail})")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure import time and time to first window")
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per measurement")
+    parser.add_argument("--module", default="gui", help="module whose import is timed (default gui)")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    parser.add_argument("--exe", help="time this built executable instead of src/main.py")
+    args = parser.parse_args(argv)
+
+    totals = []
+    runs = []
+    for _ in range(args.runs):
+        rows = import_run(args.module)
+        runs.append(rows)
+        totals.append(next(cumulative for _, cumulative, name in rows if name == args.module))
+    print(f"import {args.module}: median {statistics.median(totals) / 1000:.1f} ms "
+          f"(min {min(totals) / 1000:.1f}, max {max(totals) / 1000:.1f}) over {args.runs} runs")
+
+    # Median self time per module across runs
+    self_times = {}
+    for rows in runs:
+        for self_us, _, name in rows:
+            self_times.setdefault(name, []).append(self_us)
+    slowest = sorted(self_times.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    print(f"\n{'module':<40} {'self ms':>8}")
+    for name, samples in slowest[:args.top]:
+        print(f"{name:<40} {statistics.median(samples) / 1000:>8.2f}")
+
+    directory = tempfile.mkdtemp(prefix="movie-awards-startup-")
+    env = dict(os.environ, MOVIE_AWARDS_STARTUP_EXIT="1", MOVIE_AWARDS_BACKEND="sqlite",
+               MOVIE_AWARDS_DB_PATH=os.path.join(directory, "startup.db"), MOVIE_AWARDS_WARMUP="off")
+    command = [args.exe] if args.exe else [sys.executable, os.path.join(SRC, "main.py")]
+    walls = []
+    reports = []
+    try:
+        for _ in range(args.runs):
+            wall, report = first_window_run(command, env)
+            walls.append(wall)
+            reports.append(report)
+    except Exception as e:
+        print(f"\nTime to first window: skipped ({e})")
+        return 0
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+    print(f"\nTime to first window (from spawn): median {statistics.median(walls) * 1000:.1f} ms "
+          f"(min {min(walls) * 1000:.1f}, max {max(walls) * 1000:.1f})")
+    print("In-process milestones (median ms since main()):")
+    for name in reports[0]:
+        samples = [report[name] for report in reports if name in report]
+        print(f"  {name:<30} {statistics.median(samples):>8.1f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+"""Reproducible benchmark suite over a seeded local Oscars dataset.
+
+Generates (or reuses) a synthetic dataset at the requested scale, points a
+Database at it through the local snapshot and times every read method,
+the paged and streamed listings, name search and the client-side bulk
+write paths. Each case reports latency percentiles, throughput and peak
+Python memory. Results can be saved as a baseline and later runs compared
+against it; a case whose median slows down by more than --threshold is
+reported as a regression and makes the run exit non-zero.
+
+    python benchmarks/suite.py --scale 100000 --save-baseline baseline.json
+    python benchmarks/suite.py --scale 100000 --baseline baseline.json
+
+Runs offline: no database server is needed. By default the dataset is read
+through the snapshot, which does not cover the server-only methods (user
+nominations, top nominated movies); --backend sqlite opens the same file with
+the embedded SQLite backend and adds those cases, plus the real bulk writes
+(bulk_register_users and bulk_add_nominations, executemany and a commit per
+chunk) run against a throwaway copy of the dataset.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Mapping, Sequence
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import dataset
+from database import Database, SQLiteBackend, DREAM_TEAM_CATEGORIES, _chunks, _prepare_registrations
+from snapshot import SnapshotStore, MIRRORED_TABLES
+
+BULK_ROWS = 10_000
+
+class Workload:
+    """Random but reproducible arguments for the benchmark cases"""
+
+    def __init__(self, scale, seed):
+        self.rng = random.Random(seed)
+        self.sizes = dataset.table_sizes(scale)
+        self.seed = seed
+        self.registrations = dataset.registrations(BULK_ROWS, seed)
+        self.nominations = dataset.user_nominations(BULK_ROWS, scale, seed)
+        self._registered = BULK_ROWS
+
+    def new_registrations(self):
+        """A batch of registrations whose usernames no earlier batch used"""
+        rows = dataset.registrations(BULK_ROWS, self.seed, start=self._registered)
+        self._registered += BULK_ROWS
+        return rows
+
+    def staff_id(self):
+        return self.rng.randint(1, self.sizes['staff'])
+
+    def country(self):
+        return self.rng.choice(dataset.COUNTRIES)
+
+    def prefix(self):
+        return self.rng.choice(dataset.FIRST)[:self.rng.randint(1, 4)]
+
+def _count(result):
+    """Rows in a result set, list or (rows, token) page; 1 for single records
+
+    A mapping of groups (the dream team: role -> person or list of people)
+    counts the rows in its groups; a flat mapping is one record.
+    """
+    if isinstance(result, tuple):
+        result = result[0]
+    if isinstance(result, Mapping):
+        groups = [value for value in result.values() if isinstance(value, (Mapping, Sequence))
+                  and not isinstance(value, str)]
+        if not groups:
+            return 1
+        return sum(1 if isinstance(group, Mapping) else len(group) for group in groups)
+    if isinstance(result, Sequence) and not isinstance(result, str):
+        return len(result)
+    return 1
+
+def case_iter_staff(db, work):
+    return sum(1 for _ in db.iter_staff(batch_size=1000))
+
+def case_bulk_register_validate(db, work):
+    """Client-side half of bulk_register_users: chunked parsing and validation"""
+    rejected = []
+    today = date.today()
+    valid = 0
+    for chunk in _chunks(enumerate(work.registrations, 1), 1000):
+        valid += len(_prepare_registrations(chunk, today, rejected))
+    return valid + len(rejected)
+
+def case_bulk_nominations_resolve(db, work):
+    """Client-side half of bulk_add_nominations with every reference already cached"""
+    known_staff = dict.fromkeys(range(1, work.sizes['staff'] + 1), True)
+    movies_by_id = {i: (i, 2000) for i in range(1, work.sizes['movies'] + 1)}
+    for row in work.nominations:
+        Database._resolve_nomination(row, {}, known_staff, {}, movies_by_id)
+    return len(work.nominations)
+
+def _inserted(report):
+    if report.error:
+        raise RuntimeError(report.error)
+    return report.inserted
+
+def case_bulk_register_users(db, work):
+    """bulk_register_users end to end: validation, duplicate lookup, executemany and commit"""
+    return _inserted(db.bulk_register_users(work.new_registrations()))
+
+def case_bulk_add_nominations(db, work):
+    """bulk_add_nominations end to end: reference lookups, executemany and commit per chunk"""
+    return _inserted(db.bulk_add_nominations(work.nominations))
+
+def case_sync_apply(db, work):
+    """Snapshot write path: one batched, transactional upsert of staff rows"""
+    directory = tempfile.mkdtemp(prefix="movie-awards-bench-")
+    path = os.path.join(directory, "apply.db")
+    store = SnapshotStore(path)
+    try:
+        rows = list(dataset._staff(random.Random(0), BULK_ROWS))
+        store.apply_batch(MIRRORED_TABLES[0], rows, rows[-1]['id'])
+    finally:
+        store.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        os.rmdir(directory)
+    return BULK_ROWS
+
+# (name, callable(db, workload) -> rows processed)
+CASES = [
+    ("get_staff_stats", lambda db, w: db.get_staff_stats(w.staff_id())),
+    ("get_top_actor_birth_countries", lambda db, w: db.get_top_actor_birth_countries()),
+    ("get_staff_by_country", lambda db, w: db.get_staff_by_country(w.country())),
+    ("get_dream_team", lambda db, w: db.get_dream_team(DREAM_TEAM_CATEGORIES, top_k=3)),
+    ("get_top_production_companies", lambda db, w: db.get_top_production_companies()),
+    ("get_non_english_oscar_winners", lambda db, w: db.get_non_english_oscar_winners()),
+    ("get_staff_list", lambda db, w: db.get_staff_list()),
+    ("get_staff_page", lambda db, w: db.get_staff_page()),
+    ("get_staff_by_country_page", lambda db, w: db.get_staff_by_country_page(w.country())),
+    ("get_non_english_oscar_winners_page", lambda db, w: db.get_non_english_oscar_winners_page()),
+    ("iter_staff", case_iter_staff),
+    ("search_staff", lambda db, w: db.search_staff(w.prefix())),
+    ("search_movies", lambda db, w: db.search_movies(w.prefix())),
+    ("bulk_register_users:validate", case_bulk_register_validate),
+    ("bulk_add_nominations:resolve", case_bulk_nominations_resolve),
+    ("sync:apply_batch", case_sync_apply),
+]
+
+# Only answerable by a backend, not by the snapshot
+BACKEND_CASES = [
+    ("get_user_nominations", lambda db, w: db.get_user_nominations(w.rng.randint(1, w.sizes['user']))),
+    ("get_top_nominated_movies", lambda db, w: db.get_top_nominated_movies()),
+]
+
+# Real bulk inserts; run against a copy of the dataset so it stays reusable
+WRITE_CASES = [
+    ("bulk_register_users", case_bulk_register_users),
+    ("bulk_add_nominations", case_bulk_add_nominations),
+]
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def run_case(db, work, fn, repeat):
+    """Time repeat calls after one warm-up, then measure one call's peak memory"""
+    fn(db, work)
+    timings = []
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(db, work)
+        timings.append(time.perf_counter() - started)
+        rows += result if isinstance(result, int) else _count(result)
+    tracemalloc.start()
+    fn(db, work)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    total = sum(timings)
+    return {
+        'calls': repeat,
+        'p50_ms': percentile(timings, 0.50) * 1000,
+        'p95_ms': percentile(timings, 0.95) * 1000,
+        'rows_per_second': rows / total if total > 0 else 0.0,
+        'peak_kib': peak / 1024,
+    }
+
+def compare(results, baseline, threshold):
+    """Print per-case median change against a baseline; return the regressed case names"""
+    regressions = []
+    print(f"\n{'case':<36} {'base p50':>10} {'p50':>10} {'change':>8}")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<36} {'-':>10} {result['p50_ms']:>10.3f} {'new':>8}")
+            continue
+        change = (result['p50_ms'] - before['p50_ms']) / before['p50_ms'] if before['p50_ms'] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<36} {before['p50_ms']:>10.3f} {result['p50_ms']:>10.3f} {change:>+8.1%}{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Database against a seeded local dataset")
+    parser.add_argument("--scale", type=int, default=10_000,
+                        help="nominations rows; other tables are sized from it (default 10000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=20, help="timed calls per case")
+    parser.add_argument("--data", help="dataset file (default: a per-scale file in the temp dir)")
+    parser.add_argument("--cases", help="comma-separated case names to run (default: all)")
+    parser.add_argument("--cached", action="store_true", help="keep the result cache on (default: off)")
+    parser.add_argument("--backend", choices=("snapshot", "sqlite"), default="snapshot",
+                        help="read the dataset through the snapshot or the SQLite backend")
+    parser.add_argument("--baseline", help="compare against a saved results file")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="median slowdown counted as a regression (default 0.20 = 20%%)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write these results as a baseline")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    path = dataset.ensure(args.scale, args.seed, args.data,
+                          progress=lambda table, rows: print(f"  generated {rows:,} {table}"))
+    print(f"Dataset: {path} ({time.perf_counter() - started:.1f}s)")
+
+    cases = [(name, fn, None) for name, fn in CASES]
+    scratch = None
+    if args.backend == "sqlite":
+        scratch = tempfile.mkdtemp(prefix="movie-awards-bench-")
+        writer = Database(SQLiteBackend(shutil.copy(path, os.path.join(scratch, "writes.db"))))
+        db = Database(SQLiteBackend(path))
+        if not db.connect() or not writer.connect():
+            return 1
+        writer.cache = None
+        cases += [(name, fn, None) for name, fn in BACKEND_CASES]
+        cases += [(name, fn, writer) for name, fn in WRITE_CASES]
+    else:
+        db = Database()
+        if not db.open_snapshot(path):
+            print("Dataset is incomplete; delete it and run again")
+            return 1
+    if not args.cached:
+        db.cache = None
+    db.load_search_indexes()
+    work = Workload(args.scale, args.seed)
+
+    selected = set(args.cases.split(",")) if args.cases else None
+    results = {}
+    print(f"\n{'case':<36} {'p50 ms':>10} {'p95 ms':>10} {'rows/s':>12} {'peak KiB':>10}")
+    for name, fn, target in cases:
+        if selected is not None and name not in selected:
+            continue
+        # Per-case seeding keeps arguments identical when only some cases run
+        work.rng = random.Random(f"{args.seed}:{name}")
+        result = results[name] = run_case(target or db, work, fn, args.repeat)
+        print(f"{name:<36} {result['p50_ms']:>10.3f} {result['p95_ms']:>10.3f} "
+              f"{result['rows_per_second']:>12,.0f} {result['peak_kib']:>10,.0f}")
+    if scratch is not None:
+        writer.close()
+        shutil.rmtree(scratch)
+
+    report = {
+        'scale': args.scale,
+        'seed': args.seed,
+        'backend': args.backend,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cases': results,
+    }
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved baseline to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if (baseline.get('scale'), baseline.get('seed')) != (args.scale, args.seed):
+            print(f"\nWarning: baseline was recorded at scale {baseline.get('scale')}, "
+                  f"seed {baseline.get('seed')}")
+        regressions = compare(results, baseline.get('cases', {}), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,374 @@
+import os
+import sqlite3
+import time
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+
+try:
+    import numpy as np
+except ImportError:  # optional; Database answers every view with SQL without it
+    np = None
+
+from resultset import ResultSet, dictionary
+
+# Mirrored tables loaded into column arrays: (column, kind, SQL expression).
+# "code" columns hold codes of the shared resultset dictionaries, "int"
+# columns store NULL as NULL_INT, "text" columns are object arrays.
+TABLES: Dict[str, Tuple[Tuple[str, str, str], ...]] = {
+    "staff": (
+        ("id", "int", "id"),
+        ("name", "text", "name"),
+        ("birth_country", "code", "birth_country"),
+        ("role", "code", "role"),
+        ("is_alive", "bool", "COALESCE(is_alive, 0)"),
+    ),
+    "movies": (
+        ("id", "int", "id"),
+        ("title", "text", "title"),
+        ("year", "int", "COALESCE(CAST(substr(release_date, 1, 4) AS INTEGER), -1)"),
+        ("language", "code", "language"),
+        ("production_company_id", "int", "COALESCE(production_company_id, -1)"),
+    ),
+    "nominations": (
+        ("id", "int", "id"),
+        ("staff_id", "int", "COALESCE(staff_id, -1)"),
+        ("movie_id", "int", "COALESCE(movie_id, -1)"),
+        ("category", "code", "category"),
+        ("year", "int", "COALESCE(year, -1)"),
+    ),
+    "oscars": (
+        ("id", "int", "id"),
+        ("staff_id", "int", "COALESCE(staff_id, -1)"),
+        ("movie_id", "int", "COALESCE(movie_id, -1)"),
+        ("category", "code", "category"),
+        ("year", "int", "COALESCE(year, -1)"),
+    ),
+    "production_companies": (
+        ("id", "int", "id"),
+        ("name", "text", "name"),
+    ),
+}
+
+# Foreign keys resolved to row positions once at load time, so joins are
+# array gathers; a dotted column such as "staff.birth_country" follows them
+REFERENCES: Dict[Tuple[str, str], str] = {
+    ("nominations", "staff_id"): "staff",
+    ("nominations", "movie_id"): "movies",
+    ("oscars", "staff_id"): "staff",
+    ("oscars", "movie_id"): "movies",
+    ("movies", "production_company_id"): "production_companies",
+}
+
+NULL_INT = -1
+
+def enabled_from_environment() -> bool:
+    """False when MOVIE_AWARDS_ANALYTICS is set to off/0/false/no"""
+    return os.environ.get("MOVIE_AWARDS_ANALYTICS", "on").strip().lower() not in ("off", "0", "false", "no")
+
+class AnalyticsEngine:
+    """In-process aggregates over the mirrored Oscar tables, held as NumPy columns
+
+    Every table is loaded once into one array per column, with the
+    low-cardinality text columns as integer codes and each foreign key
+    resolved to the row position it references. Group-by, top-K and filter
+    queries then run as boolean masks, gathers, ``bincount`` and
+    ``argpartition`` instead of SQL. The view methods return the same rows
+    as the matching SnapshotStore methods. The arrays are never modified
+    after loading, so one engine can serve several threads.
+    """
+
+    def __init__(self, columns: Dict[str, Dict[str, Any]]):
+        if np is None:
+            raise RuntimeError("numpy is not installed")
+        self.columns = columns
+        self.kinds = {table: {name: kind for name, kind, _ in spec} for table, spec in TABLES.items()}
+        self.rows_of: Dict[Tuple[str, str], Any] = {}
+        for (table, column), target in REFERENCES.items():
+            self.rows_of[(table, column)] = self._positions(target, columns[table][column])
+        self.load_seconds = 0.0
+
+    @classmethod
+    def load(cls, path: str, batch_size: int = 100_000) -> "AnalyticsEngine":
+        """Read every table from a SQLite file with the snapshot schema"""
+        started = time.perf_counter()
+        conn = sqlite3.connect(path)
+        try:
+            columns = {table: _load_table(conn, table, spec, batch_size) for table, spec in TABLES.items()}
+        finally:
+            conn.close()
+        engine = cls(columns)
+        engine.load_seconds = time.perf_counter() - started
+        return engine
+
+    def __len__(self) -> int:
+        return sum(len(columns["id"]) for columns in self.columns.values())
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the numeric arrays (text columns not included)"""
+        arrays = list(self.rows_of.values())
+        for table, columns in self.columns.items():
+            arrays.extend(array for name, array in columns.items() if self.kinds[table][name] != "text")
+        return sum(array.nbytes for array in arrays)
+
+    def _positions(self, table: str, ids: Any) -> Any:
+        """Row positions of ids in a table (ids there are sorted), NULL_INT where absent"""
+        table_ids = self.columns[table]["id"]
+        if not len(table_ids):
+            return np.full(len(ids), NULL_INT, dtype=np.int64)
+        positions = np.searchsorted(table_ids, ids)
+        positions[positions >= len(table_ids)] = 0
+        return np.where(table_ids[positions] == ids, positions, NULL_INT)
+
+    # Generic building blocks
+
+    def column(self, table: str, name: str) -> Tuple[Any, Optional[Any]]:
+        """Values of a column for every row of table, and a mask of rows that have them
+
+        A dotted name follows foreign keys, e.g. ``column("oscars",
+        "movies.production_companies.name")``; the mask is None when every
+        row has a value.
+        """
+        *path, leaf = name.split(".")
+        positions = None
+        current = table
+        for target in path:
+            column = next((column for (source, column), referenced in REFERENCES.items()
+                           if source == current and referenced == target), None)
+            if column is None:
+                raise KeyError(f"{current} has no reference to {target}")
+            step = self.rows_of[(current, column)]
+            if positions is None:
+                positions = step
+            else:
+                positions = np.where(positions >= 0, step[np.maximum(positions, 0)], NULL_INT)
+            current = target
+        values = self.columns[current][leaf]
+        if positions is None:
+            return values, None
+        valid = positions >= 0
+        return values[np.maximum(positions, 0)], (None if valid.all() else valid)
+
+    def _kind(self, table: str, name: str) -> Tuple[str, str]:
+        """(kind, leaf column name) of a possibly dotted column"""
+        *path, leaf = name.split(".")
+        return self.kinds[path[-1] if path else table][leaf], leaf
+
+    def mask(self, table: str, where: Optional[Dict[str, Any]] = None) -> Any:
+        """Boolean mask of the rows matching every condition
+
+        where maps a (possibly dotted) column to a value or to a list, tuple
+        or set of values; conditions on code columns compare codes.
+        """
+        mask = np.ones(len(self.columns[table]["id"]), dtype=bool)
+        for name, wanted in (where or {}).items():
+            values, valid = self.column(table, name)
+            kind, leaf = self._kind(table, name)
+            many = isinstance(wanted, (list, tuple, set, frozenset))
+            wanted = list(wanted) if many else [wanted]
+            if kind == "code":
+                wanted = [code for code in map(dictionary(leaf).code, wanted) if code is not None]
+            if len(wanted) == 1:
+                mask &= values == wanted[0]
+            else:
+                mask &= np.isin(values, wanted)
+            if valid is not None:
+                mask &= valid
+        return mask
+
+    def count_by(self, table: str, column: str, where: Optional[Dict[str, Any]] = None,
+                 top: Optional[int] = None) -> ResultSet:
+        """Rows per value of a column, largest first, as (column, count)
+
+        e.g. ``count_by("oscars", "staff.birth_country", {"category":
+        "Best Actor"}, top=5)``.
+        """
+        values, valid = self.column(table, column)
+        mask = self.mask(table, where)
+        if valid is not None:
+            mask &= valid
+        kind, leaf = self._kind(table, column)
+        selected = values[mask]
+        if kind == "code":
+            counts = np.bincount(selected, minlength=len(dictionary(leaf)))
+            keys = np.arange(len(counts))
+        else:
+            keys, counts = np.unique(selected, return_counts=True)
+        order = _top(counts, top)
+        rows = list(zip(keys[order].tolist(), counts[order].tolist()))
+        return ResultSet((leaf, "count"), rows, [leaf] if kind == "code" else ())
+
+    def select(self, table: str, columns: Iterable[str], where: Optional[Dict[str, Any]] = None,
+               limit: Optional[int] = None) -> ResultSet:
+        """Matching rows of table in id order, projected onto (possibly dotted) columns"""
+        columns = [(name, *self.column(table, name)) for name in columns]
+        mask = self.mask(table, where)
+        for _, _, valid in columns:
+            if valid is not None:
+                mask &= valid
+        taken = np.flatnonzero(mask)[:limit]
+        data = []
+        encoded = []
+        for name, values, _ in columns:
+            kind, leaf = self._kind(table, name)
+            if kind == "code":
+                encoded.append(leaf)
+            data.append(_output(values[taken], kind))
+        leaves = [name.split(".")[-1] for name, _, _ in columns]
+        return ResultSet(leaves, list(zip(*data)) if data else [], encoded)
+
+    # The aggregate views of Database / SnapshotStore
+
+    def top_actor_birth_countries(self) -> ResultSet:
+        """Top 5 birth countries of Best Actor winners; staff without one are not counted"""
+        result = self.count_by("oscars", "staff.birth_country", {"category": "Best Actor"})
+        no_country = dictionary("birth_country").code(None)
+        rows = [row for row in result.rows if row[0] != no_country][:5]
+        return ResultSet(("birth_country", "winner_count"), rows, ("birth_country",))
+
+    def top_production_companies(self) -> ResultSet:
+        """Top 5 production companies by Oscars won"""
+        film = self.rows_of[("oscars", "movie_id")]
+        company = np.where(film >= 0, self.rows_of[("movies", "production_company_id")][np.maximum(film, 0)],
+                           NULL_INT)
+        counts = np.bincount(company[company >= 0], minlength=len(self.columns["production_companies"]["id"]))
+        order = _top(counts, 5)
+        names = self.columns["production_companies"]["name"][order].tolist()
+        return ResultSet(("name", "oscar_count"), list(zip(names, counts[order].tolist())))
+
+    def staff_by_country(self, country: str) -> ResultSet:
+        """Nominated staff born in a country with their categories and totals, in id order"""
+        staff = self.columns["staff"]
+        code = dictionary("birth_country").code(country)
+        if code is None:
+            return ResultSet(("id", "name", "categories", "nomination_count", "oscar_count"))
+        from_country = staff["birth_country"] == code
+
+        nominated = self.rows_of[("nominations", "staff_id")]
+        nominated = np.flatnonzero((nominated >= 0) & from_country[np.maximum(nominated, 0)])
+        nominee = self.rows_of[("nominations", "staff_id")][nominated]
+        nomination_counts = np.bincount(nominee, minlength=len(staff["id"]))
+        winners = self.rows_of[("oscars", "staff_id")]
+        oscar_counts = np.bincount(winners[winners >= 0], minlength=len(staff["id"]))
+
+        # Distinct categories per person in order of first nomination, as GROUP_CONCAT lists them
+        categories = self.columns["nominations"]["category"][nominated]
+        width = max(len(dictionary("category")), 1)
+        _, first = np.unique(nominee * width + categories, return_index=True)
+        first = first[np.lexsort((first, nominee[first]))]
+        labels = np.array(dictionary("category").values, dtype=object)[categories[first]].tolist()
+        starts = np.flatnonzero(np.diff(nominee[first], prepend=-1)).tolist()
+        lists = [",".join(labels[start:end]) for start, end in zip(starts, starts[1:] + [len(labels)])]
+
+        # Both in staff id order, one entry per nominated person
+        people = np.flatnonzero(nomination_counts)
+        rows = list(zip(staff["id"][people].tolist(), staff["name"][people].tolist(), lists,
+                        nomination_counts[people].tolist(), oscar_counts[people].tolist()))
+        return ResultSet(("id", "name", "categories", "nomination_count", "oscar_count"), rows)
+
+    def dream_team_rows(self, roles: Dict[str, str], top_k: int) -> ResultSet:
+        """Top living Oscar winners per role as ranked (role, name, oscar_count) rows"""
+        staff = self.columns["staff"]
+        winners = self.rows_of[("oscars", "staff_id")]
+        alive = (winners >= 0) & staff["is_alive"][np.maximum(winners, 0)]
+        category_codes = self.columns["oscars"]["category"]
+        rows = []
+        for role in sorted(roles):
+            code = dictionary("category").code(roles[role])
+            if code is None:
+                continue
+            counts = np.bincount(winners[alive & (category_codes == code)], minlength=len(staff["id"]))
+            order = _top(counts, top_k)
+            rows.extend((role, name, count) for name, count in
+                        zip(staff["name"][order].tolist(), counts[order].tolist()))
+        return ResultSet.from_description([("role",), ("name",), ("oscar_count",)], rows)
+
+    def non_english_oscar_winners(self) -> ResultSet:
+        """Oscar-winning movies not in English, newest first"""
+        movies = self.columns["movies"]
+        film = self.rows_of[("oscars", "movie_id")]
+        language = movies["language"][np.maximum(film, 0)]
+        english = dictionary("language").code("English")
+        no_language = dictionary("language").code(None)
+        keep = film >= 0
+        if english is not None:
+            keep &= language != english
+        if no_language is not None:
+            # SQL's != never matches NULL
+            keep &= language != no_language
+        selected = np.flatnonzero(keep)
+        years = movies["year"][film[selected]]
+        # Newest first; oscar id order within a year, NULL years last
+        selected = selected[np.argsort(-years, kind="stable")]
+        film = film[selected]
+        rows = list(zip(self.columns["oscars"]["id"][selected].tolist(),
+                        movies["title"][film].tolist(),
+                        movies["language"][film].tolist(),
+                        _output(movies["year"][film], "int"),
+                        self.columns["oscars"]["category"][selected].tolist()))
+        return ResultSet(("id", "title", "language", "year", "category"), rows, ("language", "category"))
+
+    def top_nominated_movies(self, category: Optional[str] = None, year: Optional[int] = None,
+                             limit: int = 10) -> ResultSet:
+        """Movies with the most official nominations, optionally in one category and/or year
+
+        Ranks the mirrored nominations table. Database.get_top_nominated_movies
+        ranks the users' nominations, which are not mirrored.
+        """
+        where: Dict[str, Any] = {}
+        if category is not None:
+            where["category"] = category
+        if year is not None:
+            where["year"] = year
+        films = self.rows_of[("nominations", "movie_id")]
+        mask = self.mask("nominations", where) & (films >= 0)
+        counts = np.bincount(films[mask], minlength=len(self.columns["movies"]["id"]))
+        order = _top(counts, limit)
+        return ResultSet(("title", "nomination_count"),
+                         list(zip(self.columns["movies"]["title"][order].tolist(), counts[order].tolist())))
+
+def _load_table(conn: sqlite3.Connection, table: str, spec: Tuple[Tuple[str, str, str], ...],
+                batch_size: int) -> Dict[str, Any]:
+    """One array per column of a table, in id order"""
+    cursor = conn.execute(f"SELECT {', '.join(expression for _, _, expression in spec)} FROM {table} ORDER BY id")
+    parts: List[List[Any]] = [[] for _ in spec]
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        # Convert batch by batch so only one batch of Python rows is alive at a time
+        for (name, kind, _), part, values in zip(spec, parts, zip(*rows)):
+            part.append(_as_array(name, kind, values))
+    return {name: (np.concatenate(part) if part else _as_array(name, kind, ()))
+            for (name, kind, _), part in zip(spec, parts)}
+
+def _as_array(name: str, kind: str, values: Tuple) -> Any:
+    if kind == "code":
+        return np.array(dictionary(name).encode_all(values), dtype=np.int32)
+    if kind == "text":
+        return np.array(values, dtype=object)
+    if kind == "bool":
+        return np.array(values, dtype=bool)
+    return np.array(values, dtype=np.int64)
+
+def _output(values: Any, kind: str) -> List[Any]:
+    """Array values as Python objects, NULL_INT back to None"""
+    if kind == "int" and len(values) and (values == NULL_INT).any():
+        return [None if value == NULL_INT else value for value in values.tolist()]
+    return values.tolist()
+
+def _top(counts: Any, k: Optional[int]) -> Any:
+    """Indices of the k largest non-zero counts, largest first and lowest index first among ties
+
+    Zero counts are groups SQL would not return at all. argpartition finds
+    the k-th largest count without sorting everything; only the candidates
+    at or above it are sorted.
+    """
+    candidates = np.flatnonzero(counts)
+    if k is not None and k <= 0:
+        return candidates[:0]
+    if k is not None and k < len(candidates):
+        present = counts[candidates]
+        threshold = present[np.argpartition(present, len(present) - k)[len(present) - k]]
+        candidates = candidates[present >= threshold]
+    order = candidates[np.lexsort((candidates, -counts[candidates]))]
+    return order[:k]
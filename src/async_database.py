@@ -0,0 +1,235 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future
+from typing import Dict, Any, Optional, Tuple, Callable, Awaitable
+
+try:
+    import aiomysql
+except ImportError:  # optional; AsyncDatabase falls back to worker threads
+    aiomysql = None
+
+from database import Database, PAGE_SIZE, _MISSING, _cacheable
+from resultset import ResultSet
+
+class AsyncDatabase:
+    """asyncio counterpart of Database's read methods
+
+    Server reads go through an aiomysql pool, so independent ``get_*`` calls
+    awaited together (see ``gather``) overlap their round trips instead of
+    each holding a worker thread. The pool's connections are reserved out of
+    the Database's pool_max_size, so the two pools share one budget. Results
+    share the wrapped Database's cache and query stats, and each read runs
+    the same ReadPlan as its synchronous method, so the analytics engine and
+    the local snapshot still answer first. A local backend and installs
+    without aiomysql run the synchronous method on the loop's default
+    executor instead.
+    """
+
+    def __init__(self, db: Database, min_size: int = 1, max_size: Optional[int] = None):
+        self.db = db
+        self.min_size = min_size
+        # Taken out of db.pool_max_size while the pool is open; half by default
+        self.max_size = max_size or max(1, db.pool_max_size // 2)
+        self.pool = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def available(self) -> bool:
+        """True if reads can be sent through aiomysql"""
+        return aiomysql is not None and self.db.backend.dialect == "mysql"
+
+    async def connect(self) -> bool:
+        """Create the aiomysql pool; returns False if the server path is unavailable"""
+        if not self.available:
+            return False
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self.pool is not None:
+                return True
+            size = self.db.reserve_connections(self.max_size)
+            if size == 0:
+                return False
+            backend = self.db.backend
+            try:
+                self.pool = await aiomysql.create_pool(
+                    host=backend.host,
+                    port=backend.port,
+                    user=backend.user,
+                    password=backend.password,
+                    db=backend.database,
+                    autocommit=True,
+                    minsize=min(self.min_size, size),
+                    maxsize=size
+                )
+                return True
+            except Exception as e:
+                print(f"Async database connection error: {e}")
+                self.db.reserve_connections(0)
+                return False
+
+    async def close(self) -> None:
+        """Close the aiomysql pool"""
+        pool, self.pool = self.pool, None
+        if pool is not None:
+            pool.close()
+            await pool.wait_closed()
+            self.db.reserve_connections(0)
+
+    async def gather(self, calls: Dict[str, Tuple[str, Tuple]]) -> Dict[str, Any]:
+        """Run several reads concurrently
+
+        calls maps a label to (method name, args), e.g.
+        ``{"countries": ("get_top_actor_birth_countries", ())}``; returns the
+        results under the same labels.
+        """
+        labels = list(calls)
+        results = await asyncio.gather(*(getattr(self, name)(*args) for name, args in calls.values()))
+        return dict(zip(labels, results))
+
+    async def _fetch(self, name: str, params: Tuple = (), sql: Optional[str] = None) -> ResultSet:
+        """Run a registered query on a pooled connection and return its rows as a ResultSet"""
+        async with self.pool.acquire() as connection:
+            async with connection.cursor() as cursor:
+                await self.db.queries.execute_async(cursor, name, params, sql)
+                return ResultSet.from_description(cursor.description, await cursor.fetchall())
+
+    async def _read(self, method_name: str, *args) -> Any:
+        """Serve one Database read from the cache, its in-process sources or the async pool
+
+        Runs the same ReadPlan as the synchronous method: its sources on the
+        loop's default executor, its server query through aiomysql. Without
+        the async pool the synchronous method runs on the executor instead.
+        """
+        method = getattr(Database, method_name)
+        cache = self.db.cache
+        key = None
+        if cache is not None and hasattr(method, "cache_key"):
+            key = method.cache_key(self.db, *args)
+            value = cache.get(key)
+            if value is not _MISSING:
+                return value
+
+        loop = asyncio.get_running_loop()
+        if not await self.connect():
+            return await loop.run_in_executor(None, functools.partial(getattr(self.db, method_name), *args))
+
+        plan = getattr(self.db, "_plan_" + method_name.lstrip("_"))(*args)
+        value = await loop.run_in_executor(None, self.db._read_locally, plan) if plan.sources else _MISSING
+        if value is _MISSING:
+            try:
+                name = plan.name
+                if plan.leaderboard:
+                    # The periodic check (and refresh) of the summary tables
+                    # runs over the synchronous pool, on a worker thread
+                    name = await loop.run_in_executor(None, self.db._query_name, plan)
+                rows = await self._fetch(name, plan.params, plan.sql)
+                value = plan.shape(rows) if plan.shape else rows
+            except Exception as e:
+                print(f"Error fetching {plan.description}: {e}")
+                return plan.empty
+        if key is not None and _cacheable(value):
+            cache.put(key, value, method.ttl, method.tags)
+        return value
+
+    async def get_user_nominations(self, user_id: int) -> ResultSet:
+        """View existing nominations for the user"""
+        return await self._read("get_user_nominations", user_id)
+
+    async def get_top_nominated_movies(self, category: Optional[str] = None,
+                                       year: Optional[int] = None) -> ResultSet:
+        """View top nominated movies by system users by category/year"""
+        return await self._read("get_top_nominated_movies", category, year)
+
+    async def get_staff_stats(self, staff_id: int) -> Dict[str, Any]:
+        """Show total nominations and Oscars for a given director, actor, or singer"""
+        index = self.db.staff_stats
+        stats = index.get(staff_id) if index is not None else None
+        if stats is not None:
+            return stats
+        return await self._read("_fetch_staff_stats", staff_id)
+
+    async def get_top_actor_birth_countries(self) -> ResultSet:
+        """Show top 5 birth countries for actors who won Best Actor"""
+        return await self._read("get_top_actor_birth_countries")
+
+    async def get_staff_by_country(self, country: str) -> ResultSet:
+        """Show all nominated staff from a given country"""
+        return await self._read("get_staff_by_country", country)
+
+    async def get_dream_team(self, roles: Optional[Dict[str, str]] = None, top_k: int = 1) -> Dict[str, Any]:
+        """Show Best living cast (director, actors, producer, singer)"""
+        return await self._read("get_dream_team", roles, top_k)
+
+    async def get_top_production_companies(self) -> ResultSet:
+        """Get Top 5 production companies by Oscars won"""
+        return await self._read("get_top_production_companies")
+
+    async def get_non_english_oscar_winners(self) -> ResultSet:
+        """List all non-English speaking Oscar-winning movies with year"""
+        return await self._read("get_non_english_oscar_winners")
+
+    async def get_staff_list(self, limit: int = 20) -> ResultSet:
+        """Retrieve a list of staff members"""
+        return await self._read("get_staff_list", limit)
+
+    async def get_staff_page(self, page_token: Optional[str] = None,
+                             page_size: int = PAGE_SIZE) -> Tuple[ResultSet, Optional[str]]:
+        """Fetch one page of staff and the token for the next page"""
+        return await self._read("get_staff_page", page_token, page_size)
+
+    async def get_staff_by_country_page(self, country: str, page_token: Optional[str] = None,
+                                        page_size: int = PAGE_SIZE) -> Tuple[ResultSet, Optional[str]]:
+        """Fetch one page of nominated staff from a country and the token for the next page"""
+        return await self._read("get_staff_by_country_page", country, page_token, page_size)
+
+    async def get_non_english_oscar_winners_page(self, page_token: Optional[str] = None,
+                                                 page_size: int = PAGE_SIZE) -> Tuple[ResultSet, Optional[str]]:
+        """Fetch one page of non-English Oscar winners (newest first) and the token for the next page"""
+        return await self._read("get_non_english_oscar_winners_page", page_token, page_size)
+
+class AsyncBridge:
+    """Runs an asyncio event loop on one background thread for the GUI
+
+    Coroutines are submitted from the Tk thread and their results handed
+    back through ``dispatch``, which should run callbacks on the UI thread
+    (e.g. ``root.after``), as FetchScheduler does.
+    """
+
+    def __init__(self, dispatch: Callable[..., Any]):
+        self.dispatch = dispatch
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="async-bridge", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coroutine: Awaitable[Any],
+               on_done: Optional[Callable[[Any], None]] = None) -> Future:
+        """Schedule a coroutine on the loop and deliver its result to on_done"""
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        future.add_done_callback(lambda f: self._deliver(f, on_done))
+        return future
+
+    def _deliver(self, future: Future, on_done: Optional[Callable[[Any], None]]) -> None:
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            print(f"Error in async fetch: {error}")
+            return
+        if on_done is not None:
+            self.dispatch(on_done, future.result())
+
+    def shutdown(self, cleanup: Optional[Awaitable[Any]] = None, timeout: float = 5.0) -> None:
+        """Optionally await cleanup (e.g. AsyncDatabase.close()), then stop the loop"""
+        if cleanup is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(cleanup, self.loop).result(timeout)
+            except Exception as e:
+                print(f"Error shutting down async loop: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
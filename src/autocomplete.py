@@ -0,0 +1,44 @@
+from tkinter import ttk
+from typing import List, Dict, Any, Optional, Callable
+
+# Keys that move through the suggestion list rather than edit the text
+_NAVIGATION_KEYS = {"Up", "Down", "Left", "Right", "Return", "Escape", "Tab",
+                    "Shift_L", "Shift_R", "Control_L", "Control_R"}
+
+class AutocompleteCombobox(ttk.Combobox):
+    """Entry whose dropdown suggests matching names as the user types
+
+    ``search`` is called on the UI thread with the current text and a result
+    limit, and must be fast (an in-memory index lookup); it returns rows
+    carrying an ``id`` and the ``label_key`` shown in the list. Lookups are
+    debounced so a burst of keystrokes only searches once.
+    """
+
+    def __init__(self, parent, search: Callable[[str, int], List[Dict[str, Any]]],
+                 label_key: str = "name", limit: int = 10, delay_ms: int = 120, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.search = search
+        self.label_key = label_key
+        self.limit = limit
+        self.delay_ms = delay_ms
+        self._matches: Dict[str, int] = {}
+        self._pending = None
+        self.bind("<KeyRelease>", self._on_key)
+
+    def selected_id(self) -> Optional[int]:
+        """Return the id of the suggestion matching the current text, if any"""
+        return self._matches.get(self.get())
+
+    def _on_key(self, event) -> None:
+        if event.keysym in _NAVIGATION_KEYS:
+            return
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+        self._pending = self.after(self.delay_ms, self._refresh)
+
+    def _refresh(self) -> None:
+        self._pending = None
+        text = self.get().strip()
+        rows = self.search(text, self.limit) if text else []
+        self._matches = {row[self.label_key]: row['id'] for row in rows}
+        self["values"] = [row[self.label_key] for row in rows]
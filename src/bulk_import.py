@@ -0,0 +1,72 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from typing import List, Dict, Any, Optional, Iterator
+
+def read_rows(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream rows from a CSV (with header) or JSON Lines file"""
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+
+def print_report(report, max_errors: int = 20) -> None:
+    """Summarize an ImportReport on stdout"""
+    print(f"Inserted {report.inserted} row(s) in {report.chunks} chunk(s) "
+          f"in {report.seconds:.2f}s ({report.rows_per_second:,.0f} rows/s)")
+    if report.rejected:
+        print(f"Rejected {len(report.rejected)} row(s):")
+        for row_number, reason in report.rejected[:max_errors]:
+            print(f"  row {row_number}: {reason}")
+        if len(report.rejected) > max_errors:
+            print(f"  ... and {len(report.rejected) - max_errors} more")
+    if report.error:
+        print(f"Import stopped early: {report.error}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Bulk-load records exported as CSV or JSON Lines"""
+    parser = argparse.ArgumentParser(description="Bulk import Movie Awards Oracle data")
+    subparsers = parser.add_subparsers(dest="kind", required=True)
+
+    nominations = subparsers.add_parser(
+        "nominations",
+        help="import user nominations (user_id, staff_id or staff_name, movie_id or movie_title, category)"
+    )
+    nominations.add_argument("path", help="CSV or JSONL file")
+    nominations.add_argument("--chunk-size", type=int, default=1000, help="rows per transaction")
+
+    users = subparsers.add_parser(
+        "users",
+        help="register users (username, email, birth_date as YYYY-MM-DD, gender, country)"
+    )
+    users.add_argument("path", help="CSV or JSONL file")
+    users.add_argument("--chunk-size", type=int, default=1000, help="rows per transaction")
+
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.path):
+        parser.error(f"file not found: {args.path}")
+
+    from database import Database
+
+    db = Database()
+    if not db.connect():
+        return 1
+    try:
+        if args.kind == "users":
+            report = db.bulk_register_users(read_rows(args.path), chunk_size=args.chunk_size)
+        else:
+            report = db.bulk_add_nominations(read_rows(args.path), chunk_size=args.chunk_size)
+    finally:
+        db.close()
+    print_report(report)
+    return 0 if report.error is None else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,349 @@
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator
+
+from models import StaffRecord, MovieRecord
+from resultset import ResultSet, ENCODED_COLUMNS, dictionary
+from snapshot import default_snapshot_path
+
+# File layout (all offsets in bytes from the start of the file):
+#
+#   header    magic, format version, row count, schema offset, schema length
+#   columns   one 8-byte aligned section per column:
+#               fixed-width   row_count values of the column's struct format
+#               dictionary    row_count codes (B/H/I) into the values in the schema
+#               string        row_count + 1 uint64 offsets into a UTF-8 heap, then the heap
+#             plus, for columns holding NULLs, a bitmap with bit i set for a NULL in row i
+#   schema    UTF-8 JSON: table, byte order, watermark, and per column its
+#             name, kind, format and section offsets
+#
+# The schema sits at the end so the whole file is written in one pass over
+# the rows; the header is filled in last.
+MAGIC = b"MAOCATLG"
+VERSION = 1
+HEADER = struct.Struct("<8sIQQQ")
+
+class CatalogError(Exception):
+    """Raised when a catalog file is missing, truncated or of another format"""
+
+@dataclass(frozen=True)
+class CatalogSpec:
+    """A table kept as a catalog file: its columns, record type and source query
+
+    Column kinds are a struct format for fixed-width numbers, "str" for
+    free text and "dict" for low-cardinality text stored as codes.
+    """
+    table: str
+    columns: Tuple[Tuple[str, str], ...]
+    record: type
+    query: str
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(name for name, _ in self.columns)
+
+CATALOGS: Dict[str, CatalogSpec] = {
+    "staff": CatalogSpec(
+        "staff",
+        (("id", "q"), ("name", "str"), ("birth_country", "dict"), ("role", "dict"), ("is_alive", "b")),
+        StaffRecord,
+        "staff_catalog_stream"
+    ),
+    "movies": CatalogSpec(
+        "movies",
+        (("id", "q"), ("title", "str"), ("year", "i"), ("language", "dict")),
+        MovieRecord,
+        "movies_catalog_stream"
+    ),
+}
+
+def default_catalog_path(table: str, directory: Optional[str] = None) -> str:
+    """Catalog file for a table, next to the local snapshot by default"""
+    if directory is None:
+        directory = os.path.dirname(default_snapshot_path())
+    return os.path.join(directory, f"{table}.catalog")
+
+def _code_format(count: int) -> str:
+    return "B" if count <= 0x100 else "H" if count <= 0x10000 else "I"
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+class _ColumnWriter:
+    """Accumulates one column in compact arrays while the rows stream past"""
+
+    def __init__(self, name: str, kind: str):
+        self.name = name
+        self.kind = kind
+        self.nulls: List[int] = []
+        if kind == "str":
+            self.offsets = array("Q", [0])
+            self.heap = bytearray()
+        elif kind == "dict":
+            self.codes = array("I")
+            self.values: List[Any] = []
+            self.lookup: Dict[Any, int] = {}
+        else:
+            self.data = array(kind)
+
+    def append(self, row: int, value: Any) -> None:
+        if self.kind == "dict":
+            code = self.lookup.get(value)
+            if code is None:
+                code = self.lookup[value] = len(self.values)
+                self.values.append(value)
+            self.codes.append(code)
+            return
+        if value is None:
+            self.nulls.append(row)
+        if self.kind == "str":
+            if value is not None:
+                self.heap += str(value).encode("utf-8")
+            self.offsets.append(len(self.heap))
+        else:
+            self.data.append(0 if value is None else int(value))
+
+    def sections(self) -> Tuple[Dict[str, Any], List[Tuple[str, bytes]]]:
+        """Schema entry (offsets still to be filled in) and the byte sections to write"""
+        entry: Dict[str, Any] = {"name": self.name, "kind": self.kind}
+        if self.kind == "dict":
+            entry["format"] = _code_format(len(self.values))
+            entry["values"] = self.values
+            sections = [("data", array(entry["format"], self.codes).tobytes())]
+        elif self.kind == "str":
+            entry["format"] = "Q"
+            sections = [("data", self.offsets.tobytes()), ("heap", bytes(self.heap))]
+        else:
+            entry["format"] = self.kind
+            sections = [("data", self.data.tobytes())]
+        if self.nulls:
+            bitmap = bytearray((len(self.offsets) - 1 if self.kind == "str" else len(self.data)) // 8 + 1)
+            for row in self.nulls:
+                bitmap[row >> 3] |= 1 << (row & 7)
+            sections.append(("nulls", bytes(bitmap)))
+        return entry, sections
+
+def write_catalog(path: str, spec: CatalogSpec, rows: Iterable[Tuple]) -> int:
+    """Write rows (tuples in spec column order, ascending unique ids) as a catalog file
+
+    The file is written next to its final path and moved into place, so
+    processes that have the old catalog mapped keep reading a consistent
+    copy. Returns the number of rows written.
+    """
+    writers = [_ColumnWriter(name, kind) for name, kind in spec.columns]
+    count = 0
+    last_id = None
+    for values in rows:
+        record_id = values[0]
+        if last_id is not None and record_id <= last_id:
+            raise ValueError(f"Catalog rows must be in ascending id order ({record_id} after {last_id})")
+        last_id = record_id
+        for writer, value in zip(writers, values):
+            writer.append(count, value)
+        count += 1
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    columns = []
+    try:
+        with open(temporary, "wb") as f:
+            f.write(bytes(HEADER.size))
+            for writer in writers:
+                entry, sections = writer.sections()
+                for key, data in sections:
+                    f.write(bytes(_align(f.tell()) - f.tell()))
+                    entry[key] = f.tell()
+                    if key == "heap":
+                        entry["heap_size"] = len(data)
+                    f.write(data)
+                columns.append(entry)
+            schema = json.dumps({
+                "table": spec.table,
+                "byteorder": sys.byteorder,
+                "watermark": last_id or 0,
+                "written_at": time.time(),
+                "columns": columns,
+            }).encode("utf-8")
+            schema_offset = f.tell()
+            f.write(schema)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, count, schema_offset, len(schema)))
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return count
+
+class Catalog:
+    """Read-only, memory-mapped view of a catalog file
+
+    Opening reads only the header and schema, so it takes about the same
+    time for any row count. Lookups by row index or id read the mapped
+    pages directly; the operating system shares those pages between every
+    process that maps the same file.
+    """
+
+    def __init__(self, path: str, spec: Optional[CatalogSpec] = None):
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise CatalogError(f"{path} is empty")
+        try:
+            self._open(spec)
+        except Exception:
+            self._mmap.close()
+            raise
+
+    def _open(self, spec: Optional[CatalogSpec]) -> None:
+        if len(self._mmap) < HEADER.size:
+            raise CatalogError(f"{self.path} is truncated")
+        magic, version, count, schema_offset, schema_length = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise CatalogError(f"{self.path} is not a catalog file")
+        if version != VERSION:
+            raise CatalogError(f"{self.path} has format version {version}, expected {VERSION}")
+        if schema_offset + schema_length > len(self._mmap):
+            raise CatalogError(f"{self.path} is truncated")
+        schema = json.loads(self._mmap[schema_offset:schema_offset + schema_length])
+        if schema["byteorder"] != sys.byteorder:
+            raise CatalogError(f"{self.path} was written on a {schema['byteorder']}-endian host")
+
+        self.table: str = schema["table"]
+        self.spec = spec or CATALOGS.get(self.table)
+        self.watermark: int = schema["watermark"]
+        self.written_at: float = schema["written_at"]
+        self.columns: Tuple[str, ...] = tuple(entry["name"] for entry in schema["columns"])
+        self._count = count
+
+        view = memoryview(self._mmap)
+        self._views = []
+        self._decoders = []
+        self._nulls = []
+        for entry in schema["columns"]:
+            itemsize = struct.calcsize(entry["format"])
+            length = count + 1 if entry["kind"] == "str" else count
+            start = entry["data"]
+            self._views.append(view[start:start + length * itemsize].cast(entry["format"]))
+            if entry["kind"] == "str":
+                self._decoders.append(view[entry["heap"]:entry["heap"] + entry["heap_size"]])
+            elif entry["kind"] == "dict":
+                self._decoders.append(entry["values"])
+            else:
+                self._decoders.append(None)
+            self._nulls.append(view[entry["nulls"]:entry["nulls"] + count // 8 + 1] if "nulls" in entry else None)
+        self._kinds = tuple(entry["kind"] for entry in schema["columns"])
+        self._positions = {name: position for position, name in enumerate(self.columns)}
+        # File codes mapped to the process-wide dictionaries, for ResultSet slices
+        self._recode = [
+            [dictionary(name).encode(value) for value in decoder]
+            if kind == "dict" and name in ENCODED_COLUMNS else None
+            for name, kind, decoder in zip(self.columns, self._kinds, self._decoders)
+        ]
+
+    def close(self) -> None:
+        """Release the mapping; views handed out earlier must not be used afterwards"""
+        for view in self._views + [d for d in self._decoders if isinstance(d, memoryview)]:
+            view.release()
+        for bitmap in self._nulls:
+            if bitmap is not None:
+                bitmap.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A caller still holds a slice of the mapping; it is closed when collected
+            pass
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, record_id: object) -> bool:
+        return self.index_of(record_id) is not None
+
+    def _value(self, position: int, index: int) -> Any:
+        nulls = self._nulls[position]
+        if nulls is not None and nulls[index >> 3] & (1 << (index & 7)):
+            return None
+        kind = self._kinds[position]
+        view = self._views[position]
+        if kind == "str":
+            return str(self._decoders[position][view[index]:view[index + 1]], "utf-8")
+        if kind == "dict":
+            return self._decoders[position][view[index]]
+        if kind == "b":
+            return bool(view[index])
+        return view[index]
+
+    def value(self, index: int, column: str) -> Any:
+        """One column of the row at a row index"""
+        return self._value(self._positions[column], self._check(index))
+
+    def row(self, index: int) -> Tuple:
+        """The row at a row index as a tuple in column order"""
+        index = self._check(index)
+        return tuple(self._value(position, index) for position in range(len(self.columns)))
+
+    def _check(self, index: int) -> int:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("catalog row index out of range")
+        return index
+
+    def index_of(self, record_id: Any) -> Optional[int]:
+        """Row index of an id, by binary search over the mapped id column"""
+        ids = self._views[0]
+        index = bisect.bisect_left(ids, record_id)
+        if index < self._count and ids[index] == record_id:
+            return index
+        return None
+
+    def get(self, record_id: Any) -> Optional[Any]:
+        """The record (e.g. StaffRecord) with an id, or None"""
+        index = self.index_of(record_id)
+        if index is None:
+            return None
+        return self.spec.record(*self.row(index))
+
+    def pairs(self, column: str, after_id: int = 0) -> Iterator[Tuple[int, Any]]:
+        """(id, value) for every row after an id, in id order"""
+        position = self._positions[column]
+        start = bisect.bisect_right(self._views[0], after_id)
+        ids = self._views[0]
+        for index in range(start, self._count):
+            yield ids[index], self._value(position, index)
+
+    def slice(self, start: int = 0, stop: Optional[int] = None) -> ResultSet:
+        """Rows start:stop as a ResultSet, with the dictionary columns already encoded"""
+        start, stop, _ = slice(start, stop).indices(self._count)
+        data = []
+        for position, recode in enumerate(self._recode):
+            if recode is not None:
+                data.append([recode[code] for code in self._views[position][start:stop]])
+            elif self._kinds[position] in ("str", "b") or self._nulls[position] is not None:
+                data.append([self._value(position, index) for index in range(start, stop)])
+            else:
+                data.append(self._views[position][start:stop].tolist())
+        encoded = [name for name, recode in zip(self.columns, self._recode) if recode is not None]
+        return ResultSet(self.columns, list(zip(*data)), encoded)
+
+def open_catalog(path: str, spec: Optional[CatalogSpec] = None) -> Optional[Catalog]:
+    """Open a catalog file, or return None if it is missing or unreadable"""
+    if not os.path.exists(path):
+        return None
+    try:
+        return Catalog(path, spec)
+    except Exception as e:
+        print(f"Error opening catalog {path}: {e}")
+        return None
@@ -1,248 +1,1677 @@
-import pymysql
-from typing import List, Dict, Any, Optional, Tuple
-from datetime import date
+import base64
+import functools
+import json
+import inspect
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque, OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator, Iterable, Mapping, Sequence
+from datetime import date, datetime
+from snapshot import SnapshotStore, MIRRORED_TABLES, SCHEMA as SNAPSHOT_SCHEMA, default_snapshot_path, _dict_factory, _to_sqlite
+from sync import SyncEngine, SyncStats
+from queries import (QueryRegistry, dream_team_sql, DREAM_TEAM_ROLE_COUNT, STAFF_BY_NAMES, STAFF_BY_IDS,
+                     MOVIES_BY_TITLES, MOVIES_BY_IDS, TAKEN_USERNAMES_EMAILS, STAFF_STATS_BY_IDS, staff_stats_sql,
+                     NULL_YEAR, _NEWEST_FIRST_START, _sqlite_placeholders, _sqlite_year)
+from search_index import SearchIndex
+from staff_stats import StaffStatsIndex, STAFF_STATS_COLUMNS
+from catalog import Catalog, CATALOGS, default_catalog_path, open_catalog, write_catalog
+from resultset import ResultSet
+from perf import monitor
+import leaderboards
+import utils
+
+class PoolError(Exception):
+    """Raised when the connection pool cannot hand out a connection"""
+
+class PoolTimeoutError(PoolError):
+    """Raised when no pooled connection became free before the checkout timeout"""
+
+def _ping_connection(connection) -> None:
+    """Default health check: round-trip a ping without silently reconnecting"""
+    connection.ping(reconnect=False)
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of database connections
+    
+    Connections are created on demand up to ``max_size``; ``min_size`` of them
+    are kept open even when idle. Idle connections beyond ``min_size`` are
+    closed once they have been unused for ``max_idle`` seconds, and a borrowed
+    connection that has been idle longer than ``check_after`` seconds is
+    health-checked before being handed out. Idle times are measured with
+    ``clock``.
+    """
+    
+    def __init__(self, factory: Callable[[], Any], min_size: int = 1, max_size: int = 5,
+                 timeout: float = 10.0, max_idle: float = 300.0, check_after: float = 30.0,
+                 check: Callable[[Any], None] = _ping_connection,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_size < 1 or not 0 <= min_size <= max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.check_after = check_after
+        self.check = check
+        self.clock = clock
+        self._idle = deque()  # (connection, released_at); most recently released on the right
+        self._size = 0
+        self._closed = False
+        self._lock = threading.Condition()
+    
+    @property
+    def size(self) -> int:
+        """Number of open connections, idle or borrowed"""
+        return self._size
+    
+    @property
+    def idle(self) -> int:
+        """Number of connections waiting in the pool"""
+        return len(self._idle)
+    
+    def fill(self) -> None:
+        """Open connections until the pool holds at least min_size"""
+        while True:
+            with self._lock:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            self.release(self._create())
+    
+    def acquire(self, timeout: Optional[float] = None):
+        """Borrow a connection, waiting up to timeout seconds for one to free up"""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            connection, released_at, stale = None, 0.0, []
+            with self._lock:
+                while True:
+                    if self._closed:
+                        raise PoolError("Connection pool is closed")
+                    stale.extend(self._reap())
+                    if self._idle:
+                        connection, released_at = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(f"No connection available after {timeout}s "
+                                               f"({self.max_size} in use)")
+                    self._lock.wait(remaining)
+            for old in stale:
+                self._close_quietly(old)
+            
+            if connection is None:
+                return self._create()
+            if self.clock() - released_at < self.check_after:
+                return connection
+            try:
+                self.check(connection)
+                return connection
+            except Exception:
+                self.release(connection, discard=True)
+    
+    def release(self, connection, discard: bool = False) -> None:
+        """Return a borrowed connection; discarded connections are closed"""
+        with self._lock:
+            if not (discard or self._closed or self._size > self.max_size):
+                self._idle.append((connection, self.clock()))
+                self._lock.notify()
+                return
+            self._size -= 1
+            self._lock.notify()
+        self._close_quietly(connection)
+    
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """Borrow a connection for the duration of a with-block
+        
+        Uncommitted work is rolled back if the block raises; a connection that
+        cannot even roll back is assumed broken and dropped from the pool.
+        """
+        connection = self.acquire(timeout)
+        discard = False
+        try:
+            yield connection
+        except BaseException:
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+            raise
+        finally:
+            self.release(connection, discard=discard)
+    
+    def resize(self, max_size: int) -> None:
+        """Change max_size; connections beyond it are closed as they become idle"""
+        if max_size < 1:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        excess = []
+        with self._lock:
+            self.max_size = max_size
+            self.min_size = min(self.min_size, max_size)
+            while self._idle and self._size > max_size:
+                excess.append(self._idle.popleft()[0])
+                self._size -= 1
+            self._lock.notify_all()
+        for connection in excess:
+            self._close_quietly(connection)
+    
+    def close(self) -> None:
+        """Close idle connections and stop handing out new ones
+        
+        Connections still borrowed are closed as they are released.
+        """
+        with self._lock:
+            self._closed = True
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._lock.notify_all()
+        for connection in idle:
+            self._close_quietly(connection)
+    
+    def _create(self):
+        """Open a connection for a slot already counted in _size"""
+        try:
+            if not monitor.enabled:
+                return self.factory()
+            started = time.perf_counter()
+            connection = self.factory()
+            monitor.record("connect", time.perf_counter() - started)
+            return connection
+        except Exception:
+            with self._lock:
+                self._size -= 1
+                self._lock.notify()
+            raise
+    
+    def _reap(self) -> List[Any]:
+        """Detach idle connections past max_idle (caller holds the lock)"""
+        reaped = []
+        cutoff = self.clock() - self.max_idle
+        while self._idle and self._size > self.min_size and self._idle[0][1] < cutoff:
+            reaped.append(self._idle.popleft()[0])
+            self._size -= 1
+        return reaped
+    
+    @staticmethod
+    def _close_quietly(connection) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+# Cache lifetimes in seconds. Oscar history changes at most once a year;
+# user-generated data is refreshed more often and invalidated on writes.
+HISTORICAL_TTL = 24 * 60 * 60
+STAFF_TTL = 60 * 60
+USER_DATA_TTL = 60
+
+_MISSING = object()
+
+def _cacheable(value: Any) -> bool:
+    """Whether a query result may be cached: failures come back empty
+    
+    Paged results are (rows, next_token) tuples and count as empty when
+    they have no rows.
+    """
+    if isinstance(value, tuple):
+        return bool(value and value[0])
+    return bool(value)
+
+# Default rows per page for the keyset-paginated list queries
+PAGE_SIZE = 200
+
+def _winners_page_key(row: Mapping[str, Any]) -> Tuple[int, int]:
+    """Keyset position of a winners row; undated movies sort last as NULL_YEAR"""
+    year = row['year']
+    return (NULL_YEAR if year is None else year, row['id'])
+
+# Tables with an in-memory name index, and the column searched in each
+SEARCHABLE_NAMES = {"staff": "name", "movies": "title"}
+
+def _dream_team_params(roles: Dict[str, str], top_k: int) -> Tuple:
+    return tuple(value for pair in roles.items() for value in pair) + (top_k,)
+
+def _group_dream_team(rows: List[Dict[str, Any]], roles: Dict[str, str], top_k: int) -> Dict[str, Any]:
+    """Shape ranked (role, name, oscar_count) rows into the dream team mapping"""
+    ranked: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        ranked.setdefault(row['role'], []).append({'name': row['name'], 'oscar_count': row['oscar_count']})
+    if top_k > 1:
+        return {role: ranked[role] for role in roles if role in ranked}
+    return {role: ranked[role][0] for role in roles if role in ranked}
+
+@dataclass
+class ReadPlan:
+    """How one Database read is answered; Database and AsyncDatabase both run it
+    
+    The in-process ``sources`` (analytics engine, local snapshot) are tried
+    in order and the first that does not raise answers the read. Otherwise
+    the registered query ``name`` runs on the server with ``params`` (and
+    ``sql`` for variable-length statements) and ``shape`` turns its rows
+    into the result. A ``leaderboard`` query falls back to its *_base
+    variant when the summary tables cannot be used. Failures are printed
+    and reported as ``empty``.
+    """
+    description: str
+    empty: Any
+    name: str
+    params: Tuple = ()
+    sql: Optional[str] = None
+    shape: Optional[Callable[[ResultSet], Any]] = None
+    sources: Tuple[Tuple[str, Callable[[], Any]], ...] = ()
+    leaderboard: bool = False
+
+class MySQLBackend:
+    """Remote MySQL server reached through PyMySQL
+    
+    PyMySQL is imported on first connect, which the GUI does on a worker
+    thread, so it stays off the startup path.
+    """
+    
+    dialect = "mysql"
+    remote = True
+    
+    def __init__(self, host: str = "sql7.freesqldatabase.com", database: str = "sql7774986",
+                 user: str = "sql7774986", password: str = "qGIlVa7ysQ", port: int = 3306,
+                 prepare_statements: bool = True):
+        self.host = host
+        self.database = database
+        self.user = user
+        self.password = password
+        self.port = port
+        self.prepare_statements = prepare_statements
+    
+    def connect(self):
+        """Open a single connection for the pool"""
+        import pymysql
+        from mysql_cursors import TimedDictCursor
+        
+        return pymysql.connect(
+            host=self.host,
+            user=self.user,
+            password=self.password,
+            database=self.database,
+            port=self.port,
+            autocommit=True,
+            cursorclass=TimedDictCursor
+        )
+    
+    def streaming_cursor(self):
+        """Cursor class for unbuffered, row-at-a-time reads"""
+        from mysql_cursors import TimedSSDictCursor
+        return TimedSSDictCursor
+    
+    def tuple_cursor(self):
+        """Cursor class returning plain row tuples, for ResultSet reads"""
+        from mysql_cursors import TimedCursor
+        return TimedCursor
+
+# Tables the app writes, beyond the reference tables shared with the snapshot
+SQLITE_APP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user (
+    id INTEGER PRIMARY KEY,
+    Username TEXT NOT NULL COLLATE NOCASE,
+    EmailAddress TEXT NOT NULL COLLATE NOCASE,
+    BirthDate TEXT, Age INTEGER, Gender TEXT, Country TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_user_username ON user (Username);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_user_email ON user (EmailAddress);
+CREATE TABLE IF NOT EXISTS user_nominations (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES user (id),
+    staff_id INTEGER NOT NULL REFERENCES staff (id),
+    movie_id INTEGER NOT NULL REFERENCES movies (id),
+    category TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_user_nominations_user ON user_nominations (user_id);
+"""
+
+# Applied to every SQLite connection: WAL lets readers run alongside the
+# writer, NORMAL sync is durable across application crashes in WAL mode,
+# and a larger page cache and memory map keep the working set off disk.
+# SQLite only enforces the user_nominations foreign keys when asked to.
+SQLITE_PRAGMAS = (
+    "foreign_keys=ON",
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "busy_timeout=5000",
+    "temp_store=MEMORY",
+    "cache_size=-65536",
+    "mmap_size=268435456",
+)
+
+class _SQLiteCursor:
+    """Cursor with the subset of the PyMySQL cursor API that Database uses"""
+    
+    def __init__(self, connection: "_SQLiteConnection"):
+        self.connection = connection
+        self._cursor = connection.raw.cursor()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+    
+    @property
+    def lastrowid(self) -> Optional[int]:
+        return self._cursor.lastrowid
+    
+    @property
+    def description(self) -> Optional[Tuple]:
+        return self._cursor.description
+    
+    def execute(self, sql: str, params: Iterable[Any] = ()) -> int:
+        self._cursor.execute(_sqlite_placeholders(sql), [_to_sqlite(value) for value in params])
+        return self._cursor.rowcount
+    
+    def executemany(self, sql: str, rows: Iterable[Iterable[Any]]) -> int:
+        self._cursor.executemany(_sqlite_placeholders(sql),
+                                 ([_to_sqlite(value) for value in row] for row in rows))
+        return self._cursor.rowcount
+    
+    def fetchone(self) -> Optional[Dict[str, Any]]:
+        return self._cursor.fetchone()
+    
+    def fetchmany(self, size: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self._cursor.fetchmany(size or self._cursor.arraysize)
+    
+    def fetchall(self) -> List[Dict[str, Any]]:
+        return self._cursor.fetchall()
+    
+    def close(self) -> None:
+        self._cursor.close()
+
+class _SQLiteTupleCursor(_SQLiteCursor):
+    """_SQLiteCursor returning plain row tuples"""
+    
+    def __init__(self, connection: "_SQLiteConnection"):
+        super().__init__(connection)
+        self._cursor.row_factory = None
+
+class _SQLiteConnection:
+    """sqlite3 connection adapted to the PyMySQL connection API used by the pool"""
+    
+    def __init__(self, raw: sqlite3.Connection):
+        self.raw = raw
+    
+    def cursor(self, cursor_class: Any = None) -> _SQLiteCursor:
+        # sqlite3 cursors already step through results lazily, so streaming
+        # and buffered cursor classes behave the same here; the class only
+        # chooses dict or tuple rows
+        return (cursor_class or _SQLiteCursor)(self)
+    
+    def begin(self) -> None:
+        self.raw.execute("BEGIN")
+    
+    def commit(self) -> None:
+        self.raw.commit()
+    
+    def rollback(self) -> None:
+        self.raw.rollback()
+    
+    def ping(self, reconnect: bool = False) -> None:
+        self.raw.execute("SELECT 1")
+    
+    def close(self) -> None:
+        self.raw.close()
+
+class SQLiteBackend:
+    """Embedded SQLite database file for single-user and kiosk deployments
+    
+    Uses the snapshot's reference-table schema plus the user and leaderboard
+    tables, so an existing snapshot file can be opened as the database.
+    sqlite3 keeps its own per-connection cache of compiled statements, so
+    SQL-level prepared statements are not used.
+    """
+    
+    dialect = "sqlite"
+    remote = False
+    prepare_statements = False
+    
+    def __init__(self, path: Optional[str] = None, pragmas: Tuple[str, ...] = SQLITE_PRAGMAS):
+        self.path = path or os.path.join(os.path.dirname(default_snapshot_path()), "oscars.db")
+        self.pragmas = pragmas
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+    
+    def connect(self) -> _SQLiteConnection:
+        """Open a connection for the pool, creating the schema on first use"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # isolation_level=None keeps autocommit semantics; Database opens
+        # transactions explicitly with begin()
+        raw = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None,
+                              cached_statements=256)
+        raw.row_factory = _dict_factory
+        for pragma in self.pragmas:
+            raw.execute(f"PRAGMA {pragma}")
+        raw.create_function("YEAR", 1, _sqlite_year, deterministic=True)
+        with self._schema_lock:
+            if not self._schema_ready:
+                # The leaderboard summaries are created and filled by Database
+                raw.executescript(SNAPSHOT_SCHEMA + SQLITE_APP_SCHEMA)
+                self._schema_ready = True
+        return _SQLiteConnection(raw)
+    
+    def streaming_cursor(self) -> None:
+        # sqlite3 cursors always step through results lazily
+        return None
+    
+    def tuple_cursor(self) -> type:
+        return _SQLiteTupleCursor
+
+def backend_from_environment():
+    """Pick the storage backend from MOVIE_AWARDS_BACKEND ("mysql" or "sqlite")
+    
+    The SQLite file defaults to the app-data directory and can be moved with
+    MOVIE_AWARDS_DB_PATH.
+    """
+    name = os.environ.get("MOVIE_AWARDS_BACKEND", "mysql").strip().lower()
+    if name == "sqlite":
+        return SQLiteBackend(os.environ.get("MOVIE_AWARDS_DB_PATH") or None)
+    if name != "mysql":
+        raise ValueError(f"Unknown MOVIE_AWARDS_BACKEND {name!r}; expected 'mysql' or 'sqlite'")
+    return MySQLBackend()
+
+@dataclass
+class ImportReport:
+    """Outcome of a bulk write: counts, per-row rejections and throughput"""
+    inserted: int = 0
+    rejected: List[Tuple[int, str]] = field(default_factory=list)  # (row number, reason)
+    chunks: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+    
+    @property
+    def rows_per_second(self) -> float:
+        return self.inserted / self.seconds if self.seconds > 0 else 0.0
+
+def _chunks(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split an iterable into lists of at most size items without materializing it"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _row_tuples(rows: Iterable[Mapping[str, Any]], columns: Tuple[str, ...]) -> Iterator[Tuple]:
+    """Dict rows as tuples of the given columns"""
+    for row in rows:
+        yield tuple(row[name] for name in columns)
+
+def _as_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def _in_clause(values: List[Any]) -> str:
+    return ", ".join(["%s"] * len(values))
+
+def _without_id(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """A staff_stats row as get_staff_stats returns it, without the id key"""
+    stats = dict(row)
+    stats.pop('id', None)
+    return stats
+
+def _age_on(birth_date: date, today: date) -> int:
+    """Age in whole years on a given day"""
+    return today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+
+REGISTRATION_FIELDS = ("username", "email", "birth_date", "gender", "country")
+
+def _prepare_registrations(chunk: List[Tuple[int, Dict[str, Any]]], today: date,
+                           rejected: List[Tuple[int, str]]) -> List[Tuple[int, Tuple]]:
+    """Validate a chunk of registration rows in one pass
+    
+    Returns (row number, insert parameters) for the valid rows and appends
+    (row number, reason) to rejected for the rest.
+    """
+    cleaned = []
+    for row_number, row in chunk:
+        values = [str(row.get(name) or "").strip() for name in REGISTRATION_FIELDS]
+        missing = [name for name, value in zip(REGISTRATION_FIELDS, values) if not value]
+        if missing:
+            rejected.append((row_number, f"missing {', '.join(missing)}"))
+        else:
+            cleaned.append((row_number, values))
+    
+    prepared = []
+    email_ok = utils.validate_emails([values[1] for _, values in cleaned])
+    for (row_number, (username, email, birth_text, gender, country)), valid in zip(cleaned, email_ok):
+        if not valid:
+            rejected.append((row_number, f"invalid email {email!r}"))
+            continue
+        try:
+            birth_date = datetime.strptime(birth_text, '%Y-%m-%d').date()
+        except ValueError:
+            rejected.append((row_number, f"invalid birth_date {birth_text!r}, expected YYYY-MM-DD"))
+            continue
+        prepared.append((row_number, (username, email, birth_date, _age_on(birth_date, today), gender, country)))
+    return prepared
+
+def _encode_page_token(*key: Any) -> str:
+    """Turn the keyset position after a page into an opaque token"""
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+def _decode_page_token(token: str) -> List[Any]:
+    return json.loads(base64.urlsafe_b64decode(token.encode()))
+
+def _split_page(rows: Sequence[Mapping[str, Any]], page_size: int,
+                key: Callable[[Mapping[str, Any]], Tuple]) -> Tuple[Sequence[Mapping[str, Any]], Optional[str]]:
+    """Trim a page_size + 1 fetch to one page and the token for the next"""
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, _encode_page_token(*key(rows[-1]))
+
+# Award category that decides each Dream Team role
+DREAM_TEAM_CATEGORIES = {
+    'director': 'Best Director',
+    'actor': 'Best Actor',
+    'actress': 'Best Actress',
+    'producer': 'Best Picture',
+    'singer': 'Best Original Song'
+}
+
+def _estimate_size(value: Any) -> int:
+    """Approximate the memory footprint of a query result in bytes"""
+    size = sys.getsizeof(value)
+    if isinstance(value, ResultSet):
+        size += _estimate_size(value.rows) + _estimate_size(value.columns)
+    elif isinstance(value, dict):
+        size += sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_estimate_size(item) for item in value)
+    return size
+
+class ResultCache:
+    """Thread-safe LRU cache of query results with per-entry TTLs
+    
+    Entries are evicted least-recently-used first once either ``max_entries``
+    or ``max_bytes`` is exceeded. Each entry carries tags naming the tables
+    it was read from so writes can invalidate exactly what they affect.
+    Cached values are shared between callers and must not be mutated.
+    """
+    
+    def __init__(self, max_entries: int = 256, max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (value, expires_at, size, tags)
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: Tuple) -> Any:
+        """Return the cached value for key, or _MISSING"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key: Tuple, value: Any, ttl: float, tags: Tuple[str, ...] = ()) -> None:
+        """Store value under key for ttl seconds"""
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + ttl, size, frozenset(tags))
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+    
+    def invalidate(self, *tags: str) -> None:
+        """Drop entries carrying any of the given tags, or everything if none are given"""
+        with self._lock:
+            if not tags:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            stale = [key for key, entry in self._entries.items() if entry[3].intersection(tags)]
+            for key in stale:
+                self._remove(key)
+    
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and current occupancy"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes
+            }
+    
+    def _remove(self, key: Tuple) -> None:
+        self._bytes -= self._entries.pop(key)[2]
+
+def _freeze(value: Any) -> Any:
+    """Make dict/list arguments usable in a cache key"""
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def cached(ttl: float, tags: Tuple[str, ...] = ()):
+    """Serve a read-only Database method from ``self.cache`` when possible
+    
+    Keys combine the method name with its bound arguments (defaults applied),
+    so ``get_top_nominated_movies()`` and ``get_top_nominated_movies(None, None)``
+    share an entry. Empty results are not cached because the query methods
+    report failures by returning an empty value (see ``_cacheable``).
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+        
+        def cache_key(self, *args, **kwargs) -> Tuple:
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            return (method.__name__,) + tuple(_freeze(value) for value in bound.arguments.values())[1:]
+        
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = self.cache
+            if cache is None:
+                return method(self, *args, **kwargs)
+            key = cache_key(self, *args, **kwargs)
+            value = cache.get(key)
+            if value is _MISSING:
+                value = method(self, *args, **kwargs)
+                if _cacheable(value):
+                    cache.put(key, value, ttl, tags)
+            return value
+        # Exposed so AsyncDatabase shares entries with the synchronous methods
+        wrapper.cache_key = cache_key
+        wrapper.ttl = ttl
+        wrapper.tags = tags
+        return wrapper
+    return decorator
 
 class Database:
     """Database connection and query manager"""
     
-    def __init__(self):
-        self.connection = None
-        self.host = "sql7.freesqldatabase.com"
-        self.database = "sql7774986"
-        self.user = "sql7774986"
-        self.password = "qGIlVa7ysQ"
-        self.port = 3306
+    def __init__(self, backend=None):
+        # MySQLBackend or SQLiteBackend; defaults from MOVIE_AWARDS_BACKEND
+        self.backend = backend or backend_from_environment()
+        self.pool = None
+        
+        # Connection pool settings; pool_max_size is the budget for all
+        # connections to the server, including the ones reserved for
+        # AsyncDatabase's pool (see reserve_connections())
+        self.pool_min_size = 1
+        self.pool_max_size = 5
+        self.pool_reserved = 0
+        self.pool_timeout = 10.0
+        self.pool_max_idle = 300.0
+        self._connect_lock = threading.Lock()
+        
+        # Named queries, prepared once per pooled connection; see queries.py
+        self.queries = QueryRegistry(use_prepared=self.backend.prepare_statements,
+                                     dialect=self.backend.dialect)
+        
+        # Result cache for read-only queries; set to None to disable
+        self.cache = ResultCache()
+        self.invalidation_listeners: List[Callable[[Tuple[str, ...]], None]] = []
+        
+        # Local mirror of the reference tables, see open_snapshot()
+        self.snapshot: Optional[SnapshotStore] = None
+        self.sync_batch_size = 5000
+        self.last_sync_stats: List[SyncStats] = []
+        
+        # Name indexes for search_staff()/search_movies(), see load_search_indexes()
+        self.search_indexes: Dict[str, SearchIndex] = {}
+        self._search_lock = threading.Lock()
+        
+        # Memory-mapped staff and movie catalogs, see open_catalogs();
+        # catalog_directory None keeps them next to the snapshot
+        self.catalogs: Dict[str, Catalog] = {}
+        self.catalog_directory: Optional[str] = None
+        self._catalog_lock = threading.Lock()
+        
+        # NumPy column arrays of the mirrored tables, see load_analytics()
+        self.analytics = None
         
+        # Per-staff totals for get_staff_stats(), see load_staff_stats()
+        self.staff_stats: Optional[StaffStatsIndex] = None
+        self._staff_stats_lock = threading.Lock()
+        
+        # Whether the leaderboard summary tables exist; None until first
+        # checked, see _leaderboards_ready()
+        self._leaderboards: Optional[bool] = None
+        self._leaderboards_lock = threading.Lock()
+        # Seconds between checks of the summaries against their base tables;
+        # reads in between only touch the summary tables
+        self.leaderboard_check_interval = 300.0
+        self._leaderboards_checked: Optional[float] = None
+        
+    def _open_connection(self):
+        """Open a single backend connection for the pool"""
+        return self.backend.connect()
+    
     def connect(self) -> bool:
-        """Establish connection to MySQL database"""
-        try:
-            self.connection = pymysql.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password,
-                database=self.database,
-                port=self.port,
-                cursorclass=pymysql.cursors.DictCursor
-            )
-            return True
+        """Create the connection pool and open its initial connections"""
+        with self._connect_lock:
+            if self.pool is None:
+                max_size = self.pool_max_size - self.pool_reserved
+                self.pool = ConnectionPool(
+                    self._open_connection,
+                    min_size=min(self.pool_min_size, max_size),
+                    max_size=max_size,
+                    timeout=self.pool_timeout,
+                    max_idle=self.pool_max_idle
+                )
+        try:
+            self.pool.fill()
         except Exception as e:
             print(f"Database connection error: {e}")
             return False
+        if self._leaderboards is None:
+            # Create and backfill the summary tables before the first write counts on them
+            self._refresh_leaderboards()
+        return True
+    
+    def reserve_connections(self, count: int) -> int:
+        """Hand count connections of the pool_max_size budget to another pool, e.g. AsyncDatabase's
+        
+        The synchronous pool shrinks to the rest (at least one), so the two
+        pools together never open more than pool_max_size connections to the
+        server. Returns how many were reserved; 0 gives them back.
+        """
+        count = max(0, min(count, self.pool_max_size - 1))
+        self.pool_reserved = count
+        if self.pool is not None:
+            self.pool.resize(self.pool_max_size - count)
+        return count
     
     def close(self) -> None:
-        """Close database connection"""
-        if self.connection:
-            self.connection.close()
+        """Close all pooled database connections"""
+        with self._connect_lock:
+            pool, self.pool = self.pool, None
+        if pool:
+            pool.close()
+    
+    @contextmanager
+    def _connection(self):
+        """Borrow a pooled connection, connecting first if needed"""
+        if self.pool is None:
+            self.connect()
+        pool = self.pool
+        if pool is None:
+            raise PoolError("Database is closed")
+        with pool.connection() as connection:
+            yield connection
+    
+    @contextmanager
+    def _cursor(self):
+        """Borrow a pooled connection and yield a cursor on it"""
+        with self._connection() as connection:
+            with connection.cursor() as cursor:
+                yield cursor
+    
+    def _fetch_result(self, name: str, params: Iterable[Any] = (), sql: Optional[str] = None) -> ResultSet:
+        """Run a registered query and return its rows as a ResultSet"""
+        with self._connection() as connection:
+            with connection.cursor(self.backend.tuple_cursor()) as cursor:
+                self.queries.execute(cursor, name, params, sql)
+                return ResultSet.from_cursor(cursor)
+    
+    def _leaderboards_ready(self) -> bool:
+        """Create any missing summary tables once; False if they cannot be used"""
+        if self._leaderboards is None:
+            with self._leaderboards_lock:
+                if self._leaderboards is None:
+                    try:
+                        with self._cursor() as cursor:
+                            leaderboards.create_tables(cursor, self.backend.dialect)
+                        self._leaderboards = True
+                    except Exception as e:
+                        print(f"Error creating leaderboard tables: {e}")
+                        self._leaderboards = False
+        return self._leaderboards
+    
+    def _refresh_leaderboards(self) -> bool:
+        """Bring the summaries up to date with the oscars and user_nominations tables
+        
+        Rebuilds the Oscar summaries when oscars rows were added or removed
+        since the last rebuild, and the nomination counts when another
+        client changed user_nominations; a database with no recorded rebuild
+        gets a full one. False if the summaries cannot be used and the base
+        tables must be read instead.
+        """
+        self._leaderboards_checked = time.monotonic()
+        if not self._leaderboards_ready():
+            return False
+        try:
+            with self._cursor() as cursor:
+                self.queries.execute(cursor, "leaderboard_mark")
+                current = cursor.fetchone()
+                self.queries.execute(cursor, "leaderboard_state")
+                built = cursor.fetchone()
+                if built is None:
+                    leaderboards.rebuild(cursor)
+                    return True
+                statements = []
+                if built['nominations_count'] != current['nominations_count']:
+                    statements += leaderboards.NOMINATION_REBUILD_STATEMENTS
+                if (built['oscars_max_id'], built['oscars_count']) != (current['oscars_max_id'],
+                                                                       current['oscars_count']):
+                    statements += leaderboards.OSCAR_REBUILD_STATEMENTS
+                if statements:
+                    leaderboards.rebuild(cursor, statements)
+            return True
+        except Exception as e:
+            print(f"Error refreshing leaderboards: {e}")
+            return False
+    
+    def _leaderboard_query(self, name: str) -> str:
+        """name if its summary table is usable, else its *_base variant over the base tables
+        
+        The summaries are compared with their base tables at most every
+        leaderboard_check_interval seconds, so most reads query only the
+        summary table.
+        """
+        checked = self._leaderboards_checked
+        if checked is None or time.monotonic() - checked >= self.leaderboard_check_interval:
+            ready = self._refresh_leaderboards()
+        else:
+            ready = self._leaderboards_ready()
+        return name if ready else f"{name}_base"
+    
+    def _sources(self, analytics: Optional[Callable[[Any], Any]] = None,
+                 snapshot: Optional[Callable[[SnapshotStore], Any]] = None) -> Tuple:
+        """The loaded in-process sources of a read, for ReadPlan.sources"""
+        sources = []
+        engine = self.analytics
+        if analytics is not None and engine is not None:
+            sources.append(("analytics engine", functools.partial(analytics, engine)))
+        local = self._local()
+        if snapshot is not None and local is not None:
+            sources.append(("local snapshot", functools.partial(snapshot, local)))
+        return tuple(sources)
+    
+    def _read_locally(self, plan: ReadPlan) -> Any:
+        """Answer a plan from its in-process sources, or _MISSING if none can"""
+        for label, read in plan.sources:
+            try:
+                return read()
+            except Exception as e:
+                print(f"Error reading {label}: {e}")
+        return _MISSING
+    
+    def _query_name(self, plan: ReadPlan) -> str:
+        return self._leaderboard_query(plan.name) if plan.leaderboard else plan.name
+    
+    def _read(self, plan: ReadPlan) -> Any:
+        """Answer a plan from its sources or the server"""
+        value = self._read_locally(plan)
+        if value is not _MISSING:
+            return value
+        try:
+            rows = self._fetch_result(self._query_name(plan), plan.params, plan.sql)
+            return plan.shape(rows) if plan.shape else rows
+        except Exception as e:
+            print(f"Error fetching {plan.description}: {e}")
+            return plan.empty
+    
+    def open_snapshot(self, path: Optional[str] = None) -> bool:
+        """Open the local reference-data snapshot; returns True if it can answer queries
+        
+        A local backend is already on disk, so no snapshot is kept for it.
+        """
+        if not self.backend.remote:
+            return False
+        try:
+            self.snapshot = SnapshotStore(path)
+            return self.snapshot.is_ready()
+        except Exception as e:
+            print(f"Error opening local snapshot: {e}")
+            self.snapshot = None
+            return False
+    
+    def sync_snapshot(self) -> Optional[List[str]]:
+        """Pull new reference rows into the local snapshot
+        
+        Returns the tables that changed, or None if the sync failed.
+        """
+        if self.snapshot is None:
+            return []
+        engine = SyncEngine(
+            self._connection,
+            self.snapshot,
+            MIRRORED_TABLES,
+            batch_size=self.sync_batch_size,
+            cursor_class=self.backend.streaming_cursor(),
+            queries=self.queries
+        )
+        try:
+            self.last_sync_stats = engine.run()
+        except Exception as e:
+            print(f"Error syncing local snapshot: {e}")
+            return None
+        changed = [stats.table for stats in self.last_sync_stats if stats.rows]
+        if "oscars" in changed and self._leaderboards:
+            # New results on the server: rebuild its Oscar summaries now, not on a later read
+            self._refresh_leaderboards()
+        # Re-read in full, so rows already loaded below may have changed in place
+        rewritten = {stats.table for stats in self.last_sync_stats if stats.full and stats.rows}
+        # Before the search indexes below, which read names from the catalogs
+        self.refresh_catalogs(force=rewritten & set(CATALOGS))
+        # Before invalidating, so nothing re-caches results of the old arrays
+        if self.analytics is not None and set(changed) & set(self.analytics.columns):
+            self.load_analytics()
+        if self.staff_stats is not None and set(changed) & set(STAFF_STATS_COLUMNS):
+            self.load_staff_stats(rebuild=bool(rewritten & set(STAFF_STATS_COLUMNS)))
+        if changed:
+            self.invalidate(*changed)
+            stale = [table for table in changed if table in self.search_indexes]
+            if stale:
+                self.load_search_indexes(stale, rebuild=rewritten)
+        return changed
+    
+    def load_analytics(self) -> bool:
+        """Load the mirrored tables into the NumPy analytics engine; returns True if it is in use
+        
+        Needs numpy and a local copy of the tables: the snapshot once it is
+        ready, or the file of a local backend. While loaded, the aggregate
+        views answer from its arrays (see analytics.py). Run off the UI
+        thread; numpy is only imported here.
+        """
+        local = self._local()
+        if local is None and self.backend.remote:
+            return False
+        path = local.path if local is not None else self.backend.path
+        try:
+            import analytics
+            if analytics.np is None or not analytics.enabled_from_environment():
+                return False
+            self.analytics = analytics.AnalyticsEngine.load(path)
+            return True
+        except Exception as e:
+            print(f"Error loading analytics engine: {e}")
+            return False
+    
+    def load_staff_stats(self, rebuild: bool = False) -> bool:
+        """Build the staff statistics index, or apply the rows added since the last load
+        
+        rebuild builds a new index from scratch, for rows changed in place.
+        Reads the local snapshot when it is ready, otherwise streams the rows
+        from the database, one pass over each table either way. Run off the
+        UI thread; lookups keep answering from the current contents.
+        """
+        try:
+            with self._staff_stats_lock:
+                index = StaffStatsIndex() if rebuild or self.staff_stats is None else self.staff_stats
+                local = self._local()
+                sources = {}
+                for table, columns in STAFF_STATS_COLUMNS.items():
+                    after_id = index.watermarks[table]
+                    if local is not None:
+                        sources[table] = local.iter_staff_stats_rows(table, after_id)
+                    else:
+                        stream = self._stream(f"staff_stats_{table}_stream", (after_id,), batch_size=5000)
+                        sources[table] = _row_tuples(stream, columns)
+                index.update(**sources)
+                self.staff_stats = index
+            return True
+        except Exception as e:
+            print(f"Error loading staff statistics: {e}")
+            return False
+    
+    def _local(self) -> Optional[SnapshotStore]:
+        """Return the snapshot if it is complete enough to answer queries"""
+        snapshot = self.snapshot
+        if snapshot is not None and snapshot.is_ready():
+            return snapshot
+        return None
+    
+    def invalidate(self, *tags: str) -> None:
+        """Drop cached results read from the given tables and notify listeners"""
+        if self.cache is not None:
+            self.cache.invalidate(*tags)
+        for listener in list(self.invalidation_listeners):
+            listener(tags)
     
     def register_user(self, username: str, email: str, birth_date: date, gender: str, country: str) -> bool:
         """Register a new user in the system with extended attributes"""
-        if not self.connection:
-            self.connect()
-            
         try:
-            with self.connection.cursor() as cursor:
+            with self._cursor() as cursor:
                 # Calculate age from birth_date
-                today = date.today()
-                age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+                age = _age_on(birth_date, date.today())
                 
-                # SQL: INSERT INTO user (Username, EmailAddress, BirthDate, Age, Gender, Country) 
-                # VALUES (%s, %s, %s, %s, %s, %s)
-                cursor.execute("""
-                    INSERT INTO user (Username, EmailAddress, BirthDate, Age, Gender, Country) 
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                """, (username, email, birth_date, age, gender, country))
+                self.queries.execute(cursor, "register_user", (username, email, birth_date, age, gender, country))
                 
-                self.connection.commit()
-                return True
+                cursor.connection.commit()
+            self.invalidate("user")
+            return True
         except Exception as e:
             print(f"Error registering user: {e}")
             return False
     
     def add_nomination(self, user_id: int, staff_id: int, movie_id: int, category: str) -> bool:
         """Add a new user nomination for a staff member for a given movie"""
-        if not self.connection:
-            self.connect()
-            
         try:
-            with self.connection.cursor() as cursor:
-                # SQL: INSERT INTO user_nominations (user_id, staff_id, movie_id, category) 
-                # VALUES (%s, %s, %s, %s)
-                cursor.execute("SELECT 1")  # Placeholder for actual query
-                self.connection.commit()
-                return True
+            counted = self._leaderboards_ready()
+            with self._cursor() as cursor:
+                # The nomination and its leaderboard count commit together
+                cursor.connection.begin()
+                self.queries.execute(cursor, "add_nomination", (user_id, staff_id, movie_id, category))
+                if counted:
+                    self.queries.execute(cursor, "record_nomination", (movie_id, category, movie_id))
+                    self.queries.execute(cursor, "count_nominations", (1,))
+                cursor.connection.commit()
+            self.invalidate("user_nominations")
+            return True
         except Exception as e:
             print(f"Error adding nomination: {e}")
             return False
     
-    def get_user_nominations(self, user_id: int) -> List[Dict[str, Any]]:
+    @cached(USER_DATA_TTL, tags=("user_nominations",))
+    def get_user_nominations(self, user_id: int) -> ResultSet:
         """View existing nominations for the user"""
-        if not self.connection:
-            self.connect()
-            
-        try:
-            with self.connection.cursor() as cursor:
-                # SQL: SELECT un.id, s.name as staff_name, m.title as movie_title, un.category
-                # FROM user_nominations un
-                # JOIN staff s ON un.staff_id = s.id
-                # JOIN movies m ON un.movie_id = m.id
-                # WHERE un.user_id = %s
-                cursor.execute("SELECT 1 as id, 'Example Staff' as staff_name, 'Example Movie' as movie_title, 'Best Actor' as category")
-                return cursor.fetchall()
-        except Exception as e:
-            print(f"Error fetching user nominations: {e}")
-            return []
+        return self._read(self._plan_get_user_nominations(user_id))
+    
+    def _plan_get_user_nominations(self, user_id: int) -> ReadPlan:
+        return ReadPlan("user nominations", ResultSet(()), "user_nominations", (user_id,))
     
-    def get_top_nominated_movies(self, category: Optional[str] = None, year: Optional[int] = None) -> List[Dict[str, Any]]:
+    @cached(USER_DATA_TTL, tags=("user_nominations", "movies"))
+    def get_top_nominated_movies(self, category: Optional[str] = None, year: Optional[int] = None) -> ResultSet:
         """View top nominated movies by system users by category/year"""
-        if not self.connection:
-            self.connect()
-            
-        try:
-            with self.connection.cursor() as cursor:
-                # SQL: SELECT m.title, COUNT(*) as nomination_count
-                # FROM user_nominations un
-                # JOIN movies m ON un.movie_id = m.id
-                # WHERE (un.category = %s OR %s IS NULL)
-                # AND (YEAR(m.release_date) = %s OR %s IS NULL)
-                # GROUP BY m.id
-                # ORDER BY nomination_count DESC
-                # LIMIT 10
-                cursor.execute("SELECT 'Example Movie' as title, 42 as nomination_count")
-                return cursor.fetchall()
-        except Exception as e:
-            print(f"Error fetching top nominated movies: {e}")
-            return []
+        return self._read(self._plan_get_top_nominated_movies(category, year))
+    
+    def _plan_get_top_nominated_movies(self, category: Optional[str] = None,
+                                       year: Optional[int] = None) -> ReadPlan:
+        # Reads the movie_nomination_counts summary maintained by the
+        # nomination writes, so cost does not grow with nomination volume
+        return ReadPlan("top nominated movies", ResultSet(()), "top_nominated_movies",
+                        (category, category, year, year), leaderboard=True)
     
     def get_staff_stats(self, staff_id: int) -> Dict[str, Any]:
-        """Show total nominations and Oscars for a given director, actor, or singer"""
-        if not self.connection:
-            self.connect()
-            
+        """Show total nominations and Oscars for a given director, actor, or singer
+        
+        Also lists the distinct categories and the first and last nominated
+        year. Served from the staff statistics index once it is loaded (see
+        load_staff_stats()); the returned dict must not be modified.
+        """
+        index = self.staff_stats
+        if index is not None:
+            stats = index.get(staff_id)
+            if stats is not None:
+                return stats
+        return self._fetch_staff_stats(staff_id)
+    
+    def get_staff_stats_many(self, staff_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """get_staff_stats for many staff members at once, keyed by id; unknown ids are left out
+        
+        Ids in the staff statistics index cost one dict lookup each; the rest
+        are read with batched IN (...) queries.
+        """
+        staff_ids = list(dict.fromkeys(staff_ids))
+        index = self.staff_stats
+        found = index.get_many(staff_ids) if index is not None else {}
+        missing = [staff_id for staff_id in staff_ids if staff_id not in found]
+        if not missing:
+            return found
+        local = self._local()
+        if local is not None:
+            try:
+                for chunk in _chunks(missing, 500):
+                    found.update(local.get_staff_stats_many(chunk))
+                return found
+            except Exception as e:
+                print(f"Error reading local snapshot: {e}")
+        
         try:
-            with self.connection.cursor() as cursor:
-                # SQL: SELECT 
-                # (SELECT COUNT(*) FROM nominations WHERE staff_id = %s) as nomination_count,
-                # (SELECT COUNT(*) FROM oscars WHERE staff_id = %s) as oscar_count
-                cursor.execute("SELECT 'John Doe' as name, 'Director' as role, 5 as nomination_count, 2 as oscar_count")
-                return cursor.fetchone() or {}
+            with self._cursor() as cursor:
+                for chunk in _chunks(missing, 500):
+                    self.queries.execute(cursor, STAFF_STATS_BY_IDS, chunk, sql=staff_stats_sql(len(chunk)))
+                    for row in cursor.fetchall():
+                        row = dict(row)
+                        found[row.pop('id')] = row
         except Exception as e:
             print(f"Error fetching staff stats: {e}")
-            return {}
+        return found
+    
+    @cached(STAFF_TTL, tags=("staff", "nominations", "oscars"))
+    def _fetch_staff_stats(self, staff_id: int) -> Dict[str, Any]:
+        """get_staff_stats from the snapshot or the database"""
+        return self._read(self._plan_fetch_staff_stats(staff_id))
+    
+    def _plan_fetch_staff_stats(self, staff_id: int) -> ReadPlan:
+        return ReadPlan("staff stats", {}, "staff_stats", (staff_id,),
+                        shape=lambda rows: _without_id(rows[0]) if rows else {},
+                        sources=self._sources(snapshot=lambda local: local.get_staff_stats(staff_id)))
     
-    def get_top_actor_birth_countries(self) -> List[Dict[str, Any]]:
+    @cached(HISTORICAL_TTL, tags=("staff", "oscars"))
+    def get_top_actor_birth_countries(self) -> ResultSet:
         """Show top 5 birth countries for actors who won Best Actor"""
-        if not self.connection:
-            self.connect()
-            
-        try:
-            with self.connection.cursor() as cursor:
-                # SQL: SELECT s.birth_country, COUNT(*) as winner_count
-                # FROM oscars o
-                # JOIN staff s ON o.staff_id = s.id
-                # WHERE o.category = 'Best Actor'
-                # GROUP BY s.birth_country
-                # ORDER BY winner_count DESC
-                # LIMIT 5
-                cursor.execute("SELECT 'USA' as birth_country, 25 as winner_count")
-                return cursor.fetchall()
-        except Exception as e:
-            print(f"Error fetching top actor birth countries: {e}")
-            return []
+        return self._read(self._plan_get_top_actor_birth_countries())
+    
+    def _plan_get_top_actor_birth_countries(self) -> ReadPlan:
+        # Reads the country_winner_counts summary (see leaderboards.py)
+        return ReadPlan("top actor birth countries", ResultSet(()), "top_actor_birth_countries",
+                        leaderboard=True,
+                        sources=self._sources(lambda engine: engine.top_actor_birth_countries(),
+                                              lambda local: local.get_top_actor_birth_countries()))
     
-    def get_staff_by_country(self, country: str) -> List[Dict[str, Any]]:
+    @cached(STAFF_TTL, tags=("staff", "nominations", "oscars"))
+    def get_staff_by_country(self, country: str) -> ResultSet:
         """Show all nominated staff from a given country, including categories, nominations, and Oscar count"""
-        if not self.connection:
-            self.connect()
-            
-        try:
-            with self.connection.cursor() as cursor:
-                # SQL: SELECT s.name, 
-                # (SELECT GROUP_CONCAT(DISTINCT n.category) FROM nominations n WHERE n.staff_id = s.id) as categories,
-                # (SELECT COUNT(*) FROM nominations n WHERE n.staff_id = s.id) as nomination_count,
-                # (SELECT COUNT(*) FROM oscars o WHERE o.staff_id = s.id) as oscar_count
-                # FROM staff s
-                # WHERE s.birth_country = %s
-                # AND EXISTS (SELECT 1 FROM nominations n WHERE n.staff_id = s.id)
-                cursor.execute("SELECT 'Jane Doe' as name, 'Best Director, Best Screenplay' as categories, 3 as nomination_count, 1 as oscar_count")
-                return cursor.fetchall()
-        except Exception as e:
-            print(f"Error fetching staff by country: {e}")
-            return []
+        return self._read(self._plan_get_staff_by_country(country))
     
-    def get_dream_team(self) -> Dict[str, Any]:
-        """Show Best living cast (director, actors, producer, singer)"""
-        if not self.connection:
-            self.connect()
-            
-        try:
-            with self.connection.cursor() as cursor:
-                # SQL for Director: SELECT s.name, COUNT(*) as oscar_count
-                # FROM oscars o JOIN staff s ON o.staff_id = s.id
-                # WHERE o.category = 'Best Director' AND s.is_alive = 1
-                # GROUP BY s.id ORDER BY oscar_count DESC LIMIT 1
-                
-                # Similar queries for other roles...
-                
-                cursor.execute("SELECT 1")  # Placeholder
-                return {
-                    'director': {'name': 'Steven Spielberg', 'oscar_count': 3},
-                    'actor': {'name': 'Leonardo DiCaprio', 'oscar_count': 1},
-                    'actress': {'name': 'Meryl Streep', 'oscar_count': 3},
-                    'producer': {'name': 'Kevin Feige', 'oscar_count': 0},
-                    'singer': {'name': 'Adele', 'oscar_count': 1}
-                }
-        except Exception as e:
-            print(f"Error fetching dream team: {e}")
-            return {}
+    def _plan_get_staff_by_country(self, country: str) -> ReadPlan:
+        return ReadPlan("staff by country", ResultSet(()), "staff_by_country", (country, 0),
+                        sources=self._sources(lambda engine: engine.staff_by_country(country),
+                                              lambda local: local.get_staff_by_country(country)))
     
-    def get_top_production_companies(self) -> List[Dict[str, Any]]:
+    @cached(HISTORICAL_TTL, tags=("staff", "oscars"))
+    def get_dream_team(self, roles: Optional[Dict[str, str]] = None, top_k: int = 1) -> Dict[str, Any]:
+        """Show Best living cast (director, actors, producer, singer)
+        
+        roles maps each role to the award category that decides it and
+        defaults to DREAM_TEAM_CATEGORIES. With top_k > 1 each role maps to a
+        list of its top_k candidates instead of a single person, so ties stay
+        visible. All roles are ranked in a single statement.
+        """
+        return self._read(self._plan_get_dream_team(roles, top_k))
+    
+    def _plan_get_dream_team(self, roles: Optional[Dict[str, str]] = None, top_k: int = 1) -> ReadPlan:
+        roles = roles or DREAM_TEAM_CATEGORIES
+        group = lambda rows: _group_dream_team(rows, roles, top_k)
+        sql = None if len(roles) == DREAM_TEAM_ROLE_COUNT else dream_team_sql(len(roles))
+        return ReadPlan("dream team", {}, "dream_team", _dream_team_params(roles, top_k), sql, group,
+                        self._sources(lambda engine: group(engine.dream_team_rows(roles, top_k)),
+                                      lambda local: group(local.get_dream_team_rows(roles, top_k))))
+    
+    @cached(HISTORICAL_TTL, tags=("oscars", "movies", "production_companies"))
+    def get_top_production_companies(self) -> ResultSet:
         """Get Top 5 production companies by Oscars won"""
-        if not self.connection:
-            self.connect()
-            
+        return self._read(self._plan_get_top_production_companies())
+    
+    def _plan_get_top_production_companies(self) -> ReadPlan:
+        # Reads the company_oscar_counts summary (see leaderboards.py)
+        return ReadPlan("top production companies", ResultSet(()), "top_production_companies",
+                        leaderboard=True,
+                        sources=self._sources(lambda engine: engine.top_production_companies(),
+                                              lambda local: local.get_top_production_companies()))
+    
+    @cached(HISTORICAL_TTL, tags=("oscars", "movies"))
+    def get_non_english_oscar_winners(self) -> ResultSet:
+        """List all non-English speaking Oscar-winning movies with year"""
+        return self._read(self._plan_get_non_english_oscar_winners())
+    
+    def _plan_get_non_english_oscar_winners(self) -> ReadPlan:
+        year, oscar_id = _NEWEST_FIRST_START
+        return ReadPlan("non-English Oscar winners", ResultSet(()), "non_english_winners",
+                        (year, year, oscar_id),
+                        sources=self._sources(lambda engine: engine.non_english_oscar_winners(),
+                                              lambda local: local.get_non_english_oscar_winners()))
+    
+    @cached(STAFF_TTL, tags=("staff",))
+    def get_staff_list(self, limit: int = 20) -> ResultSet:
+        """Retrieve a list of staff members"""
+        return self._read(self._plan_get_staff_list(limit))
+    
+    def _plan_get_staff_list(self, limit: int = 20) -> ReadPlan:
+        return ReadPlan("staff list", ResultSet(()), "staff_list", (limit,),
+                        sources=self._sources(snapshot=lambda local: local.get_staff_list(limit)))
+    
+    def load_search_indexes(self, tables: Optional[Iterable[str]] = None, rebuild: Iterable[str] = ()) -> bool:
+        """Build the in-memory name indexes, or add rows newer than the last load
+        
+        Tables in rebuild get a new index of every row, after names changed
+        in place. Reads from the local snapshot when it is ready, otherwise
+        streams the names from the server. Run off the UI thread; searches
+        stay available on the old contents while a refresh is in progress.
+        """
+        rebuild = set(rebuild)
         try:
-            with self.connection.cursor() as cursor:
-                # SQL: SELECT pc.name, COUNT(*) as oscar_count
-                # FROM oscars o
-                # JOIN movies m ON o.movie_id = m.id
-                # JOIN production_companies pc ON m.production_company_id = pc.id
-                # GROUP BY pc.id
-                # ORDER BY oscar_count DESC
-                # LIMIT 5
-                cursor.execute("SELECT 'Warner Bros.' as name, 45 as oscar_count")
-                return cursor.fetchall()
+            for table in tables or SEARCHABLE_NAMES:
+                self._refresh_search_index(table, table in rebuild)
+            return True
         except Exception as e:
-            print(f"Error fetching top production companies: {e}")
+            print(f"Error loading search indexes: {e}")
+            return False
+    
+    def _refresh_search_index(self, table: str, rebuild: bool = False) -> None:
+        column = SEARCHABLE_NAMES[table]
+        with self._search_lock:
+            index = None if rebuild else self.search_indexes.get(table)
+            after_id = index.max_id if index is not None else 0
+            local = self._local()
+            catalog = self._current_catalog(table)
+            if catalog is not None:
+                rows = catalog.pairs(column, after_id)
+            elif local is not None:
+                rows = local.get_names(table, column, after_id)
+            else:
+                stream = self._stream(f"{table}_names_stream", (after_id,), batch_size=5000)
+                rows = ((row['id'], row['name']) for row in stream)
+            if index is None:
+                index = SearchIndex()
+                index.build(rows)
+                self.search_indexes[table] = index
+            else:
+                index.add(rows)
+    
+    def open_catalogs(self) -> bool:
+        """Map the catalog files written by an earlier run; returns True if all are present
+        
+        Opening reads only each file's header, so this is cheap enough for
+        the UI thread at startup.
+        """
+        with self._catalog_lock:
+            for table, spec in CATALOGS.items():
+                if table not in self.catalogs:
+                    catalog = open_catalog(default_catalog_path(table, self.catalog_directory), spec)
+                    if catalog is not None:
+                        self.catalogs[table] = catalog
+            return len(self.catalogs) == len(CATALOGS)
+    
+    def refresh_catalogs(self, tables: Optional[Iterable[str]] = None, force: Iterable[str] = ()) -> List[str]:
+        """Rewrite catalog files that are missing or behind their source table
+        
+        Tables in force are rewritten even when current, after their rows
+        changed in place. Rows come from the local snapshot when it is ready,
+        otherwise they are streamed from the database, in one pass either
+        way. Returns the tables rewritten. Run off the UI thread.
+        """
+        written = []
+        force = set(force)
+        with self._catalog_lock:
+            for table in tables or CATALOGS:
+                try:
+                    source_watermark = self._catalog_source_watermark(table)
+                    catalog = self.catalogs.get(table)
+                    if table not in force and catalog is not None and catalog.watermark == source_watermark:
+                        continue
+                    spec = CATALOGS[table]
+                    path = default_catalog_path(table, self.catalog_directory)
+                    if catalog is not None and os.name == "nt":
+                        # Windows cannot replace a file that is still mapped
+                        del self.catalogs[table]
+                        catalog.close()
+                    local = self._local()
+                    if local is not None:
+                        rows = local.iter_catalog_rows(table)
+                    else:
+                        rows = (tuple(row[name] for name in spec.names)
+                                for row in self._stream(spec.query, batch_size=5000))
+                    write_catalog(path, spec, rows)
+                    # Elsewhere the old mapping stays valid for readers still holding it
+                    self.catalogs[table] = Catalog(path, spec)
+                    written.append(table)
+                except Exception as e:
+                    print(f"Error writing {table} catalog: {e}")
+        return written
+    
+    def _catalog_source_watermark(self, table: str) -> int:
+        """Highest id of a catalog table in the source the catalog is written from"""
+        local = self._local()
+        if local is not None:
+            return local.watermarks().get(table) or 0
+        with self._cursor() as cursor:
+            self.queries.execute(cursor, f"{table}_max_id")
+            row = cursor.fetchone()
+        return (row['max_id'] if row else None) or 0
+    
+    def _current_catalog(self, table: str) -> Optional[Catalog]:
+        """The table's catalog if it holds at least what the local snapshot has"""
+        catalog = self.catalogs.get(table)
+        if catalog is None:
+            return None
+        local = self._local()
+        if local is not None and catalog.watermark < (local.watermarks().get(table) or 0):
+            return None
+        return catalog
+    
+    def _search(self, table: str, text: str, limit: int) -> List[Tuple[int, str]]:
+        if table not in self.search_indexes and not self.load_search_indexes([table]):
             return []
+        return self.search_indexes[table].search(text, limit)
     
-    def get_non_english_oscar_winners(self) -> List[Dict[str, Any]]:
-        """List all non-English speaking Oscar-winning movies with year"""
-        if not self.connection:
-            self.connect()
-            
+    def search_staff(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Find staff whose name matches a typed prefix, best match first"""
+        return [{'id': staff_id, 'name': name} for staff_id, name in self._search("staff", prefix, limit)]
+    
+    def search_movies(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Find movies whose title matches a typed prefix, best match first"""
+        return [{'id': movie_id, 'title': title} for movie_id, title in self._search("movies", prefix, limit)]
+    
+    def _stream(self, name: str, params: Tuple = (), batch_size: int = PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """Yield the rows of a registered query through an unbuffered server-side cursor
+        
+        The pooled connection stays checked out until the generator is
+        exhausted or closed.
+        """
+        with self._connection() as connection:
+            with connection.cursor(self.backend.streaming_cursor()) as cursor:
+                self.queries.execute(cursor, name, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        return
+                    yield from rows
+    
+    def _keyset_pages(self, fetch_page: Callable[..., Tuple[List[Dict[str, Any]], Optional[str]]],
+                      *args: Any, page_size: int = PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """Yield every row of a page-token query, one page at a time"""
+        token = None
+        while True:
+            rows, token = fetch_page(*args, token, page_size)
+            yield from rows
+            if token is None:
+                return
+    
+    def iter_staff(self, batch_size: int = PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """Stream every staff member in id order"""
+        if self._local() is not None:
+            return self._keyset_pages(self.get_staff_page, page_size=batch_size)
+        return self._stream("staff_stream", (0,), batch_size)
+    
+    def iter_staff_by_country(self, country: str, batch_size: int = PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """Stream every nominated staff member from a country"""
+        if self._local() is not None:
+            return self._keyset_pages(self.get_staff_by_country_page, country, page_size=batch_size)
+        return self._stream("staff_by_country_stream", (country, 0), batch_size)
+    
+    def iter_non_english_oscar_winners(self, batch_size: int = PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """Stream every non-English Oscar winner, newest first"""
+        if self._local() is not None:
+            return self._keyset_pages(self.get_non_english_oscar_winners_page, page_size=batch_size)
+        year, oscar_id = _NEWEST_FIRST_START
+        return self._stream("non_english_winners_stream", (year, year, oscar_id), batch_size)
+    
+    def get_staff_page(self, page_token: Optional[str] = None,
+                       page_size: int = PAGE_SIZE) -> Tuple[ResultSet, Optional[str]]:
+        """Fetch one page of staff; returns the rows and the token for the next page (None at the end)"""
+        return self._read(self._plan_get_staff_page(page_token, page_size))
+    
+    def _plan_get_staff_page(self, page_token: Optional[str] = None, page_size: int = PAGE_SIZE) -> ReadPlan:
+        after_id = _decode_page_token(page_token)[0] if page_token else 0
+        split = lambda rows: _split_page(rows, page_size, lambda row: (row['id'],))
+        return ReadPlan("staff page", (ResultSet(()), None), "staff_page", (after_id, page_size + 1),
+                        shape=split,
+                        sources=self._sources(snapshot=lambda local: split(
+                            local.get_staff_page(after_id, page_size + 1))))
+    
+    def get_staff_by_country_page(self, country: str, page_token: Optional[str] = None,
+                                  page_size: int = PAGE_SIZE) -> Tuple[ResultSet, Optional[str]]:
+        """Fetch one page of nominated staff from a country, with a token for the next page"""
+        return self._read(self._plan_get_staff_by_country_page(country, page_token, page_size))
+    
+    def _plan_get_staff_by_country_page(self, country: str, page_token: Optional[str] = None,
+                                        page_size: int = PAGE_SIZE) -> ReadPlan:
+        after_id = _decode_page_token(page_token)[0] if page_token else 0
+        split = lambda rows: _split_page(rows, page_size, lambda row: (row['id'],))
+        return ReadPlan("staff by country page", (ResultSet(()), None), "staff_by_country_page",
+                        (country, after_id, page_size + 1), shape=split,
+                        sources=self._sources(snapshot=lambda local: split(
+                            local.get_staff_by_country_page(country, after_id, page_size + 1))))
+    
+    @cached(HISTORICAL_TTL, tags=("oscars", "movies"))
+    def get_non_english_oscar_winners_page(self, page_token: Optional[str] = None,
+                                           page_size: int = PAGE_SIZE) -> Tuple[ResultSet, Optional[str]]:
+        """Fetch one page of non-English Oscar winners (newest first), with a token for the next page"""
+        return self._read(self._plan_get_non_english_oscar_winners_page(page_token, page_size))
+    
+    def _plan_get_non_english_oscar_winners_page(self, page_token: Optional[str] = None,
+                                                 page_size: int = PAGE_SIZE) -> ReadPlan:
+        year, oscar_id = _decode_page_token(page_token) if page_token else _NEWEST_FIRST_START
+        split = lambda rows: _split_page(rows, page_size, _winners_page_key)
+        return ReadPlan("non-English Oscar winners page", (ResultSet(()), None), "non_english_winners_page",
+                        (year, year, oscar_id, page_size + 1), shape=split,
+                        sources=self._sources(snapshot=lambda local: split(
+                            local.get_non_english_oscar_winners_page(year, oscar_id, page_size + 1))))
+    
+    def bulk_add_nominations(self, rows: Iterable[Dict[str, Any]], chunk_size: int = 1000) -> ImportReport:
+        """Insert many user nominations with batched lookups and multi-row inserts
+        
+        Each row needs user_id, category, and either staff_id or staff_name and
+        either movie_id or movie_title. Names are resolved to ids with one
+        query per chunk; each chunk's nominations and leaderboard counts are
+        written with executemany in a single transaction. Rows that cannot be
+        resolved are reported instead of aborting the import.
+        """
+        report = ImportReport()
+        started = time.perf_counter()
+        staff_by_name: Dict[str, Optional[int]] = {}
+        known_staff: Dict[int, bool] = {}
+        movies_by_title: Dict[str, Optional[Tuple[int, int]]] = {}
+        movies_by_id: Dict[int, Optional[Tuple[int, int]]] = {}
         try:
-            with self.connection.cursor() as cursor:
-                # SQL: SELECT m.title, m.language, YEAR(m.release_date) as year, o.category
-                # FROM oscars o
-                # JOIN movies m ON o.movie_id = m.id
-                # WHERE m.language != 'English'
-                # ORDER BY year DESC
-                cursor.execute("SELECT 'Parasite' as title, 'Korean' as language, 2020 as year, 'Best Picture' as category")
-                return cursor.fetchall()
+            counted = self._leaderboards_ready()
+            with self._cursor() as cursor:
+                for chunk in _chunks(enumerate(rows, 1), chunk_size):
+                    self._resolve_nomination_refs(cursor, chunk, staff_by_name, known_staff,
+                                                  movies_by_title, movies_by_id)
+                    nominations = []
+                    counts: Dict[Tuple[int, str, int], int] = {}
+                    for row_number, row in chunk:
+                        resolved = self._resolve_nomination(row, staff_by_name, known_staff,
+                                                            movies_by_title, movies_by_id)
+                        if isinstance(resolved, str):
+                            report.rejected.append((row_number, resolved))
+                            continue
+                        user_id, staff_id, (movie_id, year), category = resolved
+                        nominations.append((user_id, staff_id, movie_id, category))
+                        counts[(movie_id, category, year)] = counts.get((movie_id, category, year), 0) + 1
+                    if not nominations:
+                        continue
+                    
+                    cursor.connection.begin()
+                    self.queries.executemany(cursor, "bulk_add_nominations", nominations)
+                    if counted:
+                        self.queries.executemany(cursor, "add_nomination_counts",
+                                                 [key + (count,) for key, count in counts.items()])
+                        self.queries.execute(cursor, "count_nominations", (len(nominations),))
+                    cursor.connection.commit()
+                    report.inserted += len(nominations)
+                    report.chunks += 1
         except Exception as e:
-            print(f"Error fetching non-English Oscar winners: {e}")
-            return []
+            print(f"Error importing nominations: {e}")
+            report.error = str(e)
+        report.seconds = time.perf_counter() - started
+        if report.inserted:
+            self.invalidate("user_nominations")
+        return report
     
-    def get_staff_list(self, limit: int = 20) -> List[Dict[str, Any]]:
-        """Retrieve a list of staff members"""
-        if not self.connection:
-            self.connect()
+    def _resolve_nomination_refs(self, cursor, chunk: List[Tuple[int, Dict[str, Any]]],
+                                 staff_by_name: Dict[str, Optional[int]], known_staff: Dict[int, bool],
+                                 movies_by_title: Dict[str, Optional[Tuple[int, int]]],
+                                 movies_by_id: Dict[int, Optional[Tuple[int, int]]]) -> None:
+        """Look up every staff and movie reference in a chunk that is not cached yet"""
+        staff_names = {row['staff_name'] for _, row in chunk
+                       if row.get('staff_name') and not row.get('staff_id')} - staff_by_name.keys()
+        staff_ids = {_as_int(row['staff_id']) for _, row in chunk if row.get('staff_id')} - known_staff.keys()
+        titles = {row['movie_title'] for _, row in chunk
+                  if row.get('movie_title') and not row.get('movie_id')} - movies_by_title.keys()
+        movie_ids = {_as_int(row['movie_id']) for _, row in chunk if row.get('movie_id')} - movies_by_id.keys()
+        staff_ids.discard(None)
+        movie_ids.discard(None)
         
+        # Ids found in the local catalogs need no query. Reference rows are
+        # never deleted, so a hit is final; a miss may be newer than the
+        # catalog and is still looked up on the server.
+        staff_catalog = self.catalogs.get("staff")
+        if staff_catalog is not None and staff_ids:
+            found_ids = {staff_id for staff_id in staff_ids if staff_id in staff_catalog}
+            known_staff.update((staff_id, True) for staff_id in found_ids)
+            staff_ids -= found_ids
+        movie_catalog = self.catalogs.get("movies")
+        if movie_catalog is not None and movie_ids:
+            for movie_id in list(movie_ids):
+                index = movie_catalog.index_of(movie_id)
+                if index is not None:
+                    movies_by_id[movie_id] = (movie_id, movie_catalog.value(index, "year") or 0)
+                    movie_ids.discard(movie_id)
+        
+        if staff_names:
+            names = list(staff_names)
+            self.queries.execute(cursor, STAFF_BY_NAMES, names,
+                                 sql=f"SELECT id, name FROM staff WHERE name IN ({_in_clause(names)})")
+            for name in names:
+                staff_by_name[name] = None
+            found: Dict[str, List[int]] = {}
+            for row in cursor.fetchall():
+                found.setdefault(row['name'], []).append(row['id'])
+            for name, ids in found.items():
+                # Ambiguous names stay unresolved rather than guessing
+                staff_by_name[name] = ids[0] if len(ids) == 1 else None
+        if staff_ids:
+            ids = list(staff_ids)
+            self.queries.execute(cursor, STAFF_BY_IDS, ids,
+                                 sql=f"SELECT id FROM staff WHERE id IN ({_in_clause(ids)})")
+            present = {row['id'] for row in cursor.fetchall()}
+            known_staff.update((staff_id, staff_id in present) for staff_id in ids)
+        if titles:
+            names = list(titles)
+            self.queries.execute(cursor, MOVIES_BY_TITLES, names, sql=f"""
+                SELECT id, title, COALESCE(YEAR(release_date), 0) as year
+                FROM movies WHERE title IN ({_in_clause(names)})
+            """)
+            for title in names:
+                movies_by_title[title] = None
+            found_movies: Dict[str, List[Tuple[int, int]]] = {}
+            for row in cursor.fetchall():
+                found_movies.setdefault(row['title'], []).append((row['id'], row['year']))
+            for title, matches in found_movies.items():
+                movies_by_title[title] = matches[0] if len(matches) == 1 else None
+        if movie_ids:
+            ids = list(movie_ids)
+            self.queries.execute(cursor, MOVIES_BY_IDS, ids, sql=f"""
+                SELECT id, COALESCE(YEAR(release_date), 0) as year
+                FROM movies WHERE id IN ({_in_clause(ids)})
+            """)
+            for movie_id in ids:
+                movies_by_id[movie_id] = None
+            for row in cursor.fetchall():
+                movies_by_id[row['id']] = (row['id'], row['year'])
+    
+    @staticmethod
+    def _resolve_nomination(row: Dict[str, Any], staff_by_name: Dict[str, Optional[int]],
+                            known_staff: Dict[int, bool],
+                            movies_by_title: Dict[str, Optional[Tuple[int, int]]],
+                            movies_by_id: Dict[int, Optional[Tuple[int, int]]]):
+        """Return (user_id, staff_id, (movie_id, year), category) or a rejection reason"""
+        user_id = _as_int(row.get('user_id'))
+        category = (row.get('category') or "").strip()
+        if user_id is None:
+            return "missing or invalid user_id"
+        if not category:
+            return "missing category"
+        
+        if row.get('staff_id'):
+            staff_id = _as_int(row['staff_id'])
+            if staff_id is None or not known_staff.get(staff_id):
+                return f"unknown staff_id {row['staff_id']!r}"
+        elif row.get('staff_name'):
+            staff_id = staff_by_name.get(row['staff_name'])
+            if staff_id is None:
+                return f"unknown or ambiguous staff name {row['staff_name']!r}"
+        else:
+            return "missing staff_id/staff_name"
+        
+        if row.get('movie_id'):
+            movie_id = _as_int(row['movie_id'])
+            movie = movies_by_id.get(movie_id) if movie_id is not None else None
+            if movie is None:
+                return f"unknown movie_id {row['movie_id']!r}"
+        elif row.get('movie_title'):
+            movie = movies_by_title.get(row['movie_title'])
+            if movie is None:
+                return f"unknown or ambiguous movie title {row['movie_title']!r}"
+        else:
+            return "missing movie_id/movie_title"
+        
+        return user_id, staff_id, movie, category
+    
+    def bulk_register_users(self, rows: Iterable[Dict[str, Any]], chunk_size: int = 1000) -> ImportReport:
+        """Register many users with batched validation and duplicate detection
+        
+        Each row needs username, email, birth_date (YYYY-MM-DD), gender and
+        country. Rows are validated per chunk, usernames and emails already
+        taken (in the database or earlier in the import) are found with one
+        query per chunk, and the survivors are inserted with executemany in a
+        single transaction. Invalid rows are reported without aborting.
+        """
+        report = ImportReport()
+        started = time.perf_counter()
+        today = date.today()
+        seen_usernames = set()
+        seen_emails = set()
         try:
-            with self.connection.cursor() as cursor:
-                # SQL: SELECT * FROM staff LIMIT %s
-                cursor.execute("SELECT * FROM staff LIMIT %s", (limit,))
-                return cursor.fetchall()
+            with self._cursor() as cursor:
+                for chunk in _chunks(enumerate(rows, 1), chunk_size):
+                    candidates = _prepare_registrations(chunk, today, report.rejected)
+                    if not candidates:
+                        continue
+                    
+                    usernames = [params[0] for _, params in candidates]
+                    emails = [params[1] for _, params in candidates]
+                    self.queries.execute(cursor, TAKEN_USERNAMES_EMAILS, usernames + emails, sql=f"""
+                        SELECT Username, EmailAddress FROM user
+                        WHERE Username IN ({_in_clause(usernames)}) OR EmailAddress IN ({_in_clause(emails)})
+                    """)
+                    # MySQL's default collation compares case-insensitively
+                    for row in cursor.fetchall():
+                        seen_usernames.add(row['Username'].casefold())
+                        seen_emails.add(row['EmailAddress'].casefold())
+                    
+                    survivors = []
+                    for row_number, params in candidates:
+                        username, email = params[0].casefold(), params[1].casefold()
+                        if username in seen_usernames:
+                            report.rejected.append((row_number, f"username {params[0]!r} already taken"))
+                        elif email in seen_emails:
+                            report.rejected.append((row_number, f"email {params[1]!r} already registered"))
+                        else:
+                            seen_usernames.add(username)
+                            seen_emails.add(email)
+                            survivors.append(params)
+                    if not survivors:
+                        continue
+                    
+                    cursor.connection.begin()
+                    self.queries.executemany(cursor, "bulk_register_users", survivors)
+                    cursor.connection.commit()
+                    report.inserted += len(survivors)
+                    report.chunks += 1
         except Exception as e:
-            print(f"Error fetching staff list: {e}")
-            return []
+            print(f"Error registering users: {e}")
+            report.error = str(e)
+        report.rejected.sort()
+        report.seconds = time.perf_counter() - started
+        if report.inserted:
+            self.invalidate("user")
+        return report
@@ -1,18 +1,39 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-import threading
+from tkinter import ttk, messagebox
 from typing import Dict, List, Any, Optional
 from datetime import datetime, date
 from database import Database
+from scheduler import FetchScheduler
+from results_view import VirtualResultsView
+from autocomplete import AutocompleteCombobox
+from perf_panel import PerformancePanel
+from perf import monitor, StartupTimer
 import utils
 
 class OscarsAppGUI:
     """Main GUI class for the Oscars App"""
     
-    def __init__(self, root):
+    def __init__(self, root, startup: Optional[StartupTimer] = None):
         self.root = root
+        self.startup = startup or StartupTimer()
         self.db = Database()
         self.current_user = None
+        self.search_ready = False
+        self.scheduler = FetchScheduler(
+            dispatch=lambda callback, *args: self.root.after(0, callback, *args),
+            max_workers=self.db.pool_max_size,
+            on_queue_change=self.update_queue_depth
+        )
+        # Batches of independent reads run concurrently on one event loop
+        # thread, created on first use (see start_async) to keep asyncio off
+        # the startup path
+        self.async_db = None
+        self.async_bridge = None
+        
+        # Dashboard results prefetched once the data source is settled; None
+        # means warmup.DEFAULT_CALLS, [] (or MOVIE_AWARDS_WARMUP=off) disables
+        self.warmup_calls = None
+        self.warmup = None
         
         # Set up the main window
         self.root.title("Movie Awards Oracle")
@@ -32,7 +53,7 @@ class OscarsAppGUI:
         self.style = ttk.Style()
         self.style.configure("TFrame", background=self.bg_color)
         self.style.configure("Gold.TLabel", background=self.bg_color, foreground=self.accent_color, font=("Arial", 16, "bold"))
-        self.style.configure("TLabel", background=self.bg_color, foreground=self.text_color, font=("Arial", 12"))
+        self.style.configure("TLabel", background=self.bg_color, foreground=self.text_color, font=("Arial", 12))
         self.style.configure("TButton", 
                             background=self.button_bg, 
                             foreground=self.button_fg, 
@@ -49,6 +70,7 @@ class OscarsAppGUI:
         
         # Initialize database connection
         self.check_database_connection()
+        self.startup.mark("window built")
     
     def create_header_frame(self):
         """Create the header frame with title"""
@@ -86,18 +108,9 @@ class OscarsAppGUI:
         # Results area title
         ttk.Label(self.results_frame, text="Results", style="Gold.TLabel").pack(anchor=tk.W, pady=(0, 10))
         
-        # Results display (Treeview)
-        self.results_tree = ttk.Treeview(self.results_frame, show="headings")
-        self.results_tree.pack(fill=tk.BOTH, expand=True)
-        
-        # Scrollbars for the treeview
-        treescroll_y = ttk.Scrollbar(self.results_tree, orient=tk.VERTICAL, command=self.results_tree.yview)
-        treescroll_y.pack(side=tk.RIGHT, fill=tk.Y)
-        self.results_tree.configure(yscrollcommand=treescroll_y.set)
-        
-        treescroll_x = ttk.Scrollbar(self.results_tree, orient=tk.HORIZONTAL, command=self.results_tree.xview)
-        treescroll_x.pack(side=tk.BOTTOM, fill=tk.X)
-        self.results_tree.configure(xscrollcommand=treescroll_x.set)
+        # Results display (virtualized Treeview)
+        self.results_view = VirtualResultsView(self.results_frame)
+        self.results_view.pack(fill=tk.BOTH, expand=True)
         
         # Results text for more detailed output
         self.results_text = tk.Text(self.results_frame, height=10, width=50, wrap=tk.WORD)
@@ -148,6 +161,15 @@ class OscarsAppGUI:
         self.status_bar = ttk.Frame(self.root)
         self.status_bar.pack(fill=tk.X, side=tk.BOTTOM)
         
+        self.queue_label = ttk.Label(self.status_bar, text="Queue: 0", anchor=tk.E)
+        self.queue_label.pack(side=tk.RIGHT, padx=10, pady=5)
+        
+        # Timings are only collected while the performance panel is open
+        self.perf_panel = PerformancePanel(self.root, monitor, extra=self.performance_report,
+                                           notes=self.startup_notes)
+        ttk.Button(self.status_bar, text="Performance", command=self.toggle_performance_panel).pack(
+            side=tk.RIGHT, pady=2)
+        
         self.status_label = ttk.Label(self.status_bar, text="Ready", anchor=tk.W)
         self.status_label.pack(fill=tk.X, padx=10, pady=5)
         
@@ -156,39 +178,76 @@ class OscarsAppGUI:
         self.status_label.config(text=message)
         self.root.update_idletasks()
     
+    def toggle_performance_panel(self):
+        """Show or hide the live latency panel above the status bar"""
+        self.perf_panel.toggle(side=tk.BOTTOM, fill=tk.X, padx=20, pady=(0, 5))
+    
+    def performance_report(self):
+        """Extra sections for the performance panel's JSON dump"""
+        report = {'queries': self.db.queries.stats(), 'startup': self.startup.report()}
+        if self.warmup is not None:
+            report['warmup'] = self.warmup.timings
+        return report
+    
+    def startup_notes(self):
+        """Startup and warm-up reports shown under the performance table"""
+        notes = [self.startup.format()]
+        if self.warmup is not None and self.warmup.timings:
+            notes.append(self.warmup.format())
+        return "\n".join(notes)
+    
+    def update_queue_depth(self, depth):
+        """Show how many background fetches are queued or running"""
+        self.queue_label.config(text=f"Queue: {depth}")
+    
     def clear_results(self):
         """Clear the results area"""
-        # Clear the treeview
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
-        
-        # Reset the columns
-        for col in self.results_tree["columns"]:
-            self.results_tree.heading(col, text="")
-        
-        self.results_tree["columns"] = ()
+        # Swap in an empty model; only the visible rows need deleting
+        self.results_view.on_need_rows = None
+        self.results_view.clear()
         
         # Clear the text area
         self.results_text.delete(1.0, tk.END)
     
-    def display_results_in_tree(self, data, columns):
-        """Display results in the treeview"""
-        self.clear_results()
+    def display_results_in_tree(self, data, columns, next_page=None):
+        """Display results in the treeview
+        
+        next_page is an optional (fetch_page, args, page_token) triple; further
+        pages are then fetched as the user scrolls towards the end.
+        """
+        self.results_text.delete(1.0, tk.END)
         
         if not data:
+            self.clear_results()
             self.results_text.insert(tk.END, "No results found.")
             return
         
-        # Configure columns
-        self.results_tree["columns"] = columns
-        for col in columns:
-            self.results_tree.heading(col, text=col.capitalize())
-            self.results_tree.column(col, width=100, anchor=tk.CENTER)
+        self.set_next_page(next_page)
+        self.results_view.set_rows(data, columns, more_available=self.results_view.on_need_rows is not None)
+    
+    def set_next_page(self, next_page):
+        """Arrange for the results view to load the next page on demand"""
+        if not next_page or next_page[2] is None:
+            self.results_view.on_need_rows = None
+            return
+        fetch_page, args, page_token = next_page
+        
+        def load_more():
+            self.update_status("Loading more results...")
+            self.scheduler.submit(
+                fetch_page, *args, page_token,
+                pane="results", on_done=lambda page: self.append_page(page, fetch_page, args)
+            )
         
-        # Insert data
-        for i, item in enumerate(data):
-            values = [item.get(col, "") for col in columns]
-            self.results_tree.insert("", tk.END, iid=i, values=values)
+        self.results_view.on_need_rows = load_more
+    
+    def append_page(self, page, fetch_page, args):
+        """Append a lazily fetched page to the results view"""
+        rows, page_token = page
+        self.set_next_page((fetch_page, args, page_token))
+        self.results_view.append_rows(rows, more_available=page_token is not None)
+        more = " (scroll for more)" if page_token else ""
+        self.update_status(f"Showing {len(self.results_view.rows)} rows{more}.")
     
     def display_text_results(self, text):
         """Display results in the text area"""
@@ -287,11 +346,11 @@ class OscarsAppGUI:
         dialog.grab_set()
         
         ttk.Label(dialog, text="Staff Name:").pack(pady=(10, 5))
-        staff_entry = ttk.Entry(dialog, width=30)
+        staff_entry = AutocompleteCombobox(dialog, self.search_staff, width=30)
         staff_entry.pack(pady=5)
         
         ttk.Label(dialog, text="Movie Title:").pack(pady=5)
-        movie_entry = ttk.Entry(dialog, width=30)
+        movie_entry = AutocompleteCombobox(dialog, self.search_movies, label_key="title", width=30)
         movie_entry.pack(pady=5)
         
         ttk.Label(dialog, text="Award Category:").pack(pady=5)
@@ -306,6 +365,27 @@ class OscarsAppGUI:
         category_menu = ttk.Combobox(dialog, textvariable=category_var, values=categories, width=30)
         category_menu.pack(pady=5)
         
+        def record(user_id, staff, staff_id, movie, movie_id, category):
+            # Resolve names typed without picking a suggestion to the best match
+            if staff_id is None:
+                matches = self.db.search_staff(staff, limit=1)
+                staff_id = matches[0]['id'] if matches else None
+            if movie_id is None:
+                matches = self.db.search_movies(movie, limit=1)
+                movie_id = matches[0]['id'] if matches else None
+            if staff_id is None or movie_id is None:
+                return None
+            return self.db.add_nomination(user_id, staff_id, movie_id, category)
+        
+        def on_recorded(success, staff, movie, category):
+            if success is None:
+                messagebox.showerror("Error", "Unknown staff member or movie. Pick one from the suggestions.")
+            elif success:
+                messagebox.showinfo("Success", f"Nomination recorded: {staff} for {movie} in category {category}")
+                self.update_status(f"Nomination added: {staff} for {movie}")
+            else:
+                messagebox.showerror("Error", "Failed to record nomination. Please try again.")
+        
         def on_submit():
             staff = staff_entry.get()
             movie = movie_entry.get()
@@ -315,10 +395,11 @@ class OscarsAppGUI:
                 messagebox.showerror("Error", "All fields are required")
                 return
             
-            # In actual implementation, we would search for staff_id and movie_id
-            # For now, just show a success message
-            messagebox.showinfo("Success", f"Nomination recorded: {staff} for {movie} in category {category}")
-            self.update_status(f"Nomination added: {staff} for {movie}")
+            self.scheduler.submit(
+                record, self.current_user['id'], staff, staff_entry.selected_id(),
+                movie, movie_entry.selected_id(), category,
+                on_done=lambda success: on_recorded(success, staff, movie, category)
+            )
             dialog.destroy()
         
         ttk.Button(dialog, text="Submit Nomination", command=on_submit).pack(pady=10)
@@ -331,13 +412,10 @@ class OscarsAppGUI:
         
         self.update_status("Fetching your nominations...")
         
-        def fetch_thread():
-            nominations = self.db.get_user_nominations(self.current_user.get('id', 0))
-            
-            # Update UI in the main thread
-            self.root.after(0, lambda: self.display_user_nominations(nominations))
-        
-        threading.Thread(target=fetch_thread).start()
+        self.scheduler.submit(
+            self.db.get_user_nominations, self.current_user.get('id', 0),
+            pane="results", on_done=self.display_user_nominations
+        )
     
     def display_user_nominations(self, nominations):
         """Display user nominations in the results area"""
@@ -377,13 +455,10 @@ class OscarsAppGUI:
             self.update_status("Searching for top nominated movies...")
             dialog.destroy()
             
-            def fetch_thread():
-                movies = self.db.get_top_nominated_movies(category, year)
-                
-                # Update UI in the main thread
-                self.root.after(0, lambda: self.display_top_movies(movies, category, year))
-            
-            threading.Thread(target=fetch_thread).start()
+            self.scheduler.submit(
+                self.db.get_top_nominated_movies, category, year,
+                pane="results", on_done=lambda movies: self.display_top_movies(movies, category, year)
+            )
         
         ttk.Button(dialog, text="Search", command=on_search).pack(pady=10)
     
@@ -408,23 +483,40 @@ class OscarsAppGUI:
     
     def view_staff_stats(self):
         """Show total nominations and Oscars for a given staff member"""
-        staff_name = simpledialog.askstring("Staff Stats", "Enter staff member name:")
-        if not staff_name:
-            return
-        
-        self.update_status(f"Searching for stats on {staff_name}...")
-        
-        # In a real implementation, we would search for staff_id by name
-        # For demonstration, use a dummy staff_id
-        staff_id = 1
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Staff Stats")
+        dialog.geometry("300x150")
+        dialog.transient(self.root)
+        dialog.grab_set()
         
-        def fetch_thread():
-            stats = self.db.get_staff_stats(staff_id)
+        ttk.Label(dialog, text="Enter staff member name:").pack(pady=(10, 5))
+        staff_entry = AutocompleteCombobox(dialog, self.search_staff, width=30)
+        staff_entry.pack(pady=5)
+        staff_entry.focus_set()
+        
+        def fetch_stats(staff_name, staff_id):
+            if staff_id is None:
+                matches = self.db.search_staff(staff_name, limit=1)
+                if not matches:
+                    return {}
+                staff_id = matches[0]['id']
+            return self.db.get_staff_stats(staff_id)
+        
+        def on_search(event=None):
+            staff_name = staff_entry.get().strip()
+            if not staff_name:
+                return
+            staff_id = staff_entry.selected_id()
+            dialog.destroy()
             
-            # Update UI in the main thread
-            self.root.after(0, lambda: self.display_staff_stats(stats, staff_name))
+            self.update_status(f"Searching for stats on {staff_name}...")
+            self.scheduler.submit(
+                fetch_stats, staff_name, staff_id,
+                pane="results", on_done=lambda stats: self.display_staff_stats(stats, staff_name)
+            )
         
-        threading.Thread(target=fetch_thread).start()
+        staff_entry.bind("<Return>", on_search)
+        ttk.Button(dialog, text="Search", command=on_search).pack(pady=10)
     
     def display_staff_stats(self, stats, staff_name):
         """Display staff statistics in the results area"""
@@ -443,13 +535,10 @@ class OscarsAppGUI:
         """Show top 5 birth countries for actors who won Best Actor"""
         self.update_status("Fetching top actor birth countries...")
         
-        def fetch_thread():
-            countries = self.db.get_top_actor_birth_countries()
-            
-            # Update UI in the main thread
-            self.root.after(0, lambda: self.display_top_countries(countries))
-        
-        threading.Thread(target=fetch_thread).start()
+        self.scheduler.submit(
+            self.db.get_top_actor_birth_countries,
+            pane="results", on_done=self.display_top_countries
+        )
     
     def display_top_countries(self, countries):
         """Display top actor birth countries in the results area"""
@@ -465,22 +554,21 @@ class OscarsAppGUI:
     
     def view_staff_by_country(self):
         """Show all nominated staff from a given country"""
+        from tkinter import simpledialog
         country = simpledialog.askstring("Staff by Country", "Enter country name:")
         if not country:
             return
         
         self.update_status(f"Searching for staff from {country}...")
         
-        def fetch_thread():
-            staff_list = self.db.get_staff_by_country(country)
-            
-            # Update UI in the main thread
-            self.root.after(0, lambda: self.display_staff_by_country(staff_list, country))
-        
-        threading.Thread(target=fetch_thread).start()
+        self.scheduler.submit(
+            self.db.get_staff_by_country_page, country,
+            pane="results", on_done=lambda page: self.display_staff_by_country(page, country)
+        )
     
-    def display_staff_by_country(self, staff_list, country):
-        """Display staff by country in the results area"""
+    def display_staff_by_country(self, page, country):
+        """Display the first page of staff by country in the results area"""
+        staff_list, page_token = page
         if not staff_list:
             self.clear_results()
             self.display_text_results(f"No nominated staff found from {country}.")
@@ -488,20 +576,19 @@ class OscarsAppGUI:
             return
         
         columns = ["name", "categories", "nomination_count", "oscar_count"]
-        self.display_results_in_tree(staff_list, columns)
-        self.update_status(f"Found {len(staff_list)} staff members from {country}.")
+        self.display_results_in_tree(staff_list, columns,
+                                     next_page=(self.db.get_staff_by_country_page, (country,), page_token))
+        more = " (scroll for more)" if page_token else ""
+        self.update_status(f"Found {len(staff_list)} staff members from {country}{more}.")
     
     def view_dream_team(self):
         """Show Best living cast (director, actors, producer, singer)"""
         self.update_status("Calculating dream team...")
         
-        def fetch_thread():
-            dream_team = self.db.get_dream_team()
-            
-            # Update UI in the main thread
-            self.root.after(0, lambda: self.display_dream_team(dream_team))
-        
-        threading.Thread(target=fetch_thread).start()
+        self.scheduler.submit(
+            self.db.get_dream_team,
+            pane="results", on_done=self.display_dream_team
+        )
     
     def display_dream_team(self, dream_team):
         """Display dream team in the results area"""
@@ -525,13 +612,10 @@ class OscarsAppGUI:
         """Show top 5 production companies by Oscars won"""
         self.update_status("Fetching top production companies...")
         
-        def fetch_thread():
-            companies = self.db.get_top_production_companies()
-            
-            # Update UI in the main thread
-            self.root.after(0, lambda: self.display_top_companies(companies))
-        
-        threading.Thread(target=fetch_thread).start()
+        self.scheduler.submit(
+            self.db.get_top_production_companies,
+            pane="results", on_done=self.display_top_companies
+        )
     
     def display_top_companies(self, companies):
         """Display top production companies in the results area"""
@@ -549,16 +633,14 @@ class OscarsAppGUI:
         """List all non-English speaking Oscar-winning movies"""
         self.update_status("Fetching non-English Oscar winners...")
         
-        def fetch_thread():
-            movies = self.db.get_non_english_oscar_winners()
-            
-            # Update UI in the main thread
-            self.root.after(0, lambda: self.display_non_english_winners(movies))
-        
-        threading.Thread(target=fetch_thread).start()
+        self.scheduler.submit(
+            self.db.get_non_english_oscar_winners_page,
+            pane="results", on_done=self.display_non_english_winners
+        )
     
-    def display_non_english_winners(self, movies):
-        """Display non-English Oscar winners in the results area"""
+    def display_non_english_winners(self, page):
+        """Display the first page of non-English Oscar winners in the results area"""
+        movies, page_token = page
         if not movies:
             self.clear_results()
             self.display_text_results("No non-English Oscar winners found.")
@@ -566,23 +648,23 @@ class OscarsAppGUI:
             return
         
         columns = ["title", "language", "year", "category"]
-        self.display_results_in_tree(movies, columns)
-        self.update_status(f"Found {len(movies)} non-English Oscar-winning movies.")
+        self.display_results_in_tree(movies, columns,
+                                     next_page=(self.db.get_non_english_oscar_winners_page, (), page_token))
+        more = " (scroll for more)" if page_token else ""
+        self.update_status(f"Found {len(movies)} non-English Oscar-winning movies{more}.")
     
     def view_staff_list(self):
         """View list of staff members"""
         self.update_status("Fetching staff list...")
         
-        def fetch_thread():
-            staff_list = self.db.get_staff_list()
-            
-            # Update UI in the main thread
-            self.root.after(0, lambda: self.display_staff_list(staff_list))
-        
-        threading.Thread(target=fetch_thread).start()
+        self.scheduler.submit(
+            self.db.get_staff_page,
+            pane="results", on_done=self.display_staff_list
+        )
     
-    def display_staff_list(self, staff_list):
-        """Display staff list in the results area"""
+    def display_staff_list(self, page):
+        """Display the first page of the staff list in the results area"""
+        staff_list, page_token = page
         if not staff_list:
             self.clear_results()
             self.display_text_results("No staff members found.")
@@ -590,21 +672,133 @@ class OscarsAppGUI:
             return
         
         columns = list(staff_list[0].keys())
-        self.display_results_in_tree(staff_list, columns)
-        self.update_status(f"Found {len(staff_list)} staff members.")
+        self.display_results_in_tree(staff_list, columns,
+                                     next_page=(self.db.get_staff_page, (), page_token))
+        more = " (scroll for more)" if page_token else ""
+        self.update_status(f"Found {len(staff_list)} staff members{more}.")
+    
+    def search_staff(self, text, limit):
+        """Autocomplete lookup; empty until the name indexes have loaded"""
+        return self.db.search_staff(text, limit) if self.search_ready else []
+    
+    def search_movies(self, text, limit):
+        """Autocomplete lookup; empty until the name indexes have loaded"""
+        return self.db.search_movies(text, limit) if self.search_ready else []
+    
+    def load_search_indexes(self):
+        """Build the autocomplete name indexes and the staff statistics index in the background"""
+        self.scheduler.submit(self.db.load_search_indexes, on_done=self.on_search_indexes_loaded)
+        if self.db.staff_stats is None:
+            self.scheduler.submit(self.db.load_staff_stats, on_done=self.on_staff_stats_loaded)
+    
+    def on_search_indexes_loaded(self, success):
+        self.search_ready = success
+        self.startup.mark("search indexes loaded")
+    
+    def on_staff_stats_loaded(self, success):
+        if success:
+            self.startup.mark("staff stats loaded")
+    
+    def start_async(self):
+        """Create the asyncio data layer and its event loop thread, once"""
+        if self.async_bridge is None:
+            from async_database import AsyncDatabase, AsyncBridge
+            self.async_db = AsyncDatabase(self.db)
+            self.async_bridge = AsyncBridge(
+                dispatch=lambda callback, *args: self.root.after(0, callback, *args)
+            )
+    
+    def start_warmup(self):
+        """Prefetch the static dashboard aggregates so their first click renders from cache"""
+        if self.warmup is not None:
+            return
+        from warmup import WarmUp, DEFAULT_CALLS, enabled_from_environment
+        calls = DEFAULT_CALLS if self.warmup_calls is None else self.warmup_calls
+        if not calls or not enabled_from_environment():
+            return
+        self.start_async()
+        self.warmup = WarmUp(
+            self.async_db,
+            calls,
+            # Yield to anything the user is waiting on; the async pool's
+            # connections are reserved apart from the ones its fetches use
+            is_busy=lambda: self.scheduler.busy,
+            parallel=self.async_db.max_size,
+            timer=self.startup
+        )
+        self.async_bridge.submit(self.warmup.run(), on_done=self.on_warmup_done)
+    
+    def start_analytics(self):
+        """Load the NumPy analytics engine in the background; a no-op without numpy"""
+        if self.db.analytics is None:
+            self.scheduler.submit(self.db.load_analytics, on_done=self.on_analytics_loaded)
+    
+    def on_analytics_loaded(self, success):
+        if success:
+            self.startup.mark("analytics loaded")
+    
+    def on_warmup_done(self, timings):
+        # The full startup and warm-up reports are in the performance panel
+        if timings:
+            elapsed = self.startup.report().get("warm-up done")
+            self.update_status(f"Prefetched {len(timings)} views in {elapsed:.0f} ms")
     
     def check_database_connection(self):
         """Check and establish database connection"""
-        self.update_status("Connecting to database...")
-        
-        def connection_thread():
-            success = self.db.connect()
-            if success:
-                self.update_status("Connected to database.")
-            else:
-                self.update_status("Database connection failed!")
-                messagebox.showerror("Connection Error", 
-                                    "Failed to connect to the database. Check your internet connection and try again.")
-        
-        # Run connection in a separate thread to avoid freezing the UI
-        threading.Thread(target=connection_thread).start()
+        # A complete local snapshot lets features answer before the server is reachable
+        self.offline_ready = self.db.open_snapshot()
+        # Maps the staff and movie catalogs of the last run; reads only their headers
+        self.db.open_catalogs()
+        if self.offline_ready:
+            self.update_status("Loaded local snapshot. Connecting to database...")
+        else:
+            self.update_status("Connecting to database...")
+        
+        # Connect on a worker thread to avoid freezing the UI
+        self.scheduler.submit(self.db.connect, on_done=self.on_database_connected)
+    
+    def on_database_connected(self, success):
+        """Report the outcome of the initial database connection"""
+        if success:
+            self.startup.mark("database connected")
+        if success and not self.db.backend.remote:
+            # A local database file needs no snapshot
+            self.update_status(f"Using local database {self.db.backend.path}.")
+            # The search indexes read their names from the refreshed catalogs
+            self.scheduler.submit(self.db.refresh_catalogs, on_done=lambda _: self.load_search_indexes())
+            self.start_warmup()
+            self.start_analytics()
+        elif success:
+            self.update_status("Connected to database. Syncing local snapshot...")
+            self.scheduler.submit(self.db.sync_snapshot, on_done=self.on_snapshot_synced)
+        elif self.offline_ready:
+            self.update_status("Database unreachable. Showing data from the local snapshot.")
+            self.load_search_indexes()
+            self.start_warmup()
+            self.start_analytics()
+        else:
+            self.update_status("Database connection failed!")
+            messagebox.showerror("Connection Error", 
+                                "Failed to connect to the database. Check your internet connection and try again.")
+    
+    def on_snapshot_synced(self, changed_tables):
+        """Report the outcome of the background snapshot sync"""
+        self.startup.mark("snapshot synced")
+        self.offline_ready = self.db.snapshot is not None and self.db.snapshot.is_ready()
+        if changed_tables is None:
+            self.update_status("Connected to database. Local snapshot sync failed.")
+        elif changed_tables:
+            rows = sum(stats.rows for stats in self.db.last_sync_stats)
+            seconds = sum(stats.seconds for stats in self.db.last_sync_stats)
+            rate = rows / seconds if seconds > 0 else 0
+            self.update_status(f"Connected to database. Local snapshot updated: "
+                               f"{rows} row(s) in {', '.join(changed_tables)} ({rate:,.0f} rows/s).")
+        else:
+            self.update_status("Connected to database. Local snapshot is up to date.")
+        
+        # Sync keeps loaded indexes current; build them once the data source is settled
+        if not self.search_ready:
+            self.load_search_indexes()
+        # After the sync, so prefetched results are not invalidated by it
+        self.start_warmup()
+        self.start_analytics()
@@ -0,0 +1,107 @@
+import argparse
+import sys
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
+from queries import QueryRegistry, SHOW_INDEX, CREATE_INDEX, EXPLAIN
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """An index the app's queries rely on"""
+    table: str
+    columns: Tuple[str, ...]
+    name: str
+    reason: str = ""
+
+    def ddl(self) -> str:
+        return f"CREATE INDEX {self.name} ON {self.table} ({', '.join(self.columns)});"
+
+# Indexes backing the joins and filters in database.py
+REQUIRED_INDEXES = [
+    IndexSpec("nominations", ("staff_id",), "idx_nominations_staff",
+              "staff stats and staff-by-country join nominations on staff_id"),
+    IndexSpec("oscars", ("staff_id",), "idx_oscars_staff",
+              "staff stats, staff-by-country and dream team join oscars on staff_id"),
+    IndexSpec("oscars", ("category",), "idx_oscars_category",
+              "top actor countries and dream team filter oscars by category"),
+    IndexSpec("oscars", ("movie_id",), "idx_oscars_movie",
+              "production company and non-English winner queries join oscars to movies"),
+    IndexSpec("staff", ("birth_country",), "idx_staff_birth_country",
+              "staff-by-country filters staff by birth_country"),
+    IndexSpec("user_nominations", ("user_id",), "idx_user_nominations_user",
+              "a user's nominations are looked up by user_id"),
+]
+
+def _registry(queries: Optional[QueryRegistry]) -> QueryRegistry:
+    return queries if queries is not None else QueryRegistry(use_prepared=False)
+
+def existing_indexes(cursor, table: str, queries: Optional[QueryRegistry] = None) -> List[Tuple[str, ...]]:
+    """Return the column lists of every index on a table via SHOW INDEX"""
+    _registry(queries).execute(cursor, SHOW_INDEX, sql=f"SHOW INDEX FROM {table}")
+    indexes: Dict[str, List[Tuple[int, str]]] = {}
+    for row in cursor.fetchall():
+        indexes.setdefault(row['Key_name'], []).append((row['Seq_in_index'], row['Column_name']))
+    return [tuple(column for _, column in sorted(parts)) for parts in indexes.values()]
+
+def missing_indexes(cursor, required: List[IndexSpec] = REQUIRED_INDEXES,
+                    queries: Optional[QueryRegistry] = None) -> List[IndexSpec]:
+    """Return the required indexes not covered by a leftmost prefix of an existing one"""
+    queries = _registry(queries)
+    missing = []
+    cache: Dict[str, List[Tuple[str, ...]]] = {}
+    for spec in required:
+        if spec.table not in cache:
+            cache[spec.table] = existing_indexes(cursor, spec.table, queries)
+        width = len(spec.columns)
+        if not any(columns[:width] == spec.columns for columns in cache[spec.table]):
+            missing.append(spec)
+    return missing
+
+def migration_ddl(missing: List[IndexSpec]) -> str:
+    """Render a migration script creating the missing indexes"""
+    if not missing:
+        return "-- All required indexes are present."
+    lines = ["-- Indexes required by Movie Awards Oracle queries"]
+    for spec in missing:
+        lines.append(f"-- {spec.reason}")
+        lines.append(spec.ddl())
+    return "\n".join(lines)
+
+def full_scans(cursor, sql: str, params: Tuple = (), queries: Optional[QueryRegistry] = None) -> List[str]:
+    """EXPLAIN a query and return the tables it reads with a full scan"""
+    _registry(queries).execute(cursor, EXPLAIN, params, sql="EXPLAIN " + sql)
+    return [row['table'] for row in cursor.fetchall() if row.get('type') == "ALL"]
+
+def main(argv=None) -> int:
+    """Check the live schema and print (or apply) the missing index DDL"""
+    parser = argparse.ArgumentParser(description="Check the database for the indexes the app needs")
+    parser.add_argument("--apply", action="store_true", help="execute the generated DDL")
+    parser.add_argument("--explain", metavar="COUNTRY",
+                        help="also report full table scans in the staff-by-country plan for COUNTRY")
+    args = parser.parse_args(argv)
+
+    from database import Database
+    from queries import STAFF_BY_COUNTRY_KEYSET_SQL
+
+    db = Database()
+    if not db.backend.remote:
+        print("The SQLite backend creates its indexes with the schema; nothing to check.")
+        return 0
+    if not db.connect():
+        return 1
+    try:
+        with db._cursor() as cursor:
+            missing = missing_indexes(cursor, queries=db.queries)
+            print(migration_ddl(missing))
+            if args.apply:
+                for spec in missing:
+                    print(f"Creating {spec.name} on {spec.table}...")
+                    db.queries.execute(cursor, CREATE_INDEX, sql=spec.ddl().rstrip(";"))
+            if args.explain:
+                scans = full_scans(cursor, STAFF_BY_COUNTRY_KEYSET_SQL, (args.explain, 0), db.queries)
+                print(f"Full scans in staff-by-country plan: {', '.join(scans) or 'none'}")
+    finally:
+        db.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+import sys
+from typing import List, Optional
+
+# Summary tables behind the leaderboard views. movie_nomination_counts is
+# kept current by Database.add_nomination and bulk_add_nominations; the
+# Oscar-based tables only change when a ceremony's results are loaded.
+# leaderboard_state records the oscars rows and the user_nominations row
+# count the summaries cover. The app's nomination writes advance that count
+# in the same transaction, so only rows written by other clients leave it
+# behind. Database compares it with the live tables on connect and at most
+# every leaderboard_check_interval seconds after, and rebuilds the stale
+# summaries (as --rebuild does). Staff without a birth country are not
+# counted in country_winner_counts, on every read path alike.
+CREATE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS movie_nomination_counts (
+        movie_id INT NOT NULL,
+        category VARCHAR(100) NOT NULL,
+        year INT NOT NULL,
+        nomination_count INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (movie_id, category, year),
+        KEY idx_category_year (category, year)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS company_oscar_counts (
+        production_company_id INT NOT NULL PRIMARY KEY,
+        oscar_count INT NOT NULL DEFAULT 0,
+        KEY idx_oscar_count (oscar_count)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS country_winner_counts (
+        birth_country VARCHAR(100) NOT NULL,
+        category VARCHAR(100) NOT NULL,
+        winner_count INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (birth_country, category),
+        KEY idx_category_count (category, winner_count)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS leaderboard_state (
+        oscars_max_id INT NOT NULL,
+        oscars_count INT NOT NULL,
+        nominations_count INT NOT NULL
+    )
+    """,
+]
+
+# The same tables for the embedded SQLite backend
+SQLITE_CREATE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS movie_nomination_counts (
+        movie_id INTEGER NOT NULL,
+        category TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        nomination_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (movie_id, category, year)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_movie_nomination_counts_category_year "
+    "ON movie_nomination_counts (category, year)",
+    """
+    CREATE TABLE IF NOT EXISTS company_oscar_counts (
+        production_company_id INTEGER NOT NULL PRIMARY KEY,
+        oscar_count INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_company_oscar_counts_count ON company_oscar_counts (oscar_count)",
+    """
+    CREATE TABLE IF NOT EXISTS country_winner_counts (
+        birth_country TEXT NOT NULL,
+        category TEXT NOT NULL,
+        winner_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (birth_country, category)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_country_winner_counts_category "
+    "ON country_winner_counts (category, winner_count)",
+    """
+    CREATE TABLE IF NOT EXISTS leaderboard_state (
+        oscars_max_id INTEGER NOT NULL,
+        oscars_count INTEGER NOT NULL,
+        nominations_count INTEGER NOT NULL
+    )
+    """,
+]
+
+# The rows the summaries cover; a summary is stale once the live values
+# differ from the copy kept in leaderboard_state
+OSCARS_MAX_ID_SQL = "SELECT COALESCE(MAX(id), 0) FROM oscars"
+OSCARS_COUNT_SQL = "SELECT COUNT(*) FROM oscars"
+NOMINATIONS_COUNT_SQL = "SELECT COUNT(*) FROM user_nominations"
+LEADERBOARD_MARK_SQL = f"""
+    SELECT ({OSCARS_MAX_ID_SQL}) AS oscars_max_id, ({OSCARS_COUNT_SQL}) AS oscars_count,
+        ({NOMINATIONS_COUNT_SQL}) AS nominations_count
+"""
+LEADERBOARD_STATE_SQL = "SELECT oscars_max_id, oscars_count, nominations_count FROM leaderboard_state"
+
+# Run with each app nomination write, in its transaction. Parameter: rows added
+COUNT_NOMINATIONS_SQL = "UPDATE leaderboard_state SET nominations_count = nominations_count + %s"
+
+# Full recomputation of each summary from the base tables
+NOMINATION_REBUILD_STATEMENTS = [
+    "DELETE FROM movie_nomination_counts",
+    """
+    INSERT INTO movie_nomination_counts (movie_id, category, year, nomination_count)
+    SELECT un.movie_id, un.category, COALESCE(YEAR(m.release_date), 0), COUNT(*)
+    FROM user_nominations un
+    JOIN movies m ON un.movie_id = m.id
+    GROUP BY un.movie_id, un.category, COALESCE(YEAR(m.release_date), 0)
+    """,
+    f"UPDATE leaderboard_state SET nominations_count = ({NOMINATIONS_COUNT_SQL})",
+]
+
+OSCAR_REBUILD_STATEMENTS = [
+    "DELETE FROM company_oscar_counts",
+    """
+    INSERT INTO company_oscar_counts (production_company_id, oscar_count)
+    SELECT m.production_company_id, COUNT(*)
+    FROM oscars o
+    JOIN movies m ON o.movie_id = m.id
+    WHERE m.production_company_id IS NOT NULL
+    GROUP BY m.production_company_id
+    """,
+    "DELETE FROM country_winner_counts",
+    """
+    INSERT INTO country_winner_counts (birth_country, category, winner_count)
+    SELECT s.birth_country, o.category, COUNT(*)
+    FROM oscars o
+    JOIN staff s ON o.staff_id = s.id
+    WHERE s.birth_country IS NOT NULL
+    GROUP BY s.birth_country, o.category
+    """,
+    f"UPDATE leaderboard_state SET oscars_max_id = ({OSCARS_MAX_ID_SQL}), oscars_count = ({OSCARS_COUNT_SQL})",
+]
+
+# A full rebuild starts from a fresh state row, which the statements above fill in
+REBUILD_STATEMENTS = [
+    "DELETE FROM leaderboard_state",
+    "INSERT INTO leaderboard_state (oscars_max_id, oscars_count, nominations_count) VALUES (0, 0, 0)",
+] + NOMINATION_REBUILD_STATEMENTS + OSCAR_REBUILD_STATEMENTS
+
+# Incremental maintenance for one new user nomination.
+# Parameters: movie_id, category, movie_id
+RECORD_NOMINATION_SQL = """
+    INSERT INTO movie_nomination_counts (movie_id, category, year, nomination_count)
+    SELECT %s, %s, COALESCE(YEAR(release_date), 0), 1 FROM movies WHERE id = %s
+    ON DUPLICATE KEY UPDATE nomination_count = nomination_count + 1
+"""
+
+# Batched maintenance after a bulk import, one row per (movie, category, year).
+# Parameters: movie_id, category, year, added_count
+ADD_NOMINATION_COUNTS_SQL = """
+    INSERT INTO movie_nomination_counts (movie_id, category, year, nomination_count)
+    VALUES (%s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE nomination_count = nomination_count + VALUES(nomination_count)
+"""
+
+# SQLite spellings of the two upserts above
+RECORD_NOMINATION_SQLITE = """
+    INSERT INTO movie_nomination_counts (movie_id, category, year, nomination_count)
+    SELECT %s, %s, COALESCE(YEAR(release_date), 0), 1 FROM movies WHERE id = %s
+    ON CONFLICT (movie_id, category, year) DO UPDATE SET nomination_count = nomination_count + 1
+"""
+
+ADD_NOMINATION_COUNTS_SQLITE = """
+    INSERT INTO movie_nomination_counts (movie_id, category, year, nomination_count)
+    VALUES (%s, %s, %s, %s)
+    ON CONFLICT (movie_id, category, year)
+    DO UPDATE SET nomination_count = nomination_count + excluded.nomination_count
+"""
+
+def create_tables(cursor, dialect: str = "mysql") -> None:
+    """Create any missing summary tables"""
+    for statement in SQLITE_CREATE_TABLES if dialect == "sqlite" else CREATE_TABLES:
+        cursor.execute(statement)
+
+def rebuild(cursor, statements: List[str] = REBUILD_STATEMENTS) -> None:
+    """Recompute the summary tables (by default all of them) in one transaction"""
+    cursor.connection.begin()
+    try:
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.connection.commit()
+    except Exception:
+        cursor.connection.rollback()
+        raise
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Create and/or backfill the leaderboard summary tables"""
+    # Deferred: this module is imported by the app, but argparse is only needed here
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Maintain the leaderboard summary tables")
+    parser.add_argument("--create", action="store_true", help="create missing summary tables")
+    parser.add_argument("--rebuild", action="store_true", help="recompute all summaries from the base tables")
+    args = parser.parse_args(argv)
+    if not (args.create or args.rebuild):
+        parser.error("nothing to do; pass --create and/or --rebuild")
+
+    from database import Database
+
+    db = Database()
+    if not db.connect():
+        return 1
+    try:
+        with db._cursor() as cursor:
+            if args.create:
+                print("Creating summary tables...")
+                create_tables(cursor, db.backend.dialect)
+            if args.rebuild:
+                print("Rebuilding summary tables...")
+                rebuild(cursor)
+    finally:
+        db.close()
+    print("Done.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,7 @@
 import tkinter as tk
 import sys
 import os
+import time
 import traceback
 
 def resource_path(relative_path):
@@ -32,8 +33,23 @@ def handle_exception(exc_type, exc_value, exc_traceback):
     # Default exception handling
     sys.__excepthook__(exc_type, exc_value, exc_traceback)
 
+def report_first_window(root, app):
+    """Mark the first idle moment after the window appears
+    
+    With MOVIE_AWARDS_STARTUP_EXIT set (see benchmarks/startup_bench.py) the
+    timings are printed as JSON and the application quits.
+    """
+    app.startup.mark("first window")
+    if os.environ.get("MOVIE_AWARDS_STARTUP_EXIT"):
+        import json
+        print("STARTUP " + json.dumps(app.startup.report()), flush=True)
+        app.scheduler.shutdown()
+        root.destroy()
+
 def main():
     """Main entry point for the application"""
+    started = time.perf_counter()
+    
     # Set exception handler
     sys.excepthook = handle_exception
     
@@ -43,6 +59,7 @@ def main():
     # Now import the GUI module
     try:
         from gui import OscarsAppGUI
+        from perf import StartupTimer
     except ImportError as e:
         print(f"Error importing GUI module: {e}")
         if hasattr(sys, '_MEIPASS'):
@@ -65,12 +82,14 @@ def main():
     
     # Create the app GUI
     try:
-        app = OscarsAppGUI(root)
+        app = OscarsAppGUI(root, startup=StartupTimer(started))
     except Exception as e:
         print(f"Error creating GUI: {e}")
         traceback.print_exc()
         sys.exit(1)
     
+    root.after_idle(report_first_window, root, app)
+    
     # Start the main event loop
     try:
         root.mainloop()
@@ -1,22 +1,67 @@
 
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, fields
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Iterable
+
+class _Model:
+    """Bulk constructor shared by the models and their slot variants"""
+    __slots__ = ()
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Any]) -> List[Any]:
+        """Build one instance per row of a ResultSet or of dict rows
+
+        Columns that are not fields are ignored; fields without a column
+        keep their defaults. For a ResultSet the field positions are
+        resolved once, not per row, and encoded columns are decoded.
+        """
+        names = [f.name for f in fields(cls)]
+        columns = getattr(rows, "columns", None)
+        if columns is None:
+            return [cls(**{name: row[name] for name in names if name in row}) for row in rows]
+        present = [name for name in names if name in columns]
+        if not present:
+            return [cls() for _ in rows]
+        positions = [columns.index(name) for name in present]
+        if len(positions) == 1:
+            position = positions[0]
+            return [cls(**{present[0]: values[position]}) for values in rows.tuples()]
+        pick = itemgetter(*positions)
+        if present == names[:len(present)]:
+            # Leading fields in declaration order: pass positionally
+            return [cls(*pick(values)) for values in rows.tuples()]
+        return [cls(**dict(zip(present, pick(values)))) for values in rows.tuples()]
+
+def _slotted(cls: type, base: type = _Model) -> type:
+    """Copy of a dataclass with __slots__ instead of a per-instance __dict__
+
+    What dataclass(slots=True) does on Python 3.10+, which the app does
+    not require. The copy keeps the generated __init__/__repr__/__eq__
+    and the field metadata.
+    """
+    inherited = {f.name for f in fields(base)} if base is not _Model else set()
+    names = tuple(f.name for f in fields(cls) if f.name not in inherited)
+    namespace = {key: value for key, value in cls.__dict__.items()
+                 if key not in names and key not in ("__dict__", "__weakref__")}
+    namespace["__slots__"] = names
+    namespace["__qualname__"] = cls.__qualname__ + "Record"
+    return type(cls.__name__ + "Record", (base,), namespace)
 
 @dataclass
-class User:
+class User(_Model):
     id: Optional[int] = None
     username: str = ""
     email: str = ""
 
 @dataclass
-class Movie:
+class Movie(_Model):
     id: Optional[int] = None
     title: str = ""
     year: int = 0
     language: str = ""
     
 @dataclass
-class Staff:
+class Staff(_Model):
     id: Optional[int] = None
     name: str = ""
     birth_country: str = ""
@@ -24,7 +69,7 @@ class Staff:
     is_alive: bool = True
     
 @dataclass
-class Nomination:
+class Nomination(_Model):
     id: Optional[int] = None
     staff_id: int = 0
     movie_id: int = 0
@@ -37,9 +82,18 @@ class Oscar(Nomination):
     pass
 
 @dataclass
-class UserNomination:
+class UserNomination(_Model):
     id: Optional[int] = None
     user_id: int = 0
     staff_id: int = 0
     movie_id: int = 0
     category: str = ""
+
+# Slot-based variants for large result sets: same fields and behaviour,
+# no per-instance __dict__
+UserRecord = _slotted(User)
+MovieRecord = _slotted(Movie)
+StaffRecord = _slotted(Staff)
+NominationRecord = _slotted(Nomination)
+OscarRecord = _slotted(Oscar, NominationRecord)
+UserNominationRecord = _slotted(UserNomination)
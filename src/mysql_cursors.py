@@ -0,0 +1,48 @@
+import time
+import pymysql.cursors
+from perf import monitor
+
+class _TimedFetchMixin:
+    """Reports row conversion and fetch time to the perf monitor when it is enabled"""
+
+    def _do_get_result(self):
+        # For buffered dict cursors this is where raw rows become dicts
+        if not monitor.enabled:
+            return super()._do_get_result()
+        started = time.perf_counter()
+        result = super()._do_get_result()
+        monitor.record("convert", time.perf_counter() - started)
+        return result
+
+    def fetchone(self):
+        if not monitor.enabled:
+            return super().fetchone()
+        started = time.perf_counter()
+        row = super().fetchone()
+        monitor.record("fetch", time.perf_counter() - started)
+        return row
+
+    def fetchmany(self, size=None):
+        if not monitor.enabled:
+            return super().fetchmany(size)
+        started = time.perf_counter()
+        rows = super().fetchmany(size)
+        monitor.record("fetch", time.perf_counter() - started)
+        return rows
+
+    def fetchall(self):
+        if not monitor.enabled:
+            return super().fetchall()
+        started = time.perf_counter()
+        rows = super().fetchall()
+        monitor.record("fetch", time.perf_counter() - started)
+        return rows
+
+class TimedCursor(_TimedFetchMixin, pymysql.cursors.Cursor):
+    """Tuple rows, for reads returned as a ResultSet"""
+
+class TimedDictCursor(_TimedFetchMixin, pymysql.cursors.DictCursor):
+    """Default cursor for pooled connections"""
+
+class TimedSSDictCursor(_TimedFetchMixin, pymysql.cursors.SSDictCursor):
+    """Unbuffered cursor for streamed reads"""
@@ -0,0 +1,142 @@
+import bisect
+import json
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
+
+# Stages timed for every action, in display order. "execute" covers the
+# round trip and, for buffered cursors, the row-to-dict conversion also
+# reported on its own as "convert".
+STAGES = ("queue", "connect", "execute", "convert", "fetch", "render", "total")
+
+class LatencyHistogram:
+    """Log-scale latency histogram with doubling bucket bounds
+
+    Bucket i counts samples up to ``base * 2**i`` seconds, so percentiles are
+    estimated to within a factor of two from a few dozen integers.
+    """
+
+    def __init__(self, base: float = 0.0001, buckets: int = 24):
+        self.bounds = [base * 2 ** i for i in range(buckets)]
+        self.counts = [0] * (buckets + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples, capped at the max"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return min(self.bounds[bucket], self.max) if bucket < len(self.bounds) else self.max
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': self.percentile(0.50) * 1000,
+            'p95_ms': self.percentile(0.95) * 1000,
+            'p99_ms': self.percentile(0.99) * 1000,
+            'max_ms': self.max * 1000,
+        }
+
+class PerfMonitor:
+    """Per-action stage timings for the hot paths, off by default
+
+    Instrumented code checks ``enabled`` before reading the clock, so a
+    disabled monitor costs one attribute lookup per hook. Timings are
+    attributed to the action set on the current thread (the scheduler sets
+    it to the name of the function it runs), or to ``action=`` when given.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def action(self) -> str:
+        return getattr(self._local, "action", None) or "other"
+
+    @action.setter
+    def action(self, name: Optional[str]) -> None:
+        self._local.action = name
+
+    def record(self, stage: str, seconds: float, action: Optional[str] = None) -> None:
+        """Add one timing sample for a stage of an action"""
+        if not self.enabled:
+            return
+        key = (action or self.action, stage)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Latency summaries keyed by action, then stage"""
+        with self._lock:
+            items = [(key, histogram.summary()) for key, histogram in self._histograms.items()]
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (action, stage), summary in sorted(items, key=lambda item: (item[0][0], _stage_order(item[0][1]))):
+            result.setdefault(action, {})[stage] = summary
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def dump_json(self, path: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        """Write the current summaries (plus any extra sections) to a JSON file"""
+        report = {'generated_at': time.strftime("%Y-%m-%dT%H:%M:%S"), 'actions': self.stats()}
+        if extra:
+            report.update(extra)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+class StartupTimer:
+    """Named milestones measured from application start, for the startup report
+
+    Always on: a startup records a handful of marks, once.
+    """
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = time.perf_counter() if started is None else started
+        self._marks: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, name: str) -> float:
+        """Record a milestone (the first time only) and return its offset in seconds"""
+        elapsed = time.perf_counter() - self.started
+        with self._lock:
+            return self._marks.setdefault(name, elapsed)
+
+    def report(self) -> Dict[str, float]:
+        """Milestone offsets in milliseconds, in the order they were reached"""
+        with self._lock:
+            marks = sorted(self._marks.items(), key=lambda item: item[1])
+        return {name: round(seconds * 1000, 1) for name, seconds in marks}
+
+    def format(self) -> str:
+        lines = ["Startup timing (ms since launch):"]
+        lines.extend(f"  {ms:>9.1f}  {name}" for name, ms in self.report().items())
+        return "\n".join(lines)
+
+def _stage_order(stage: str) -> int:
+    return STAGES.index(stage) if stage in STAGES else len(STAGES)
+
+# Shared by the database layer, the scheduler and the GUI
+monitor = PerfMonitor()
@@ -0,0 +1,103 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from typing import Dict, Any, Optional, Callable
+from perf import PerfMonitor
+
+COLUMNS = ("action", "stage", "count", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+
+class PerformancePanel:
+    """Live table of per-action stage latencies from a PerfMonitor
+
+    Showing the panel enables the monitor and hiding it disables it again,
+    so timings are only collected while someone is looking. The table is
+    refreshed every ``refresh_ms`` while visible. ``extra`` may return
+    further sections (e.g. per-query stats) to include in the JSON dump,
+    and ``notes`` text (e.g. the startup report) shown below the table.
+    """
+
+    def __init__(self, parent, monitor: PerfMonitor, refresh_ms: int = 1000,
+                 extra: Optional[Callable[[], Dict[str, Any]]] = None,
+                 notes: Optional[Callable[[], str]] = None):
+        self.monitor = monitor
+        self.refresh_ms = refresh_ms
+        self.extra = extra
+        self.notes = notes
+        self.visible = False
+        self._pending = None
+
+        self.frame = ttk.Frame(parent)
+        toolbar = ttk.Frame(self.frame)
+        toolbar.pack(fill=tk.X)
+        ttk.Label(toolbar, text="Performance").pack(side=tk.LEFT)
+        ttk.Button(toolbar, text="Save JSON...", command=self.save_json).pack(side=tk.RIGHT, padx=(5, 0))
+        ttk.Button(toolbar, text="Reset", command=self.reset).pack(side=tk.RIGHT)
+
+        self.tree = ttk.Treeview(self.frame, columns=COLUMNS, show="headings", height=8)
+        for col in COLUMNS:
+            self.tree.heading(col, text=col.replace("_ms", " (ms)").capitalize())
+            self.tree.column(col, width=150 if col == "action" else 80,
+                             anchor=tk.W if col in ("action", "stage") else tk.E)
+        self.tree.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
+        self.notes_label = ttk.Label(self.frame, justify=tk.LEFT, font=("Courier", 9))
+        self.notes_label.pack(fill=tk.X, pady=(5, 0))
+
+    def toggle(self, **pack_options) -> None:
+        """Show the panel (and start timing) or hide it (and stop)"""
+        if self.visible:
+            self.hide()
+        else:
+            self.show(**pack_options)
+
+    def show(self, **pack_options) -> None:
+        self.visible = True
+        self.monitor.enabled = True
+        self.frame.pack(**pack_options)
+        self.refresh()
+
+    def hide(self) -> None:
+        self.visible = False
+        self.monitor.enabled = False
+        self.frame.pack_forget()
+        if self._pending is not None:
+            self.frame.after_cancel(self._pending)
+            self._pending = None
+
+    def refresh(self) -> None:
+        """Redraw the table from the monitor's current summaries"""
+        self.tree.delete(*self.tree.get_children())
+        for action, stages in self.monitor.stats().items():
+            for stage, summary in stages.items():
+                self.tree.insert("", tk.END, values=(
+                    action, stage, summary['count'],
+                    f"{summary['p50_ms']:.1f}", f"{summary['p95_ms']:.1f}",
+                    f"{summary['p99_ms']:.1f}", f"{summary['max_ms']:.1f}"
+                ))
+        if self.notes:
+            self.notes_label.config(text=self.notes())
+        if self.visible:
+            self._pending = self.frame.after(self.refresh_ms, self.refresh)
+
+    def reset(self) -> None:
+        self.monitor.reset()
+        self.refresh_now()
+
+    def refresh_now(self) -> None:
+        if self._pending is not None:
+            self.frame.after_cancel(self._pending)
+            self._pending = None
+        self.refresh()
+
+    def save_json(self) -> None:
+        """Ask for a file name and dump the current timings to it"""
+        from tkinter import filedialog
+        path = filedialog.asksaveasfilename(
+            title="Save performance report",
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            self.monitor.dump_json(path, self.extra() if self.extra else None)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not save performance report: {e}")
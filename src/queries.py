@@ -0,0 +1,456 @@
+import functools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+from weakref import WeakKeyDictionary
+from leaderboards import (RECORD_NOMINATION_SQL, ADD_NOMINATION_COUNTS_SQL,
+                          RECORD_NOMINATION_SQLITE, ADD_NOMINATION_COUNTS_SQLITE,
+                          LEADERBOARD_MARK_SQL, LEADERBOARD_STATE_SQL, COUNT_NOMINATIONS_SQL)
+from perf import LatencyHistogram, monitor
+
+# MySQL error raised by EXECUTE when the connection no longer has the statement
+ER_UNKNOWN_STMT_HANDLER = 1243
+
+@dataclass(frozen=True)
+class Query:
+    """A named SQL statement the app runs against the server
+
+    ``sql`` uses PyMySQL's ``%s`` placeholders. Queries with ``prepare`` set
+    and no parameters are run as server-side prepared statements on buffered
+    cursors; the rest (parameterized, streamed reads, executemany writes)
+    are always sent as text.
+    ``sqlite_sql`` overrides the text on the SQLite backend where the MySQL
+    spelling does not work there.
+    """
+    name: str
+    sql: str
+    prepare: bool = True
+    sqlite_sql: Optional[str] = None
+
+    def text(self, dialect: str) -> str:
+        if dialect == "sqlite" and self.sqlite_sql is not None:
+            return self.sqlite_sql
+        return self.sql
+
+    @property
+    def handle(self) -> str:
+        return f"q_{self.name}"
+
+    @property
+    def param_count(self) -> int:
+        return self.sql.count("%s")
+
+    def prepared_sql(self) -> str:
+        return self.sql.replace("%s", "?").replace("%%", "%")
+
+QUERIES: Dict[str, Query] = {}
+
+@functools.lru_cache(maxsize=512)
+def _sqlite_placeholders(sql: str) -> str:
+    """Rewrite PyMySQL format placeholders as sqlite3 qmark placeholders"""
+    return sql.replace("%s", "?").replace("%%", "%")
+
+def _sqlite_year(value: Any) -> Optional[int]:
+    """YEAR() for ISO date text, as MySQL's YEAR() does for DATE columns"""
+    if value is None:
+        return None
+    try:
+        return int(str(value)[:4])
+    except ValueError:
+        return None
+
+def register(name: str, sql: str, prepare: bool = True, sqlite_sql: Optional[str] = None) -> Query:
+    """Add a query to the registry; names must be unique"""
+    if name in QUERIES:
+        raise ValueError(f"Query {name!r} is already registered")
+    query = QUERIES[name] = Query(name, sql, prepare, sqlite_sql)
+    return query
+
+# Users and nominations
+
+register("register_user", """
+    INSERT INTO user (Username, EmailAddress, BirthDate, Age, Gender, Country)
+    VALUES (%s, %s, %s, %s, %s, %s)
+""")
+
+register("bulk_register_users", """
+    INSERT INTO user (Username, EmailAddress, BirthDate, Age, Gender, Country)
+    VALUES (%s, %s, %s, %s, %s, %s)
+""", prepare=False)
+
+register("add_nomination", """
+    INSERT INTO user_nominations (user_id, staff_id, movie_id, category)
+    VALUES (%s, %s, %s, %s)
+""")
+
+register("bulk_add_nominations", """
+    INSERT INTO user_nominations (user_id, staff_id, movie_id, category)
+    VALUES (%s, %s, %s, %s)
+""", prepare=False)
+
+register("record_nomination", RECORD_NOMINATION_SQL, sqlite_sql=RECORD_NOMINATION_SQLITE)
+register("add_nomination_counts", ADD_NOMINATION_COUNTS_SQL, prepare=False,
+         sqlite_sql=ADD_NOMINATION_COUNTS_SQLITE)
+
+register("user_nominations", """
+    SELECT un.id, s.name as staff_name, m.title as movie_title, un.category
+    FROM user_nominations un
+    JOIN staff s ON un.staff_id = s.id
+    JOIN movies m ON un.movie_id = m.id
+    WHERE un.user_id = %s
+""")
+
+# Leaderboards, read from the summary tables in leaderboards.py. The *_base
+# variants compute the same rows from the base tables, for a database where
+# the summary tables cannot be created.
+
+register("top_nominated_movies", """
+    SELECT m.title, SUM(c.nomination_count) as nomination_count
+    FROM movie_nomination_counts c
+    JOIN movies m ON c.movie_id = m.id
+    WHERE (c.category = %s OR %s IS NULL)
+    AND (c.year = %s OR %s IS NULL)
+    GROUP BY c.movie_id, m.title
+    ORDER BY nomination_count DESC
+    LIMIT 10
+""")
+
+register("top_actor_birth_countries", """
+    SELECT birth_country, winner_count
+    FROM country_winner_counts
+    WHERE category = 'Best Actor'
+    ORDER BY winner_count DESC
+    LIMIT 5
+""")
+
+register("top_production_companies", """
+    SELECT pc.name, c.oscar_count
+    FROM company_oscar_counts c
+    JOIN production_companies pc ON c.production_company_id = pc.id
+    ORDER BY c.oscar_count DESC
+    LIMIT 5
+""")
+
+register("top_nominated_movies_base", """
+    SELECT m.title, COUNT(*) as nomination_count
+    FROM user_nominations un
+    JOIN movies m ON un.movie_id = m.id
+    WHERE (un.category = %s OR %s IS NULL)
+    AND (COALESCE(YEAR(m.release_date), 0) = %s OR %s IS NULL)
+    GROUP BY un.movie_id, m.title
+    ORDER BY nomination_count DESC
+    LIMIT 10
+""")
+
+register("top_actor_birth_countries_base", """
+    SELECT s.birth_country, COUNT(*) as winner_count
+    FROM oscars o
+    JOIN staff s ON o.staff_id = s.id
+    WHERE o.category = 'Best Actor'
+    AND s.birth_country IS NOT NULL
+    GROUP BY s.birth_country
+    ORDER BY winner_count DESC
+    LIMIT 5
+""")
+
+register("top_production_companies_base", """
+    SELECT pc.name, COUNT(*) as oscar_count
+    FROM oscars o
+    JOIN movies m ON o.movie_id = m.id
+    JOIN production_companies pc ON m.production_company_id = pc.id
+    GROUP BY pc.id, pc.name
+    ORDER BY oscar_count DESC
+    LIMIT 5
+""")
+
+# Whether the summaries still match the oscars and user_nominations tables
+register("leaderboard_mark", LEADERBOARD_MARK_SQL)
+register("leaderboard_state", LEADERBOARD_STATE_SQL)
+register("count_nominations", COUNT_NOMINATIONS_SQL)
+
+# Staff
+
+@functools.lru_cache(maxsize=512)
+def staff_stats_sql(id_count: int) -> str:
+    """Per-staff totals for id_count staff ids, keyed by s.id
+
+    One grouped join instead of five correlated subqueries per staff row;
+    DISTINCT ids undo the nominations x oscars fan-out of the two joins.
+    Shared by the server query, the staff_stats_by_ids IN lists and the
+    snapshot.
+    """
+    ids = ", ".join(["%s"] * id_count)
+    return f"""
+        SELECT s.id, s.name, s.role,
+            COUNT(DISTINCT n.id) as nomination_count,
+            COUNT(DISTINCT o.id) as oscar_count,
+            GROUP_CONCAT(DISTINCT n.category) as categories,
+            MIN(n.year) as first_year,
+            MAX(n.year) as last_year
+        FROM staff s
+        LEFT JOIN nominations n ON n.staff_id = s.id
+        LEFT JOIN oscars o ON o.staff_id = s.id
+        WHERE s.id IN ({ids})
+        GROUP BY s.id, s.name, s.role
+    """
+
+register("staff_stats", staff_stats_sql(1))
+
+register("staff_list", "SELECT * FROM staff LIMIT %s")
+
+# Keyset-ordered list queries, resumable from the key of the last row read.
+# The *_page variants fetch one bounded page; the *_stream variants run
+# unbounded through a server-side cursor.
+STAFF_KEYSET_SQL = """
+    SELECT * FROM staff
+    WHERE id > %s
+    ORDER BY id
+"""
+
+# One grouped join instead of three correlated subqueries per staff row.
+# The inner join on nominations keeps only nominated staff (the old EXISTS);
+# DISTINCT ids undo the nominations x oscars fan-out of the two joins.
+STAFF_BY_COUNTRY_KEYSET_SQL = """
+    SELECT s.id, s.name,
+        GROUP_CONCAT(DISTINCT n.category) as categories,
+        COUNT(DISTINCT n.id) as nomination_count,
+        COUNT(DISTINCT o.id) as oscar_count
+    FROM staff s
+    JOIN nominations n ON n.staff_id = s.id
+    LEFT JOIN oscars o ON o.staff_id = s.id
+    WHERE s.birth_country = %s
+    AND s.id > %s
+    GROUP BY s.id, s.name
+    ORDER BY s.id
+"""
+
+# Movies without a release date sort after every dated one: the keyset
+# compares the year with NULL mapped to NULL_YEAR, which is below any real year.
+NULL_YEAR = 0
+# Keyset position before the first row of the newest-first winners listing
+_NEWEST_FIRST_START = (9999, 0)
+
+# SQLite spelling of YEAR(column); a Python YEAR() function per row is slower
+def _sqlite_year_of(column: str) -> str:
+    return f"CAST(substr({column}, 1, 4) AS INTEGER)"
+
+def _non_english_winners_keyset_sql(year: str) -> str:
+    return f"""
+    SELECT o.id, m.title, m.language, {year} as year, o.category
+    FROM oscars o
+    JOIN movies m ON o.movie_id = m.id
+    WHERE m.language != 'English'
+    AND (COALESCE({year}, {NULL_YEAR}) < %s
+        OR (COALESCE({year}, {NULL_YEAR}) = %s AND o.id > %s))
+    ORDER BY COALESCE({year}, {NULL_YEAR}) DESC, o.id
+"""
+
+NON_ENGLISH_WINNERS_KEYSET_SQL = _non_english_winners_keyset_sql("YEAR(m.release_date)")
+NON_ENGLISH_WINNERS_KEYSET_SQLITE = _non_english_winners_keyset_sql(_sqlite_year_of("m.release_date"))
+
+register("staff_page", STAFF_KEYSET_SQL + " LIMIT %s")
+register("staff_stream", STAFF_KEYSET_SQL, prepare=False)
+register("staff_by_country", STAFF_BY_COUNTRY_KEYSET_SQL)
+register("staff_by_country_page", STAFF_BY_COUNTRY_KEYSET_SQL + " LIMIT %s")
+register("staff_by_country_stream", STAFF_BY_COUNTRY_KEYSET_SQL, prepare=False)
+register("non_english_winners", NON_ENGLISH_WINNERS_KEYSET_SQL, sqlite_sql=NON_ENGLISH_WINNERS_KEYSET_SQLITE)
+register("non_english_winners_page", NON_ENGLISH_WINNERS_KEYSET_SQL + " LIMIT %s",
+         sqlite_sql=NON_ENGLISH_WINNERS_KEYSET_SQLITE + " LIMIT %s")
+register("non_english_winners_stream", NON_ENGLISH_WINNERS_KEYSET_SQL, prepare=False,
+         sqlite_sql=NON_ENGLISH_WINNERS_KEYSET_SQLITE)
+
+# (id, name) rows after a watermark id, loaded into the search indexes
+register("staff_names_stream", "SELECT id, name FROM staff WHERE id > %s ORDER BY id", prepare=False)
+register("movies_names_stream", "SELECT id, title AS name FROM movies WHERE id > %s ORDER BY id", prepare=False)
+
+# Full catalogs written to the memory-mapped files in catalog.py, and the
+# watermark that tells whether a written catalog is still current
+register("staff_catalog_stream",
+         "SELECT id, name, birth_country, role, is_alive FROM staff ORDER BY id", prepare=False)
+register("movies_catalog_stream",
+         "SELECT id, title, YEAR(release_date) AS year, language FROM movies ORDER BY id", prepare=False,
+         sqlite_sql=f"SELECT id, title, {_sqlite_year_of('release_date')} AS year, language FROM movies ORDER BY id")
+register("staff_max_id", "SELECT MAX(id) AS max_id FROM staff")
+register("movies_max_id", "SELECT MAX(id) AS max_id FROM movies")
+
+# Rows after a watermark id for the staff statistics index (staff_stats.py)
+register("staff_stats_staff_stream",
+         "SELECT id, name, role FROM staff WHERE id > %s ORDER BY id", prepare=False)
+register("staff_stats_nominations_stream",
+         "SELECT id, staff_id, category, year FROM nominations WHERE id > %s ORDER BY id", prepare=False)
+register("staff_stats_oscars_stream",
+         "SELECT id, staff_id FROM oscars WHERE id > %s ORDER BY id", prepare=False)
+
+def dream_team_sql(role_count: int) -> str:
+    """Rank living Oscar winners within every role in one statement
+
+    The roles arrive as a derived table of (role, category) parameter pairs,
+    so any number of roles costs a single round trip.
+    """
+    roles_table = " UNION ALL ".join(["SELECT %s AS role, %s AS category"] * role_count)
+    return f"""
+        SELECT role, name, oscar_count FROM (
+            SELECT r.role, s.name, COUNT(*) AS oscar_count,
+                ROW_NUMBER() OVER (PARTITION BY r.role ORDER BY COUNT(*) DESC, s.id) AS role_rank
+            FROM oscars o
+            JOIN staff s ON o.staff_id = s.id
+            JOIN ({roles_table}) r ON o.category = r.category
+            WHERE s.is_alive = 1
+            GROUP BY r.role, s.id, s.name
+        ) ranked
+        WHERE role_rank <= %s
+        ORDER BY role, role_rank
+    """
+
+# Prepared for the default five roles; other role counts run as ad-hoc text
+DREAM_TEAM_ROLE_COUNT = 5
+register("dream_team", dream_team_sql(DREAM_TEAM_ROLE_COUNT))
+
+# Bulk-import lookups are built per chunk with IN lists of varying length,
+# so they are not registered; QueryRegistry.execute() times them under these names.
+STAFF_BY_NAMES = "staff_by_names"
+STAFF_BY_IDS = "staff_by_ids"
+MOVIES_BY_TITLES = "movies_by_titles"
+MOVIES_BY_IDS = "movies_by_ids"
+TAKEN_USERNAMES_EMAILS = "taken_usernames_emails"
+# Ids missing from the staff statistics index, an IN list of the same kind
+STAFF_STATS_BY_IDS = "staff_stats_by_ids"
+# Maintenance statements built per table or per query (sync.py, index_advisor.py)
+SHOW_INDEX = "show_index"
+CREATE_INDEX = "create_index"
+EXPLAIN = "explain"
+
+def sync_stream_name(table: str) -> str:
+    """Name a sync delta stream of one mirrored table is timed under"""
+    return f"sync_{table}_stream"
+
+@dataclass
+class QueryStats:
+    """Execution counters for one named query"""
+    errors: int = 0
+    prepares: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+class QueryRegistry:
+    """Runs named queries, preparing them once per connection and timing each call
+
+    PyMySQL has no binary-protocol prepared statements, so statements are
+    prepared with SQL-level PREPARE the first time a connection runs them and
+    run with a bare ``EXECUTE``. Only parameterless queries take this path:
+    EXECUTE can only bind user variables, and setting them costs either a
+    second round trip or the MULTI_STATEMENTS client flag, which lets any
+    injected "; ..." run as a statement of its own. Parameterized queries are
+    sent as text with client-side escaping, in one round trip. Handles are
+    tracked per connection object; a connection that is closed and replaced
+    starts with none. ``dialect`` selects per-backend query text.
+    """
+
+    def __init__(self, queries: Dict[str, Query] = QUERIES, use_prepared: bool = True,
+                 dialect: str = "mysql"):
+        self.queries = queries
+        self.use_prepared = use_prepared
+        self.dialect = dialect
+        self._stats: Dict[str, QueryStats] = {}
+        self._prepared: "WeakKeyDictionary[Any, set]" = WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def execute(self, cursor, name: str, params: Iterable[Any] = (), sql: Optional[str] = None) -> None:
+        """Run a registered query (or ad-hoc sql recorded under name) on a cursor"""
+        params = tuple(params)
+        query = self.queries.get(name) if sql is None else None
+        if sql is None and query is None:
+            raise KeyError(f"Unknown query {name!r}")
+        started = time.perf_counter()
+        try:
+            if query is not None and query.prepare and self.use_prepared and not query.param_count:
+                self._execute_prepared(cursor, query, params)
+            else:
+                cursor.execute(sql if query is None else query.text(self.dialect), params)
+        except Exception:
+            self._record(name, time.perf_counter() - started, error=True)
+            raise
+        self._record(name, time.perf_counter() - started)
+
+    async def execute_async(self, cursor, name: str, params: Iterable[Any] = (),
+                            sql: Optional[str] = None) -> None:
+        """Run a registered query on an aiomysql cursor, recorded like execute()
+
+        Always sends the plain statement text; preparing the few
+        parameterless queries buys nothing once many statements are already
+        in flight concurrently.
+        """
+        params = tuple(params)
+        if sql is None:
+            query = self.queries.get(name)
+            if query is None:
+                raise KeyError(f"Unknown query {name!r}")
+            sql = query.text(self.dialect)
+        started = time.perf_counter()
+        try:
+            await cursor.execute(sql, params)
+        except Exception:
+            self._record(name, time.perf_counter() - started, error=True)
+            raise
+        self._record(name, time.perf_counter() - started)
+
+    def executemany(self, cursor, name: str, rows: List[Tuple]) -> None:
+        """Run a registered write once per parameter row, batched by the driver"""
+        started = time.perf_counter()
+        try:
+            cursor.executemany(self.queries[name].text(self.dialect), rows)
+        except Exception:
+            self._record(name, time.perf_counter() - started, error=True)
+            raise
+        self._record(name, time.perf_counter() - started)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-query execution counts, errors, prepares and latency percentiles"""
+        with self._lock:
+            return {
+                name: dict(stats.latency.summary(), errors=stats.errors, prepares=stats.prepares)
+                for name, stats in sorted(self._stats.items())
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def _execute_prepared(self, cursor, query: Query, params: Tuple) -> None:
+        connection = cursor.connection
+        with self._lock:
+            prepared = self._prepared.setdefault(connection, set())
+        if query.name not in prepared:
+            self._prepare(cursor, query, prepared)
+        try:
+            self._run_prepared(cursor, query, params)
+        except Exception as e:
+            if not e.args or e.args[0] != ER_UNKNOWN_STMT_HANDLER:
+                raise
+            # The server dropped the handle (e.g. after a session reset); prepare again
+            prepared.discard(query.name)
+            self._prepare(cursor, query, prepared)
+            self._run_prepared(cursor, query, params)
+
+    def _prepare(self, cursor, query: Query, prepared: set) -> None:
+        cursor.execute(f"PREPARE {query.handle} FROM %s", (query.prepared_sql(),))
+        prepared.add(query.name)
+        with self._lock:
+            self._stats.setdefault(query.name, QueryStats()).prepares += 1
+
+    @staticmethod
+    def _run_prepared(cursor, query: Query, params: Tuple) -> None:
+        if params:
+            raise ValueError(f"Query {query.name!r} takes no parameters, got {len(params)}")
+        cursor.execute(f"EXECUTE {query.handle}")
+
+    def _record(self, name: str, seconds: float, error: bool = False) -> None:
+        if monitor.enabled:
+            monitor.record("execute", seconds)
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = QueryStats()
+            stats.latency.record(seconds)
+            if error:
+                stats.errors += 1
@@ -0,0 +1,147 @@
+import tkinter as tk
+from tkinter import ttk
+from collections.abc import Mapping
+from typing import List, Dict, Any, Optional, Callable, Sequence
+from resultset import ResultSet
+
+class VirtualResultsView:
+    """Results table that only materializes the rows currently on screen
+
+    The Treeview holds one item per visible line; scrolling rewrites those
+    items from the backing row list instead of inserting every row, so
+    loading or clearing a result set costs time proportional to the window
+    height rather than the number of rows. When the user scrolls near the
+    end of the loaded rows and more are available, ``on_need_rows`` is
+    called so the caller can fetch the next page and ``append_rows`` it.
+    """
+
+    def __init__(self, parent, prefetch_margin: int = 20):
+        self.prefetch_margin = prefetch_margin
+        self.on_need_rows: Optional[Callable[[], None]] = None
+        self.rows: Sequence[Any] = []
+        self.columns: Sequence[str] = ()
+        self.offset = 0
+        self.visible = 1
+        self.more_available = False
+        self._loading_more = False
+        # False while self.rows is the caller's (possibly cached) sequence
+        self._owns_rows = False
+
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, show="headings")
+        self.scroll_y = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scroll_x = ttk.Scrollbar(self.frame, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(xscrollcommand=self.scroll_x.set)
+
+        self.scroll_y.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scroll_x.pack(side=tk.BOTTOM, fill=tk.X)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll_by(-1 if e.delta > 0 else 1, "units", 3))
+        self.tree.bind("<Button-4>", lambda e: self.scroll_by(-1, "units", 3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_by(1, "units", 3))
+        self.tree.bind("<Prior>", lambda e: self.scroll_by(-1, "pages"))
+        self.tree.bind("<Next>", lambda e: self.scroll_by(1, "pages"))
+
+    def pack(self, **kwargs) -> None:
+        self.frame.pack(**kwargs)
+
+    def set_rows(self, rows: Sequence[Any], columns: Sequence[str], more_available: bool = False) -> None:
+        """Replace the backing rows; only the visible window is rendered"""
+        if list(columns) != list(self.columns):
+            self._set_columns(columns)
+        self.rows = rows
+        self._owns_rows = False
+        self.offset = 0
+        self.more_available = more_available
+        self._loading_more = False
+        self._render()
+        self._maybe_request_more()
+
+    def append_rows(self, rows: Sequence[Any], more_available: bool = False) -> None:
+        """Add a further page of rows fetched after an on_need_rows call"""
+        if not self._owns_rows:
+            # Copy before extending: the first page may be a cached result
+            self.rows = self.rows.copy() if isinstance(self.rows, ResultSet) else list(self.rows)
+            self._owns_rows = True
+        self.rows.extend(rows)
+        self.more_available = more_available
+        self._loading_more = False
+        self._render()
+        self._maybe_request_more()
+
+    def clear(self) -> None:
+        """Drop all rows and columns by swapping in an empty model"""
+        self.set_rows([], ())
+
+    def row_at(self, iid: str) -> Any:
+        """Return the backing row for a Treeview item id"""
+        return self.rows[self.offset + int(iid)]
+
+    def scroll_by(self, amount: int, what: str = "units", step: int = 1) -> None:
+        """Move the window by lines ("units") or screenfuls ("pages")"""
+        delta = amount * (self.visible if what == "pages" else step)
+        self._scroll_to(self.offset + delta)
+
+    def _set_columns(self, columns: Sequence[str]) -> None:
+        for col in self.tree["columns"]:
+            self.tree.heading(col, text="")
+        self.tree["columns"] = tuple(columns)
+        for col in columns:
+            self.tree.heading(col, text=col.capitalize())
+            self.tree.column(col, width=100, anchor=tk.CENTER)
+        self.columns = tuple(columns)
+
+    def _values(self, row: Any) -> List[Any]:
+        if isinstance(row, Mapping):
+            return [row.get(col, "") for col in self.columns]
+        return list(row)
+
+    def _scroll_to(self, offset: int) -> None:
+        offset = max(0, min(offset, len(self.rows) - self.visible))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+        self._maybe_request_more()
+
+    def _render(self) -> None:
+        """Rewrite the on-screen items from the backing rows"""
+        count = max(0, min(self.visible, len(self.rows) - self.offset))
+        existing = len(self.tree.get_children())
+        for slot in range(count):
+            values = self._values(self.rows[self.offset + slot])
+            if slot < existing:
+                self.tree.item(str(slot), values=values)
+            else:
+                self.tree.insert("", tk.END, iid=str(slot), values=values)
+        if existing > count:
+            self.tree.delete(*[str(slot) for slot in range(count, existing)])
+
+        total = len(self.rows)
+        if total:
+            self.scroll_y.set(self.offset / total, (self.offset + count) / total)
+        else:
+            self.scroll_y.set(0.0, 1.0)
+
+    def _maybe_request_more(self) -> None:
+        near_end = self.offset + self.visible + self.prefetch_margin >= len(self.rows)
+        if near_end and self.more_available and not self._loading_more and self.on_need_rows:
+            self._loading_more = True
+            self.on_need_rows()
+
+    def _on_scrollbar(self, action: str, *args) -> None:
+        if action == "moveto":
+            self._scroll_to(int(float(args[0]) * len(self.rows)))
+        elif action == "scroll":
+            self.scroll_by(int(args[0]), args[1])
+
+    def _on_resize(self, event) -> None:
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        # Leave room for the heading row
+        visible = max(1, event.height // row_height - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.offset = max(0, min(self.offset, len(self.rows) - visible))
+            self._render()
+            self._maybe_request_more()
@@ -0,0 +1,308 @@
+import threading
+from collections.abc import Mapping, Sequence
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator
+
+# Columns with a few dozen distinct values across the whole dataset. Result
+# sets store them as small integer codes into one shared Dictionary per
+# column name instead of a separate string object per row.
+ENCODED_COLUMNS = ("category", "birth_country", "language", "role")
+
+class Dictionary:
+    """Shared code table for one low-cardinality column
+
+    Codes are assigned on first sight and never change or get reused, so
+    codes from different results (including cached ones) stay comparable
+    for the life of the process. Lookups are lock-free; only assigning a
+    new code takes the lock.
+    """
+
+    __slots__ = ("name", "values", "_codes", "_lock")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.values: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __repr__(self) -> str:
+        return f"Dictionary({self.name!r}, {len(self.values)} values)"
+
+    def encode(self, value: Any) -> int:
+        """Code for value, assigning the next free one if it is new"""
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    code = len(self.values)
+                    # Publish the value before the code so readers never see a dangling code
+                    self.values.append(value)
+                    self._codes[value] = code
+        return code
+
+    def encode_all(self, values: Iterable[Any]) -> List[int]:
+        """Codes for a whole column of values"""
+        values = values if isinstance(values, (list, tuple)) else list(values)
+        codes = list(map(self._codes.get, values))
+        if None in codes:
+            # Assign codes to the new distinct values, then map again
+            for value in set(values).difference(self._codes):
+                self.encode(value)
+            codes = list(map(self._codes.get, values))
+        return codes
+
+    def code(self, value: Any) -> Optional[int]:
+        """Existing code for value, or None if it has never been seen (no row can match it)"""
+        return self._codes.get(value)
+
+    def decode(self, code: int) -> Any:
+        return self.values[code]
+
+_dictionaries: Dict[str, Dictionary] = {}
+_dictionaries_lock = threading.Lock()
+
+def dictionary(column: str) -> Dictionary:
+    """The process-wide Dictionary for a column name"""
+    table = _dictionaries.get(column)
+    if table is None:
+        with _dictionaries_lock:
+            table = _dictionaries.setdefault(column, Dictionary(column))
+    return table
+
+class Row(Mapping):
+    """Read-only mapping view of one row of a ResultSet
+
+    Holds only references to the row's tuple and the result's shared
+    column index, so creating one copies no data. Supports the dict
+    read API (``row['name']``, ``row.get``, ``keys``, ``items``) and
+    compares equal to a dict with the same contents. Encoded columns are
+    decoded on access.
+    """
+
+    __slots__ = ("_index", "_values", "_tables")
+
+    def __init__(self, index: Dict[str, int], values: Tuple, tables: Optional[Tuple] = None):
+        self._index = index
+        self._values = values
+        self._tables = tables
+
+    def __getitem__(self, key: str) -> Any:
+        position = self._index[key]
+        if self._tables is None or self._tables[position] is None:
+            return self._values[position]
+        return self._tables[position][self._values[position]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._index:
+            return default
+        return self[key]
+
+    @property
+    def values_tuple(self) -> Tuple:
+        """The row's values in column order, decoded"""
+        if self._tables is None:
+            return self._values
+        return _decode(self._values, self._tables)
+
+    def __repr__(self) -> str:
+        return f"Row({dict(self)!r})"
+
+def _decode(values: Tuple, tables: Tuple) -> Tuple:
+    return tuple(value if table is None else table[value] for value, table in zip(values, tables))
+
+class ResultSet(Sequence):
+    """Query result stored as one column schema plus a list of row tuples
+
+    A list of dict rows repeats every column name in every row; here the
+    names are stored once and each row is one tuple. Indexing returns a
+    Row view, slicing returns a ResultSet sharing the same tuples, so both
+    are cheap. Like every cached result, a ResultSet must not be modified
+    once handed out; ``copy()`` first.
+
+    Columns listed in ``encode`` hold integer codes into the shared
+    Dictionary for that column name (see ENCODED_COLUMNS); Row views,
+    ``column`` and ``to_dicts`` decode them, and ``where`` filters on
+    them by comparing codes.
+    """
+
+    __slots__ = ("columns", "rows", "_index", "_dictionaries", "_tables")
+
+    def __init__(self, columns: Iterable[str], rows: Optional[List[Tuple]] = None,
+                 encoded: Iterable[str] = ()):
+        """rows must already hold codes for the columns named in encoded"""
+        self.columns: Tuple[str, ...] = tuple(columns)
+        self.rows: List[Tuple] = rows if rows is not None else []
+        self._index = {name: position for position, name in enumerate(self.columns)}
+        self._set_encoding(encoded)
+
+    def _set_encoding(self, encoded: Iterable[str]) -> None:
+        encoded = set(encoded)
+        if not encoded & set(self.columns):
+            self._dictionaries = self._tables = None
+            return
+        self._dictionaries = tuple(dictionary(name) if name in encoded else None for name in self.columns)
+        self._tables = tuple(None if table is None else table.values for table in self._dictionaries)
+
+    @classmethod
+    def from_description(cls, description: Optional[Iterable[Tuple]], rows: Iterable[Tuple],
+                         encode: Iterable[str] = ENCODED_COLUMNS) -> "ResultSet":
+        """Build from a DB-API cursor.description and the tuples it fetched
+
+        Columns named in encode are dictionary-encoded on the way in.
+        """
+        columns = [column[0] for column in description] if description else []
+        return cls._encoded(columns, rows if isinstance(rows, list) else list(rows), encode)
+
+    @classmethod
+    def from_cursor(cls, cursor, encode: Iterable[str] = ENCODED_COLUMNS) -> "ResultSet":
+        """Fetch every remaining row of a tuple-returning cursor"""
+        return cls.from_description(cursor.description, cursor.fetchall(), encode)
+
+    @classmethod
+    def from_dicts(cls, rows: Iterable[Dict[str, Any]], columns: Optional[Iterable[str]] = None,
+                   encode: Iterable[str] = ENCODED_COLUMNS) -> "ResultSet":
+        """Pack dict rows; columns default to the first row's keys"""
+        rows = list(rows)
+        if columns is None:
+            columns = list(rows[0]) if rows else []
+        columns = tuple(columns)
+        return cls._encoded(columns, [tuple(row.get(name) for name in columns) for row in rows], encode)
+
+    @classmethod
+    def _encoded(cls, columns: Iterable[str], rows: List[Tuple], encode: Iterable[str]) -> "ResultSet":
+        """ResultSet over plain rows, replacing the values of encode columns by their codes"""
+        columns = tuple(columns)
+        encoded = [name for name in columns if name in encode]
+        if not encoded or not rows:
+            return cls(columns, rows, encoded)
+        # Work column-wise so the per-value lookups run in C: transpose,
+        # map each encoded column through its code table, transpose back
+        data = list(zip(*rows))
+        for name in encoded:
+            position = columns.index(name)
+            data[position] = dictionary(name).encode_all(data[position])
+        return cls(columns, list(zip(*data)), encoded)
+
+    @property
+    def encoded_columns(self) -> Tuple[str, ...]:
+        """Names of the columns holding dictionary codes"""
+        if self._dictionaries is None:
+            return ()
+        return tuple(name for name, table in zip(self.columns, self._dictionaries) if table is not None)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self._with_rows(self.rows[item])
+        return Row(self._index, self.rows[item], self._tables)
+
+    def __iter__(self) -> Iterator[Row]:
+        index, tables = self._index, self._tables
+        for values in self.rows:
+            yield Row(index, values, tables)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ResultSet):
+            if self.columns != other.columns or len(self) != len(other):
+                return False
+            if self._dictionaries == other._dictionaries:
+                return self.rows == other.rows
+            return all(mine == theirs for mine, theirs in zip(self.tuples(), other.tuples()))
+        if isinstance(other, list):
+            return len(self) == len(other) and all(row == theirs for row, theirs in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ResultSet(columns={self.columns!r}, rows={len(self.rows)})"
+
+    def _with_rows(self, rows: List[Tuple]) -> "ResultSet":
+        result = ResultSet.__new__(ResultSet)
+        result.columns = self.columns
+        result.rows = rows
+        result._index = self._index
+        result._dictionaries = self._dictionaries
+        result._tables = self._tables
+        return result
+
+    def tuples(self) -> Iterator[Tuple]:
+        """Row tuples in column order with encoded columns decoded"""
+        tables = self._tables
+        if tables is None:
+            return iter(self.rows)
+        return (_decode(values, tables) for values in self.rows)
+
+    def column(self, name: str) -> List[Any]:
+        """All values of one column"""
+        position = self._index[name]
+        if self._tables is None or self._tables[position] is None:
+            return [values[position] for values in self.rows]
+        table = self._tables[position]
+        return [table[values[position]] for values in self.rows]
+
+    def codes(self, name: str) -> List[int]:
+        """Raw dictionary codes of an encoded column, e.g. for counting or grouping"""
+        position = self._index[name]
+        if self._tables is None or self._tables[position] is None:
+            raise ValueError(f"Column {name!r} is not dictionary-encoded")
+        return [values[position] for values in self.rows]
+
+    def where(self, name: str, *values: Any) -> "ResultSet":
+        """Rows whose column equals any of values, as a ResultSet sharing the row tuples
+
+        On an encoded column the values are looked up once and rows are
+        matched by integer code.
+        """
+        position = self._index[name]
+        table = None if self._dictionaries is None else self._dictionaries[position]
+        if table is not None:
+            values = [code for code in map(table.code, values) if code is not None]
+            if not values:
+                return self._with_rows([])
+        if len(values) == 1:
+            wanted = values[0]
+            return self._with_rows([row for row in self.rows if row[position] == wanted])
+        wanted = set(values)
+        return self._with_rows([row for row in self.rows if row[position] in wanted])
+
+    def project(self, columns: Iterable[str]) -> List[Tuple]:
+        """Row tuples restricted to the given columns (None where a column is missing)"""
+        positions = [self._index.get(name) for name in columns]
+        tables = self._tables or (None,) * len(self.columns)
+        pickers = [(position, None if position is None else tables[position]) for position in positions]
+        return [tuple(None if position is None else values[position] if table is None else table[values[position]]
+                      for position, table in pickers)
+                for values in self.rows]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Materialize plain dict rows, e.g. for code that mutates them"""
+        columns = self.columns
+        return [dict(zip(columns, values)) for values in self.tuples()]
+
+    def copy(self) -> "ResultSet":
+        """A ResultSet with its own row list (the row tuples are shared)"""
+        return self._with_rows(list(self.rows))
+
+    def extend(self, other: "ResultSet") -> None:
+        """Append the rows of a result with the same columns, e.g. the next page"""
+        if not other.rows:
+            return
+        if other.columns != self.columns:
+            raise ValueError(f"Cannot extend {self.columns} with rows of {other.columns}")
+        if other._dictionaries == self._dictionaries:
+            self.rows.extend(other.rows)
+        else:
+            self.rows.extend(ResultSet._encoded(self.columns, list(other.tuples()), self.encoded_columns).rows)
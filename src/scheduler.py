@@ -0,0 +1,159 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from perf import monitor
+
+class _Request:
+    """An in-flight fetch and the number of callers waiting on it"""
+
+    def __init__(self, future: Future):
+        self.future = future
+        self.subscribers = 0
+
+class FetchScheduler:
+    """Shared, fixed-size worker pool for GUI data fetches
+
+    Identical requests (same function and arguments) that are still in flight
+    share a single future instead of issuing another round trip. A request may
+    target a results pane: a newer request for the same pane supersedes the
+    older one, which is cancelled if it has not started yet and has its
+    callback suppressed if it has.
+
+    Callbacks are delivered through ``dispatch``, which should hand them to the
+    UI thread (e.g. ``root.after``).
+
+    While the perf monitor is enabled each request is timed as an action
+    named after its function: time queued, time in the callback ("render"),
+    and submit-to-rendered ("total"). Database work done by the function is
+    attributed to the same action.
+    """
+
+    def __init__(self, dispatch: Callable[..., Any], max_workers: int = 4,
+                 on_queue_change: Optional[Callable[[int], None]] = None):
+        self.dispatch = dispatch
+        self.on_queue_change = on_queue_change
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+        self._requests: Dict[Tuple, _Request] = {}
+        self._panes: Dict[Hashable, Tuple[object, Tuple]] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of distinct fetches queued or running"""
+        return len(self._requests)
+
+    @property
+    def busy(self) -> bool:
+        """True while a results pane is waiting on a request, i.e. the user is"""
+        return bool(self._panes)
+
+    def submit(self, fn: Callable[..., Any], *args: Hashable, pane: Optional[Hashable] = None,
+               on_done: Optional[Callable[[Any], None]] = None) -> Future:
+        """Run fn(*args) on the worker pool and deliver its result to on_done"""
+        key = (fn, args)
+        ticket = object()
+        created = False
+        submitted = time.perf_counter() if monitor.enabled else None
+        with self._lock:
+            request = self._requests.get(key)
+            if request is None:
+                if submitted is None:
+                    future = self._executor.submit(fn, *args)
+                else:
+                    future = self._executor.submit(self._run_timed, fn, args, submitted)
+                request = _Request(future)
+                self._requests[key] = request
+                created = True
+            request.subscribers += 1
+            if pane is not None:
+                previous = self._panes.get(pane)
+                self._panes[pane] = (ticket, key)
+                if previous is not None:
+                    self._unsubscribe(previous[1])
+
+        future = request.future
+        if created:
+            future.add_done_callback(lambda f: self._finished(key, f))
+            self._queue_changed()
+        if on_done is not None and submitted is not None:
+            on_done = self._timed_callback(on_done, _action_name(fn), submitted)
+        future.add_done_callback(lambda f: self._deliver(f, pane, ticket, on_done))
+        return future
+
+    def cancel(self, pane: Hashable) -> None:
+        """Drop the pending request for a pane, if any"""
+        with self._lock:
+            current = self._panes.pop(pane, None)
+            if current is not None:
+                self._unsubscribe(current[1])
+
+    def shutdown(self) -> None:
+        """Stop accepting work and cancel everything that has not started"""
+        with self._lock:
+            requests = list(self._requests.values())
+            self._panes.clear()
+        for request in requests:
+            request.future.cancel()
+        self._executor.shutdown(wait=False)
+
+    def _unsubscribe(self, key: Tuple) -> None:
+        """Release one caller's interest in a request (caller holds the lock)"""
+        request = self._requests.get(key)
+        if request is None:
+            return
+        request.subscribers -= 1
+        if request.subscribers <= 0:
+            request.future.cancel()
+
+    def _finished(self, key: Tuple, future: Future) -> None:
+        with self._lock:
+            request = self._requests.get(key)
+            if request is not None and request.future is future:
+                del self._requests[key]
+        self._queue_changed()
+
+    def _deliver(self, future: Future, pane: Optional[Hashable], ticket: object,
+                 on_done: Optional[Callable[[Any], None]]) -> None:
+        if future.cancelled():
+            return
+        with self._lock:
+            if pane is not None:
+                current = self._panes.get(pane)
+                if current is None or current[0] is not ticket:
+                    return
+                del self._panes[pane]
+        error = future.exception()
+        if error is not None:
+            print(f"Error in background fetch: {error}")
+            return
+        if on_done is not None:
+            self.dispatch(on_done, future.result())
+
+    @staticmethod
+    def _run_timed(fn: Callable[..., Any], args: Tuple, submitted: float) -> Any:
+        action = _action_name(fn)
+        monitor.record("queue", time.perf_counter() - submitted, action)
+        monitor.action = action
+        try:
+            return fn(*args)
+        finally:
+            monitor.action = None
+
+    @staticmethod
+    def _timed_callback(on_done: Callable[[Any], None], action: str,
+                        submitted: float) -> Callable[[Any], None]:
+        def callback(result: Any) -> None:
+            started = time.perf_counter()
+            on_done(result)
+            finished = time.perf_counter()
+            monitor.record("render", finished - started, action)
+            monitor.record("total", finished - submitted, action)
+        return callback
+
+    def _queue_changed(self) -> None:
+        if self.on_queue_change is not None:
+            self.dispatch(self.on_queue_change, self.queue_depth)
+
+def _action_name(fn: Callable[..., Any]) -> str:
+    return getattr(fn, "__name__", None) or repr(fn)
@@ -0,0 +1,353 @@
+import bisect
+import heapq
+import re
+import threading
+import unicodedata
+from array import array
+from typing import List, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+def normalize(text: str) -> str:
+    """Case-fold, strip accents and collapse punctuation to single spaces"""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", stripped).strip()
+
+def _token_postings(text: str) -> List[Tuple[str, bool]]:
+    """Distinct tokens of a normalized name, each with whether it is the first token"""
+    tokens: Dict[str, bool] = {}
+    for position, token in enumerate(text.split()):
+        tokens.setdefault(token, position > 0)
+    return list(tokens.items())
+
+def _merge_postings(tokens: List[str], owners: "array", postings: List[Tuple[str, int]]) -> Tuple[List[str], "array"]:
+    """Merge sorted (token, entry) postings after equal existing tokens"""
+    merged_tokens: List[str] = []
+    merged_owners = array(owners.typecode)
+    start = 0
+    for token, entry in postings:
+        at = bisect.bisect_right(tokens, token, start)
+        if at > start:
+            merged_tokens.extend(tokens[start:at])
+            merged_owners.extend(owners[start:at])
+            start = at
+        merged_tokens.append(token)
+        merged_owners.append(entry)
+    merged_tokens.extend(tokens[start:])
+    merged_owners.extend(owners[start:])
+    return merged_tokens, merged_owners
+
+def _trigrams(token: str) -> List[str]:
+    padded = f"  {token} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+def _typo_limit(word: str) -> int:
+    """Edits tolerated for a query word; short words must match exactly"""
+    if len(word) < 4:
+        return 0
+    return 1 if len(word) < 7 else 2
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Edits (insert, delete, substitute, swap adjacent) turning a into b; limit + 1 if more"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, y in enumerate(b, 1):
+            cost = x != y
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if before is not None and i > 1 and j > 1 and x == b[j - 2] and a[i - 2] == y:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+# Postings of the names of one length, leading tokens or the others
+Bucket = Tuple[List[str], "array"]
+
+def _bucketed(postings: Dict[Tuple[int, bool], List[Tuple[str, int]]]) -> Dict[Tuple[int, bool], Bucket]:
+    """Sort each bucket's (token, entry) postings into a token list and owner array"""
+    buckets: Dict[Tuple[int, bool], Bucket] = {}
+    for key, pairs in postings.items():
+        pairs.sort()
+        buckets[key] = ([token for token, _ in pairs], array("l", (entry for _, entry in pairs)))
+    return buckets
+
+class SearchIndex:
+    """Compact in-memory prefix index over names, for autocomplete
+
+    Every normalized token of every name is kept in sorted lists with
+    parallel arrays of entry numbers, so the entries having a token that
+    starts with a given prefix form a contiguous range found by bisection.
+    A multi-word query matches entries where each query word prefixes some
+    token of the name. Results are ranked: exact name, then names starting
+    with the query, then names whose first token matches, then any token;
+    shorter names first within a rank. The postings are bucketed by name
+    length and by whether the token leads its name, so a lookup reads the
+    buckets shortest first and stops once no longer name can make the
+    results.
+
+    When no name matches, query words of four or more letters that prefix
+    no token are matched against whole tokens within one or two typos
+    (found through a trigram index over the token vocabulary, built on the
+    first such query) and results are ranked by typos first.
+    """
+
+    def __init__(self):
+        self.ids = array("q")
+        self.names: List[str] = []
+        self._normalized: List[str] = []
+        self._buckets: Dict[Tuple[int, bool], Bucket] = {}
+        self._lengths: List[int] = []
+        self._positions: Dict[int, int] = {}
+        # Highest id indexed so far, the watermark for incremental refreshes
+        self.max_id = 0
+        # Trigram -> vocabulary tokens, for typo-tolerant lookups; None until needed
+        self._trigram_index: Optional[Dict[str, List[str]]] = None
+        # _lock guards reads against the swap of new contents; _write_lock
+        # serializes writers so they can prepare that swap without blocking reads
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def build(self, entries: Iterable[Tuple[int, str]]) -> None:
+        """Replace the index contents with (id, name) pairs in one bulk pass"""
+        ids = array("q")
+        names, normalized = [], []
+        postings: Dict[Tuple[int, bool], List[Tuple[str, int]]] = {}
+        positions = {}
+        for entry_id, name in entries:
+            entry = len(names)
+            text = normalize(name or "")
+            ids.append(entry_id)
+            names.append(name)
+            normalized.append(text)
+            positions[entry_id] = entry
+            for token, trailing in _token_postings(text):
+                postings.setdefault((len(text), trailing), []).append((token, entry))
+        buckets = _bucketed(postings)
+        with self._write_lock, self._lock:
+            self.ids, self.names, self._normalized = ids, names, normalized
+            self._buckets = buckets
+            self._lengths = sorted({length for length, _ in buckets})
+            self._positions = positions
+            self.max_id = max(positions, default=0)
+            self._trigram_index = None
+
+    def add(self, entries: Iterable[Tuple[int, str]]) -> None:
+        """Add or rename entries incrementally
+
+        Names are normalized and their postings sorted before any lock is
+        taken, then merged into the affected buckets in one pass each while
+        searches keep reading the current ones; only the final swap holds
+        the search lock.
+        """
+        added = []
+        postings: Dict[Tuple[int, bool], List[Tuple[str, int]]] = {}
+        for offset, (entry_id, name) in enumerate(entries):
+            text = normalize(name or "")
+            added.append((entry_id, name, text))
+            for token, trailing in _token_postings(text):
+                postings.setdefault((len(text), trailing), []).append((token, offset))
+        if not added:
+            return
+        # Offsets become entry numbers by adding one base, which keeps their order
+        sorted_postings = _bucketed(postings)
+        with self._write_lock:
+            base = len(self.names)
+            buckets = dict(self._buckets)
+            for key, (tokens, offsets) in sorted_postings.items():
+                new = [(token, base + offset) for token, offset in zip(tokens, offsets)]
+                buckets[key] = _merge_postings(*buckets.get(key, ([], array("l"))), new)
+            lengths = sorted({length for length, _ in buckets})
+            with self._lock:
+                for entry_id, name, text in added:
+                    old = self._positions.get(entry_id)
+                    if old is not None:
+                        # Tombstone the previous spelling; its postings are skipped on lookup
+                        self.ids[old] = -1
+                    self._positions[entry_id] = len(self.names)
+                    self.ids.append(entry_id)
+                    self.names.append(name)
+                    self._normalized.append(text)
+                    self.max_id = max(self.max_id, entry_id)
+                self._buckets, self._lengths = buckets, lengths
+                self._trigram_index = None
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, str]]:
+        """Return up to limit (id, name) pairs matching the query prefix, best first"""
+        text = normalize(query)
+        words = text.split()
+        if not words or limit <= 0:
+            return []
+        with self._lock:
+            best = self._ranked(text, words, limit)
+            if not best:
+                best = self._fuzzy(words, limit)
+            return [(self.ids[entry], self.names[entry]) for *_, entry in best]
+
+    def _ranked(self, text: str, words: List[str], limit: int) -> List[Tuple[int, int, str, int]]:
+        """The limit best (rank, length, name, entry) prefix matches"""
+        if not all(self._count(word) for word in words):
+            return []
+        worst: List[Tuple[int, int, int]] = []  # heap of (-rank, -length, entry), worst on top
+        found: Dict[int, Tuple[int, int, str, int]] = {}
+
+        def full_below(floor: int, length: int) -> bool:
+            # Whether the results are full of names no (floor, length) match can beat
+            return len(worst) == limit and (floor, length) >= (-worst[0][0], -worst[0][1])
+
+        for length in self._lengths:
+            # Only the exact name ranks 0
+            floor = 0 if length == len(text) else 1
+            if full_below(floor, length):
+                break
+            if len(words) == 1:
+                candidates = self._single_word(words[0], length, lambda floor: full_below(floor, length))
+            else:
+                candidates = self._all_words(words, length)
+            for entry in candidates:
+                if entry in found or self.ids[entry] < 0:
+                    continue
+                name = self._normalized[entry]
+                if name == text:
+                    rank = 0
+                elif name.startswith(text):
+                    rank = 1
+                elif name.startswith(words[0]):
+                    rank = 2
+                else:
+                    rank = 3
+                found[entry] = (rank, length, name, entry)
+                item = (-rank, -length, entry)
+                if len(worst) < limit:
+                    heapq.heappush(worst, item)
+                elif item > worst[0]:
+                    heapq.heapreplace(worst, item)
+        return sorted(found[entry] for _, _, entry in worst)
+
+    def _single_word(self, word: str, length: int, full_below) -> Iterator[int]:
+        """Entries of this name length with a token starting with word, leading tokens first"""
+        for trailing in (False, True):
+            bucket = self._buckets.get((length, trailing))
+            if bucket is None:
+                continue
+            # A one-word query only ranks above 3 through a leading token,
+            # whose own bucket was read first
+            floor = 3 if trailing else (0 if length == len(word) else 1)
+            tokens, owners = bucket
+            lo = bisect.bisect_left(tokens, word)
+            hi = bisect.bisect_left(tokens, word + "\uffff", lo)
+            for i in range(lo, hi):
+                if full_below(floor):
+                    break
+                yield owners[i]
+
+    def _all_words(self, words: List[str], length: int) -> Set[int]:
+        """Entries of this name length where every word prefixes some token"""
+        matched: Optional[Set[int]] = None
+        for word in words:
+            entries: Set[int] = set()
+            for trailing in (False, True):
+                bucket = self._buckets.get((length, trailing))
+                if bucket is not None:
+                    tokens, owners = bucket
+                    lo = bisect.bisect_left(tokens, word)
+                    entries.update(owners[lo:bisect.bisect_left(tokens, word + "\uffff", lo)])
+            matched = entries if matched is None else matched & entries
+            if not matched:
+                break
+        return matched or set()
+
+    def _fuzzy(self, words: List[str], limit: int) -> List[Tuple[int, int, str, int]]:
+        """The limit best (typos, length, name, entry) matches allowing typos in unmatched words"""
+        corrections: Dict[int, Dict[str, int]] = {}
+        for i, word in enumerate(words):
+            if not self._count(word):
+                close = self._close_tokens(word)
+                if not close:
+                    return []
+                corrections[i] = close
+        if not corrections:
+            return []
+        # Read the postings of the corrected word with the fewest of them
+        spans = {i: [span for token in close for span in self._token_spans(token)]
+                 for i, close in corrections.items()}
+        scanned = min(spans, key=lambda i: sum(hi - lo for _, lo, hi in spans[i]))
+        prefixes = [" " + word for i, word in enumerate(words) if i not in corrections]
+
+        ranked = []
+        seen = set()
+        for owners, lo, hi in spans[scanned]:
+            for entry in owners[lo:hi]:
+                if entry in seen or self.ids[entry] < 0:
+                    continue
+                seen.add(entry)
+                name = self._normalized[entry]
+                padded = " " + name
+                if not all(word in padded for word in prefixes):
+                    continue
+                tokens = name.split()
+                typos = 0
+                for close in corrections.values():
+                    distances = [close[token] for token in tokens if token in close]
+                    if not distances:
+                        break
+                    typos += min(distances)
+                else:
+                    ranked.append((typos, len(name), name, entry))
+        return heapq.nsmallest(limit, ranked)
+
+    def _close_tokens(self, word: str) -> Dict[str, int]:
+        """Vocabulary tokens within the word's typo limit, with their distances"""
+        limit = _typo_limit(word)
+        if not limit:
+            return {}
+        if self._trigram_index is None:
+            self._trigram_index = self._build_trigram_index()
+        grams = set(_trigrams(word))
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for token in self._trigram_index.get(gram, ()):
+                shared[token] = shared.get(token, 0) + 1
+        # An edit changes at most three trigrams, a swap of neighbours four
+        needed = len(grams) - 4 * limit
+        close = {}
+        for token, count in shared.items():
+            if count >= needed:
+                distance = _edit_distance(word, token, limit)
+                if distance <= limit:
+                    close[token] = distance
+        return close
+
+    def _build_trigram_index(self) -> Dict[str, List[str]]:
+        # Typos are only looked for in words, not numbers
+        vocabulary = {token for tokens, _ in self._buckets.values() for token in tokens if token.isalpha()}
+        index: Dict[str, List[str]] = {}
+        for token in vocabulary:
+            for gram in set(_trigrams(token)):
+                index.setdefault(gram, []).append(token)
+        return index
+
+    def _count(self, prefix: str) -> int:
+        """Postings with a token starting with prefix"""
+        count = 0
+        for tokens, _ in self._buckets.values():
+            lo = bisect.bisect_left(tokens, prefix)
+            count += bisect.bisect_left(tokens, prefix + "\uffff", lo) - lo
+        return count
+
+    def _token_spans(self, token: str) -> List[Tuple["array", int, int]]:
+        """(owners, lo, hi) spans of the postings of exactly this token"""
+        spans = []
+        for tokens, owners in self._buckets.values():
+            lo = bisect.bisect_left(tokens, token)
+            hi = bisect.bisect_right(tokens, token, lo)
+            if hi > lo:
+                spans.append((owners, lo, hi))
+        return spans
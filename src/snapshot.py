@@ -0,0 +1,250 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
+from sync import TableSpec
+from resultset import ResultSet
+from queries import (QUERIES, dream_team_sql, staff_stats_sql, DREAM_TEAM_ROLE_COUNT, _NEWEST_FIRST_START,
+                     _sqlite_placeholders, _sqlite_year)
+
+APP_DIR_NAME = "Movie Awards Oracle"
+
+# Staff rows are updated in place (is_alive, name, birth_country), which an
+# id watermark never sees; the whole table is re-read this often
+STAFF_REFRESH_INTERVAL = 6 * 3600.0
+
+# Mirrored reference tables and the columns the app reads from them.
+# Rows are append-only Oscar history, so the primary key doubles as the
+# sync watermark; staff is also re-read in full periodically.
+MIRRORED_TABLES = [
+    TableSpec('staff', ("id", "name", "birth_country", "role", "is_alive"),
+              refresh_interval=STAFF_REFRESH_INTERVAL),
+    TableSpec('movies', ("id", "title", "release_date", "language", "production_company_id")),
+    TableSpec('nominations', ("id", "staff_id", "movie_id", "category", "year")),
+    TableSpec('oscars', ("id", "staff_id", "movie_id", "category", "year")),
+    TableSpec('production_companies', ("id", "name")),
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS staff (
+    id INTEGER PRIMARY KEY, name TEXT, birth_country TEXT, role TEXT, is_alive INTEGER
+);
+CREATE TABLE IF NOT EXISTS movies (
+    id INTEGER PRIMARY KEY, title TEXT, release_date TEXT, language TEXT, production_company_id INTEGER
+);
+CREATE TABLE IF NOT EXISTS nominations (
+    id INTEGER PRIMARY KEY, staff_id INTEGER, movie_id INTEGER, category TEXT, year INTEGER
+);
+CREATE TABLE IF NOT EXISTS oscars (
+    id INTEGER PRIMARY KEY, staff_id INTEGER, movie_id INTEGER, category TEXT, year INTEGER
+);
+CREATE TABLE IF NOT EXISTS production_companies (
+    id INTEGER PRIMARY KEY, name TEXT
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    table_name TEXT PRIMARY KEY, watermark NOT NULL, synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_refresh (
+    table_name TEXT PRIMARY KEY, refreshed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_nominations_staff ON nominations (staff_id);
+CREATE INDEX IF NOT EXISTS idx_oscars_staff ON oscars (staff_id);
+CREATE INDEX IF NOT EXISTS idx_oscars_movie ON oscars (movie_id);
+CREATE INDEX IF NOT EXISTS idx_oscars_category ON oscars (category);
+CREATE INDEX IF NOT EXISTS idx_staff_country ON staff (birth_country);
+"""
+
+def _registered(name: str) -> str:
+    """A registered query's SQLite text with sqlite3 placeholders
+
+    The mirror answers with the same statements as the server (over the
+    base tables, as it has no leaderboard summaries).
+    """
+    return _sqlite_placeholders(QUERIES[name].text("sqlite"))
+
+def _connect(path: str) -> sqlite3.Connection:
+    """Open the mirror with the functions the registered queries use"""
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.create_function("YEAR", 1, _sqlite_year, deterministic=True)
+    return conn
+
+# Catalog columns (catalog.CATALOGS) as read from the mirror
+CATALOG_SQL = {table: _registered(f"{table}_catalog_stream") for table in ("staff", "movies")}
+
+# Rows after a watermark id for the staff statistics index (staff_stats.py)
+STAFF_STATS_SQL = {table: _registered(f"staff_stats_{table}_stream")
+                   for table in ("staff", "nominations", "oscars")}
+
+def default_snapshot_path() -> str:
+    """Return the snapshot location inside the user's app-data directory"""
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(base, APP_DIR_NAME, "snapshot.db")
+
+def _to_sqlite(value: Any) -> Any:
+    """Convert MySQL driver values into types sqlite3 can bind"""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+def _dict_factory(cursor, row) -> Dict[str, Any]:
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+class SnapshotStore:
+    """Local SQLite mirror of the Oscar reference tables
+
+    The analytical queries run against the mirror once every table has been
+    synced at least once, so results are available without a network round
+    trip. Rows arrive through apply_batch(), normally driven by a
+    sync.SyncEngine.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_snapshot_path()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = _connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def close(self) -> None:
+        """Close the local database"""
+        with self._lock:
+            self._conn.close()
+
+    def watermarks(self) -> Dict[str, int]:
+        """Return the highest synced id per table"""
+        rows = self._query("SELECT table_name, watermark FROM sync_state")
+        return {row['table_name']: row['watermark'] for row in rows}
+
+    def is_ready(self) -> bool:
+        """True once every mirrored table has completed an initial sync"""
+        if not self._ready:
+            self._ready = {spec.name for spec in MIRRORED_TABLES} <= set(self.watermarks())
+        return self._ready
+
+    def apply_batch(self, spec: TableSpec, rows: List[Dict[str, Any]], watermark: Any) -> None:
+        """Upsert one batch and record its watermark in the same transaction"""
+        placeholders = ", ".join("?" for _ in spec.columns)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {spec.name} ({', '.join(spec.columns)}) VALUES ({placeholders})",
+                ([_to_sqlite(row.get(column)) for column in spec.columns] for row in rows)
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (table_name, watermark, synced_at) VALUES (?, ?, ?)",
+                (spec.name, _to_sqlite(watermark), time.time())
+            )
+
+    def refreshed_at(self) -> Dict[str, float]:
+        """Return when each periodically refreshed table was last read in full"""
+        rows = self._query("SELECT table_name, refreshed_at FROM sync_refresh")
+        return {row['table_name']: row['refreshed_at'] for row in rows}
+
+    def mark_refreshed(self, table: str) -> None:
+        """Record that every row of a table has just been read again"""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO sync_refresh (table_name, refreshed_at) VALUES (?, ?)",
+                               (table, time.time()))
+
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> ResultSet:
+        """Run a read query against the mirror and return its rows as a ResultSet"""
+        with self._lock:
+            return ResultSet.from_cursor(self._conn.execute(sql, tuple(params)))
+
+    def get_names(self, table: str, column: str, after_id: int = 0) -> List[Tuple[int, str]]:
+        """(id, name) pairs after a given id, for the in-memory search index"""
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT id, {column} FROM {table} WHERE id > ? ORDER BY id", (after_id,)
+            ).fetchall()
+
+    def _iter_rows(self, sql: str, params: Iterable[Any] = (), batch_size: int = 5000) -> Iterator[Tuple]:
+        """Stream a query's row tuples on a connection of its own
+
+        A long read then does not hold up other snapshot reads.
+        """
+        conn = _connect(self.path)
+        try:
+            cursor = conn.execute(sql, tuple(params))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            conn.close()
+
+    def iter_catalog_rows(self, table: str, batch_size: int = 5000) -> Iterator[Tuple]:
+        """Every row of a catalog table (see catalog.py) in id order"""
+        return self._iter_rows(CATALOG_SQL[table], (), batch_size)
+
+    def iter_staff_stats_rows(self, table: str, after_id: int = 0, batch_size: int = 5000) -> Iterator[Tuple]:
+        """Rows of a table after a given id, as the staff statistics index reads them"""
+        return self._iter_rows(STAFF_STATS_SQL[table], (after_id,), batch_size)
+
+    def get_staff_stats(self, staff_id: int) -> Dict[str, Any]:
+        """Nomination and Oscar totals for one staff member"""
+        rows = self._query(_sqlite_placeholders(staff_stats_sql(1)), (staff_id,))
+        return {name: rows[0][name] for name in rows.columns[1:]} if rows else {}
+
+    def get_staff_stats_many(self, staff_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """get_staff_stats for a list of ids, keyed by id; unknown ids are left out"""
+        rows = self._query(_sqlite_placeholders(staff_stats_sql(len(staff_ids))), staff_ids)
+        return {row['id']: {name: row[name] for name in rows.columns[1:]} for row in rows}
+
+    def get_top_actor_birth_countries(self) -> ResultSet:
+        """Top 5 birth countries of Best Actor winners; staff without one are not counted"""
+        return self._query(_registered("top_actor_birth_countries_base"))
+
+    def get_staff_by_country(self, country: str) -> ResultSet:
+        """Nominated staff born in a country with their categories and totals"""
+        return self._query(_registered("staff_by_country"), (country, 0))
+
+    def get_dream_team_rows(self, roles: Dict[str, str], top_k: int) -> ResultSet:
+        """Top living Oscar winners per role as ranked (role, name, oscar_count) rows"""
+        params = [value for pair in roles.items() for value in pair] + [top_k]
+        if len(roles) == DREAM_TEAM_ROLE_COUNT:
+            return self._query(_registered("dream_team"), params)
+        return self._query(_sqlite_placeholders(dream_team_sql(len(roles))), params)
+
+    def get_top_production_companies(self) -> ResultSet:
+        """Top 5 production companies by Oscars won"""
+        return self._query(_registered("top_production_companies_base"))
+
+    def get_non_english_oscar_winners(self) -> ResultSet:
+        """Oscar-winning movies not in English, newest first"""
+        year, oscar_id = _NEWEST_FIRST_START
+        return self._query(_registered("non_english_winners"), (year, year, oscar_id))
+
+    def get_staff_list(self, limit: int = 20) -> ResultSet:
+        """First staff rows in the mirror"""
+        return self._query(_registered("staff_list"), (limit,))
+
+    def get_staff_page(self, after_id: int, limit: int) -> ResultSet:
+        """Staff rows after a given id, in id order"""
+        return self._query(_registered("staff_page"), (after_id, limit))
+
+    def get_staff_by_country_page(self, country: str, after_id: int, limit: int) -> ResultSet:
+        """Nominated staff from a country after a given id, in id order"""
+        return self._query(_registered("staff_by_country_page"), (country, after_id, limit))
+
+    def get_non_english_oscar_winners_page(self, year: int, oscar_id: int, limit: int) -> ResultSet:
+        """Non-English Oscar winners after a (year, oscar id) position, newest first
+
+        Undated movies come last; their position uses NULL_YEAR as the year.
+        """
+        return self._query(_registered("non_english_winners_page"), (year, year, oscar_id, limit))
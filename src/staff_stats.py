@@ -0,0 +1,157 @@
+import threading
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+# Columns read from each table, in the order update() expects them
+STAFF_STATS_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "staff": ("id", "name", "role"),
+    "nominations": ("id", "staff_id", "category", "year"),
+    "oscars": ("id", "staff_id"),
+}
+
+# Year bounds before any nominated year is seen
+_NO_FIRST_YEAR = 1 << 30
+_NO_LAST_YEAR = -(1 << 30)
+
+class _Totals:
+    """Running totals for one staff member, only touched by the writer"""
+
+    __slots__ = ("known", "name", "role", "nominations", "oscars", "categories", "first_year", "last_year")
+
+    def __init__(self):
+        self.known = False
+        self.name = None
+        self.role = None
+        self.nominations = 0
+        self.oscars = 0
+        self.categories: List[str] = []
+        self.first_year = _NO_FIRST_YEAR
+        self.last_year = _NO_LAST_YEAR
+
+    def as_stats(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'role': self.role,
+            'nomination_count': self.nominations,
+            'oscar_count': self.oscars,
+            'categories': ",".join(self.categories) if self.categories else None,
+            'first_year': None if self.first_year == _NO_FIRST_YEAR else self.first_year,
+            'last_year': None if self.last_year == _NO_LAST_YEAR else self.last_year,
+        }
+
+class StaffStatsIndex:
+    """In-memory nomination and Oscar statistics per staff member, keyed by staff id
+
+    Built in one pass over the staff, nominations and oscars rows in id
+    order, then kept current by feeding it the rows added since. The
+    mirrored tables are append-only, so each table's highest id seen is its
+    watermark. Every known staff member maps to a finished stats dict with
+    the keys of Database.get_staff_stats, so a lookup is a single dict
+    probe. A changed entry gets a new dict rather than being modified, so
+    readers need no lock; treat the dicts as read-only.
+    """
+
+    def __init__(self):
+        self._stats: Dict[int, Dict[str, Any]] = {}
+        self._totals: Dict[int, _Totals] = {}
+        # Highest id applied per table, the watermarks for incremental refreshes
+        self.watermarks: Dict[str, int] = {table: 0 for table in STAFF_STATS_COLUMNS}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    def __contains__(self, staff_id: int) -> bool:
+        return staff_id in self._stats
+
+    def get(self, staff_id: int) -> Optional[Dict[str, Any]]:
+        """Stats of one staff member, or None if the id is not indexed"""
+        return self._stats.get(staff_id)
+
+    def get_many(self, staff_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Stats of every indexed id among staff_ids, keyed by id"""
+        get = self._stats.get
+        found = {}
+        for staff_id in staff_ids:
+            stats = get(staff_id)
+            if stats is not None:
+                found[staff_id] = stats
+        return found
+
+    def update(self, staff: Iterable[Tuple] = (), nominations: Iterable[Tuple] = (),
+               oscars: Iterable[Tuple] = ()) -> int:
+        """Apply new rows of each table (see STAFF_STATS_COLUMNS); returns the staff updated
+
+        Rows must come in id order. Rows at or below a table's watermark were
+        applied before and are skipped, so overlapping reads are harmless. If
+        a source fails part way, the rows applied so far are still published.
+        """
+        with self._lock:
+            touched = set()
+            try:
+                self._apply_staff(staff, touched)
+                self._apply_nominations(nominations, touched)
+                self._apply_oscars(oscars, touched)
+            finally:
+                stats, totals = self._stats, self._totals
+                for staff_id in touched:
+                    entry = totals[staff_id]
+                    if entry.known:
+                        stats[staff_id] = entry.as_stats()
+        return len(touched)
+
+    def _entry(self, staff_id: int) -> _Totals:
+        entry = self._totals.get(staff_id)
+        if entry is None:
+            # Also for rows that arrive before their staff row; published once it does
+            entry = self._totals[staff_id] = _Totals()
+        return entry
+
+    def _apply_staff(self, rows: Iterable[Tuple], touched: set) -> None:
+        last = watermark = self.watermarks["staff"]
+        try:
+            for staff_id, name, role in rows:
+                if staff_id <= watermark:
+                    continue
+                entry = self._entry(staff_id)
+                entry.known = True
+                entry.name = name
+                entry.role = role
+                touched.add(staff_id)
+                last = staff_id
+        finally:
+            self.watermarks["staff"] = last
+
+    def _apply_nominations(self, rows: Iterable[Tuple], touched: set) -> None:
+        get, entry_for, touch = self._totals.get, self._entry, touched.add
+        last = watermark = self.watermarks["nominations"]
+        try:
+            for nomination_id, staff_id, category, year in rows:
+                if nomination_id <= watermark:
+                    continue
+                entry = get(staff_id) or entry_for(staff_id)
+                entry.nominations += 1
+                if category not in entry.categories:
+                    entry.categories.append(category)
+                if year is not None:
+                    if year < entry.first_year:
+                        entry.first_year = year
+                    if year > entry.last_year:
+                        entry.last_year = year
+                touch(staff_id)
+                last = nomination_id
+        finally:
+            self.watermarks["nominations"] = last
+
+    def _apply_oscars(self, rows: Iterable[Tuple], touched: set) -> None:
+        get, entry_for, touch = self._totals.get, self._entry, touched.add
+        last = watermark = self.watermarks["oscars"]
+        try:
+            for oscar_id, staff_id in rows:
+                if oscar_id <= watermark:
+                    continue
+                entry = get(staff_id) or entry_for(staff_id)
+                entry.oscars += 1
+                touch(staff_id)
+                last = oscar_id
+        finally:
+            self.watermarks["oscars"] = last
@@ -0,0 +1,144 @@
+import time
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Callable, Iterable, Tuple
+from queries import QueryRegistry, sync_stream_name
+
+@dataclass
+class TableSpec:
+    """A table to mirror and the column used as its change watermark
+
+    When the watermark column is the primary key, rows strictly above the
+    stored mark are new. A non-unique watermark such as ``updated_at`` is
+    compared with ``>=`` so rows sharing the boundary value are not skipped;
+    the store's upserts make the re-read rows harmless.
+
+    An id watermark only finds new rows. For a table whose rows are also
+    updated in place, ``refresh_interval`` re-reads the whole table once
+    that many seconds have passed since its last full read.
+    """
+    name: str
+    columns: Tuple[str, ...]
+    watermark_column: str = "id"
+    key: str = "id"
+    refresh_interval: Optional[float] = None
+
+@dataclass
+class SyncStats:
+    """Transfer statistics for one table"""
+    table: str
+    rows: int = 0
+    bytes: int = 0
+    batches: int = 0
+    retries: int = 0
+    seconds: float = 0.0
+    # True when the whole table was re-read, so existing rows may have changed
+    full: bool = False
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+def _payload_size(row: Dict[str, Any]) -> int:
+    """Approximate wire size of a row from its textual values"""
+    return sum(len(value) if isinstance(value, (str, bytes)) else len(str(value))
+               for value in row.values() if value is not None)
+
+class SyncEngine:
+    """Streams table deltas from the server into a local store
+
+    Rows above each table's watermark are read through an unbuffered cursor
+    and handed to the store in batches. The store must apply a batch and its
+    new watermark in one transaction, which makes a sync resumable: after a
+    dropped connection the engine reconnects and continues from the last
+    committed batch.
+
+    ``connection_factory`` is a context manager yielding a DB-API connection
+    (e.g. ``ConnectionPool.connection``); ``store`` provides ``watermarks()``
+    and ``apply_batch(spec, rows, watermark)``, plus ``refreshed_at()`` and
+    ``mark_refreshed(table)`` for tables with a ``refresh_interval``. Delta
+    reads run through ``queries`` and are timed as ``sync_<table>_stream``.
+    """
+
+    def __init__(self, connection_factory: Callable, store, tables: Iterable[TableSpec],
+                 batch_size: int = 5000, cursor_class: Any = None,
+                 max_retries: int = 3, retry_delay: float = 1.0,
+                 queries: Optional[QueryRegistry] = None):
+        self.connection_factory = connection_factory
+        self.store = store
+        self.tables = list(tables)
+        self.batch_size = batch_size
+        self.cursor_class = cursor_class
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.queries = queries or QueryRegistry(use_prepared=False)
+
+    def run(self) -> List[SyncStats]:
+        """Sync every table and return per-table statistics"""
+        watermarks = self.store.watermarks()
+        refreshed: Dict[str, float] = {}
+        if any(spec.refresh_interval is not None for spec in self.tables):
+            refreshed = self.store.refreshed_at()
+        now = time.time()
+        results = []
+        for spec in self.tables:
+            full = (spec.refresh_interval is not None
+                    and now - refreshed.get(spec.name, 0.0) >= spec.refresh_interval)
+            results.append(self.sync_table(spec, watermarks.get(spec.name), full=full))
+        return results
+
+    def sync_table(self, spec: TableSpec, watermark: Optional[Any] = None, full: bool = False) -> SyncStats:
+        """Pull all rows of one table past the watermark, retrying on failure
+
+        With full set every row is read again from the start and the store
+        records the refresh once the whole table has been applied.
+        """
+        stats = SyncStats(spec.name, full=full)
+        started = time.perf_counter()
+        if full:
+            watermark = None
+        while True:
+            try:
+                watermark = self._stream(spec, watermark, stats)
+                break
+            except Exception:
+                if stats.retries >= self.max_retries:
+                    raise
+                stats.retries += 1
+                time.sleep(self.retry_delay * stats.retries)
+                if stats.batches:
+                    # Resume from the last batch the store committed
+                    watermark = self.store.watermarks().get(spec.name, watermark)
+        if full:
+            self.store.mark_refreshed(spec.name)
+        stats.seconds = time.perf_counter() - started
+        return stats
+
+    def _stream(self, spec: TableSpec, watermark: Optional[Any], stats: SyncStats) -> Optional[Any]:
+        """Read one delta stream, committing batch by batch; returns the final watermark"""
+        sql = f"SELECT {', '.join(spec.columns)} FROM {spec.name}"
+        params: Tuple = ()
+        if watermark is not None:
+            op = ">" if spec.watermark_column == spec.key else ">="
+            sql += f" WHERE {spec.watermark_column} {op} %s"
+            params = (watermark,)
+        order = spec.key if spec.watermark_column == spec.key else f"{spec.watermark_column}, {spec.key}"
+        sql += f" ORDER BY {order}"
+
+        with self.connection_factory() as connection:
+            with connection.cursor(self.cursor_class) as cursor:
+                self.queries.execute(cursor, sync_stream_name(spec.name), params, sql=sql)
+                while True:
+                    rows = cursor.fetchmany(self.batch_size)
+                    if not rows:
+                        break
+                    new_mark = rows[-1][spec.watermark_column]
+                    self.store.apply_batch(spec, rows, new_mark)
+                    watermark = new_mark
+                    stats.rows += len(rows)
+                    stats.batches += 1
+                    stats.bytes += sum(_payload_size(row) for row in rows)
+        if stats.batches == 0 and watermark is None:
+            # Record an empty table as synced so the store can count it as ready
+            self.store.apply_batch(spec, [], 0)
+            watermark = 0
+        return watermark
@@ -1,11 +1,23 @@
 
+import functools
 import re
 from typing import Dict, List, Any, Optional
 
+EMAIL_REGEX = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
+
+@functools.lru_cache(maxsize=None)
+def email_pattern() -> "re.Pattern":
+    """The compiled email pattern, built on first use rather than at import"""
+    return re.compile(EMAIL_REGEX)
+
 def validate_email(email: str) -> bool:
     """Validate email format"""
-    pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-    return bool(re.match(pattern, email))
+    return bool(email_pattern().match(email))
+
+def validate_emails(emails: List[str]) -> List[bool]:
+    """Validate a batch of email addresses with the precompiled pattern"""
+    match = email_pattern().match
+    return [match(email) is not None for email in emails]
 
 def validate_password_strength(password: str) -> bool:
     """Check if password meets minimum security requirements"""
@@ -30,7 +42,13 @@ def format_staff_stats(stats: Dict[str, Any]) -> str:
     role = stats.get('role', 'Staff')
     nominations = stats.get('nomination_count', 0)
     oscars = stats.get('oscar_count', 0)
-    return f"{name} ({role}): {nominations} nomination(s), {oscars} Oscar(s)"
+    text = f"{name} ({role}): {nominations} nomination(s), {oscars} Oscar(s)"
+    first, last = stats.get('first_year'), stats.get('last_year')
+    if first is not None:
+        text += f"\nNominated {first}" if first == last else f"\nNominated {first}-{last}"
+    if stats.get('categories'):
+        text += f"\nCategories: {stats['categories'].replace(',', ', ')}"
+    return text
 
 def format_dream_team(team: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
     """Format dream team for display"""
@@ -0,0 +1,77 @@
+import asyncio
+import os
+import time
+from typing import List, Dict, Any, Optional, Tuple, Callable
+from async_database import AsyncDatabase
+from perf import StartupTimer
+
+# Cheap, rarely changing aggregates behind the dashboard buttons, as
+# (method name, args) exactly as the buttons call them so the cache keys match
+DEFAULT_CALLS: List[Tuple[str, Tuple]] = [
+    ("get_top_actor_birth_countries", ()),
+    ("get_top_production_companies", ()),
+    ("get_dream_team", ()),
+    ("get_non_english_oscar_winners_page", ()),
+]
+
+def enabled_from_environment() -> bool:
+    """False when MOVIE_AWARDS_WARMUP is set to 0/off/false"""
+    return os.environ.get("MOVIE_AWARDS_WARMUP", "on").strip().lower() not in ("0", "off", "false", "no")
+
+class WarmUp:
+    """Prefetch dashboard results into the Database result cache at low priority
+
+    Calls run in parallel (at most ``parallel`` at once) on an AsyncDatabase.
+    Before each call starts, the warm-up waits while ``is_busy()`` reports a
+    user-initiated request in flight, so it only uses otherwise idle time.
+    Nothing is prefetched when the result cache is disabled, because there
+    would be nowhere to park the results.
+    """
+
+    def __init__(self, async_db: AsyncDatabase, calls: List[Tuple[str, Tuple]] = DEFAULT_CALLS,
+                 is_busy: Callable[[], bool] = lambda: False, parallel: int = 4,
+                 poll_interval: float = 0.05, timer: Optional[StartupTimer] = None):
+        self.async_db = async_db
+        self.calls = calls
+        self.is_busy = is_busy
+        self.parallel = max(1, parallel)
+        self.poll_interval = poll_interval
+        self.timer = timer
+        # Per call: ms spent waiting for idle time and ms spent fetching
+        self.timings: Dict[str, Dict[str, float]] = {}
+
+    async def run(self) -> Dict[str, Dict[str, float]]:
+        """Prefetch every call; returns the per-call timings"""
+        if self.async_db.db.cache is None or not self.calls:
+            return {}
+        slots = asyncio.Semaphore(self.parallel)
+        await asyncio.gather(*(self._prefetch(name, args, slots) for name, args in self.calls))
+        if self.timer is not None:
+            self.timer.mark("warm-up done")
+        return self.timings
+
+    async def _prefetch(self, name: str, args: Tuple, slots: asyncio.Semaphore) -> None:
+        queued = time.perf_counter()
+        async with slots:
+            while self.is_busy():
+                await asyncio.sleep(self.poll_interval)
+            started = time.perf_counter()
+            try:
+                await getattr(self.async_db, name)(*args)
+            except Exception as e:
+                print(f"Error warming up {name}: {e}")
+                return
+            finished = time.perf_counter()
+        self.timings[name] = {
+            'waited_ms': round((started - queued) * 1000, 1),
+            'fetch_ms': round((finished - started) * 1000, 1),
+        }
+        if self.timer is not None:
+            self.timer.mark(f"warm-up {name}")
+
+    def format(self) -> str:
+        lines = ["Warm-up prefetch:"]
+        for name, timing in self.timings.items():
+            lines.append(f"  {name:<40} waited {timing['waited_ms']:>8.1f} ms  "
+                         f"fetched {timing['fetch_ms']:>8.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+# The app modules live flat in src/, as the benchmarks import them
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import dataset
+
+SCALE = 10_000
+
+@pytest.fixture(scope="session")
+def seeded_path(tmp_path_factory):
+    """A generated benchmark dataset, shared by the tests that only read it"""
+    return dataset.generate(str(tmp_path_factory.mktemp("data") / "awards.db"), SCALE)
@@ -0,0 +1,61 @@
+"""The modules build.py leaves out of the bundle are never imported at runtime"""
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Runs first in a fresh interpreter: any import of an excluded module fails,
+# as it would in the frozen build
+PRELUDE = textwrap.dedent(f"""
+    import importlib
+    import importlib.abc
+    import sys
+
+    sys.path[:0] = [{ROOT!r}, {os.path.join(ROOT, "src")!r}]
+    from build import EXCLUDED_MODULES, SOURCE_FILES
+
+    def excluded(name):
+        return any(name == module or name.startswith(module + ".") for module in EXCLUDED_MODULES)
+
+    class ExcludedFinder(importlib.abc.MetaPathFinder):
+        def find_spec(self, name, path, target=None):
+            if excluded(name):
+                raise ModuleNotFoundError(f"{{name}} is excluded from the build", name=name)
+
+    sys.meta_path.insert(0, ExcludedFinder())
+""")
+
+def _run(code):
+    result = subprocess.run([sys.executable, "-c", PRELUDE + textwrap.dedent(code)],
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+def test_app_modules_import_without_the_excluded_modules():
+    _run("""
+        for file in SOURCE_FILES:
+            try:
+                importlib.import_module(file[len("src/"):-len(".py")])
+            except ModuleNotFoundError as e:
+                # A driver not installed here (pymysql, aiomysql) is fine;
+                # a module the build leaves out is not
+                if e.name is None or excluded(e.name):
+                    raise
+    """)
+
+def test_analytics_runs_without_the_excluded_modules(seeded_path):
+    pytest.importorskip("numpy")
+    output = _run(f"""
+        import numpy
+        from analytics import AnalyticsEngine
+
+        engine = AnalyticsEngine.load({seeded_path!r})
+        print(len(engine.top_actor_birth_countries()), len(engine.staff_by_country("USA")),
+              len(engine.top_production_companies()), len(engine.non_english_oscar_winners()),
+              len(engine.dream_team_rows({{"director": "Best Director"}}, 2)))
+    """)
+    assert all(int(count) > 0 for count in output.split())
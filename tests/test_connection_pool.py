@@ -0,0 +1,275 @@
+"""Stress tests for database.ConnectionPool with a fake connection factory and SQLite"""
+import threading
+import time
+
+import pytest
+
+from database import ConnectionPool, PoolError, PoolTimeoutError, SQLiteBackend
+
+class FakeConnection:
+    """Stands in for a DB-API connection; records who holds it"""
+
+    def __init__(self, number):
+        self.number = number
+        self.healthy = True
+        self.closed = False
+        self.holder = None
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+class FakeFactory:
+    """Connection factory that counts connections and can be told to fail"""
+
+    def __init__(self):
+        self.created = []
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("server unavailable")
+            connection = FakeConnection(len(self.created))
+            self.created.append(connection)
+            return connection
+
+class FakeClock:
+    """Monotonic clock the test moves forward by hand"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+def _check(connection):
+    if not connection.healthy:
+        raise ConnectionError("connection lost")
+
+def test_threads_never_share_a_connection():
+    factory = FakeFactory()
+    pool = ConnectionPool(factory, min_size=1, max_size=4, timeout=10.0, check=_check)
+    errors = []
+    peak = []
+    peak_lock = threading.Lock()
+
+    def worker(name):
+        try:
+            for _ in range(200):
+                with pool.connection() as connection:
+                    if connection.holder is not None:
+                        errors.append(f"{name} got connection {connection.number} held by {connection.holder}")
+                    connection.holder = name
+                    with peak_lock:
+                        peak.append(pool.size)
+                    time.sleep(0)
+                    connection.holder = None
+        except Exception as e:
+            errors.append(f"{name}: {e!r}")
+
+    threads = [threading.Thread(target=worker, args=(f"t{i}",)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert max(peak) <= 4
+    assert len(factory.created) <= 4
+    assert pool.size == pool.idle <= 4
+    pool.close()
+    assert all(connection.closed for connection in factory.created)
+
+def test_threads_share_a_sqlite_pool(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "pool.db"))
+    pool = ConnectionPool(backend.connect, min_size=1, max_size=4, timeout=30.0)
+    with pool.connection() as connection:
+        connection.raw.execute("CREATE TABLE hits (worker TEXT, n INTEGER)")
+    errors = []
+
+    def worker(name):
+        try:
+            for n in range(50):
+                # A connection handed to two threads at once fails the
+                # nested BEGIN or sees the other thread's uncommitted rows
+                with pool.connection() as connection:
+                    connection.begin()
+                    with connection.cursor() as cursor:
+                        cursor.execute("INSERT INTO hits VALUES (%s, %s)", (name, n))
+                        cursor.execute("SELECT COUNT(*) AS c FROM hits WHERE worker = %s", (name,))
+                        if cursor.fetchone()['c'] != n + 1:
+                            errors.append(f"{name} lost or duplicated a row at {n}")
+                    connection.commit()
+        except Exception as e:
+            errors.append(f"{name}: {e!r}")
+
+    threads = [threading.Thread(target=worker, args=(f"t{i}",)) for i in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert pool.size == pool.idle <= 4
+    with pool.connection() as connection:
+        assert connection.raw.execute("SELECT COUNT(*) AS c FROM hits").fetchone()['c'] == 12 * 50
+    pool.close()
+
+def test_idle_connections_beyond_min_size_are_reaped():
+    clock = FakeClock()
+    factory = FakeFactory()
+    pool = ConnectionPool(factory, min_size=1, max_size=3, max_idle=60.0, check_after=1e9,
+                          check=_check, clock=clock)
+    first, second, third = [pool.acquire() for _ in range(3)]
+    for connection in (first, second, third):
+        pool.release(connection)
+        clock.advance(10.0)
+
+    # first has been idle 65s, second 55s and third 45s
+    clock.advance(35.0)
+    assert pool.acquire() is third
+    assert first.closed and not second.closed
+    assert pool.size == 2
+    pool.release(third)
+
+    # Both are past max_idle, but min_size connections stay open
+    clock.advance(100.0)
+    assert pool.acquire() is third
+    assert second.closed and not third.closed
+    assert pool.size == 1
+    pool.release(third)
+    clock.advance(1000.0)
+    assert pool.acquire() is third
+    assert pool.size == 1 and len(factory.created) == 3
+
+def test_health_check_waits_for_check_after():
+    clock = FakeClock()
+    checked = []
+    pool = ConnectionPool(FakeFactory(), min_size=1, max_size=1, check_after=30.0,
+                          check=checked.append, clock=clock)
+    connection = pool.acquire()
+    pool.release(connection)
+    clock.advance(29.0)
+    assert pool.acquire() is connection and checked == []
+    pool.release(connection)
+    clock.advance(30.0)
+    assert pool.acquire() is connection and checked == [connection]
+
+def test_exhausted_pool_times_out():
+    pool = ConnectionPool(FakeFactory(), min_size=0, max_size=2, timeout=0.05, check=_check)
+    first, second = pool.acquire(), pool.acquire()
+    started = time.monotonic()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    assert time.monotonic() - started >= 0.05
+    pool.release(first)
+    # A release wakes a waiting borrower before its timeout
+    assert pool.acquire(timeout=1.0) is first
+    pool.release(first)
+    pool.release(second)
+
+def test_waiter_gets_a_connection_released_by_another_thread():
+    pool = ConnectionPool(FakeFactory(), min_size=0, max_size=1, timeout=5.0, check=_check)
+    held = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    time.sleep(0.05)
+    assert got == []
+    pool.release(held)
+    waiter.join(timeout=5.0)
+    assert got == [held]
+
+def test_failed_health_check_replaces_the_connection():
+    factory = FakeFactory()
+    pool = ConnectionPool(factory, min_size=1, max_size=2, check_after=0.0, check=_check)
+    pool.fill()
+    broken = pool.acquire()
+    pool.release(broken)
+    broken.healthy = False
+
+    replacement = pool.acquire()
+    assert replacement is not broken
+    assert broken.closed
+    assert len(factory.created) == 2
+    assert pool.size == 1
+    pool.release(replacement)
+
+def test_failed_connect_releases_its_slot():
+    factory = FakeFactory()
+    pool = ConnectionPool(factory, min_size=0, max_size=2, timeout=0.05, check=_check)
+    factory.failures = 5
+    for _ in range(5):
+        with pytest.raises(ConnectionError):
+            pool.acquire()
+    assert pool.size == 0
+    # Both slots are still available once the server is back
+    first, second = pool.acquire(), pool.acquire()
+    assert first is not second
+    assert pool.size == 2
+    pool.release(first)
+    pool.release(second)
+
+def test_failed_connect_wakes_a_waiting_borrower():
+    factory = FakeFactory()
+    pool = ConnectionPool(factory, min_size=0, max_size=1, timeout=5.0, check=_check)
+    results = []
+
+    def borrow():
+        try:
+            results.append(pool.acquire())
+        except ConnectionError as e:
+            results.append(e)
+
+    factory.failures = 1
+    first = threading.Thread(target=borrow)
+    second = threading.Thread(target=borrow)
+    first.start()
+    second.start()
+    first.join(timeout=5.0)
+    second.join(timeout=5.0)
+    assert sorted(type(result).__name__ for result in results) == ["ConnectionError", "FakeConnection"]
+    assert pool.size == 1
+
+def test_resize_closes_connections_beyond_the_new_size():
+    factory = FakeFactory()
+    pool = ConnectionPool(factory, min_size=1, max_size=4, check=_check)
+    held = [pool.acquire() for _ in range(4)]
+    pool.release(held[0])
+    pool.resize(2)
+    # The idle one goes at once, a borrowed one when it is released
+    assert held[0].closed and pool.size == 3
+    pool.release(held[1])
+    assert held[1].closed and pool.size == 2
+    pool.release(held[2])
+    assert not held[2].closed and pool.idle == 1
+    assert pool.acquire() is held[2]
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire(timeout=0.01)
+    pool.resize(3)
+    assert pool.acquire(timeout=0.01) not in held
+
+def test_block_error_rolls_back_and_returns_the_connection():
+    pool = ConnectionPool(FakeFactory(), min_size=0, max_size=1, check=_check)
+    with pytest.raises(RuntimeError):
+        with pool.connection() as connection:
+            raise RuntimeError("query failed")
+    assert connection.rollbacks == 1
+    assert pool.idle == 1
+    assert pool.acquire() is connection
+
+def test_closed_pool_refuses_connections():
+    pool = ConnectionPool(FakeFactory(), min_size=1, max_size=1, check=_check)
+    pool.fill()
+    pool.close()
+    with pytest.raises(PoolError):
+        pool.acquire()
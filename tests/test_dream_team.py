@@ -0,0 +1,75 @@
+"""get_dream_team ranks every role in a single statement"""
+from collections import Counter
+
+import pytest
+
+from database import Database, SQLiteBackend, DREAM_TEAM_CATEGORIES
+
+class TracingBackend(SQLiteBackend):
+    """SQLite backend recording every statement its connections run"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.statements = []
+
+    def connect(self):
+        connection = super().connect()
+        connection.raw.set_trace_callback(self.statements.append)
+        return connection
+
+@pytest.fixture(scope="module")
+def db(seeded_path):
+    db = Database(TracingBackend(seeded_path))
+    assert db.connect()
+    db.cache = None
+    yield db
+    db.close()
+
+def _run(db, *args, **kwargs):
+    """Call get_dream_team and return its result with the statements it ran"""
+    db.backend.statements.clear()
+    db.queries.reset_stats()
+    result = db.get_dream_team(*args, **kwargs)
+    return result, list(db.backend.statements), db.queries.stats()
+
+def _expected(db, roles, top_k):
+    """Rank each role on its own, the way the per-role queries used to"""
+    with db._cursor() as cursor:
+        cursor.execute("SELECT id, name FROM staff WHERE is_alive = 1")
+        living = {row['id']: row['name'] for row in cursor.fetchall()}
+        cursor.execute("SELECT staff_id, category FROM oscars")
+        wins = Counter((row['category'], row['staff_id']) for row in cursor.fetchall()
+                       if row['staff_id'] in living)
+    team = {}
+    for role, category in roles.items():
+        ranked = sorted(((-count, staff_id) for (won, staff_id), count in wins.items() if won == category))
+        picks = [{'name': living[staff_id], 'oscar_count': -count} for count, staff_id in ranked[:top_k]]
+        if picks:
+            team[role] = picks if top_k > 1 else picks[0]
+    return team
+
+def _assert_single_statement(statements, stats):
+    assert len(statements) == 1, statements
+    assert list(stats) == ["dream_team"]
+    assert stats["dream_team"]["count"] == 1
+
+def test_default_roles_run_one_statement(db):
+    team, statements, stats = _run(db)
+    _assert_single_statement(statements, stats)
+    assert set(team) == set(DREAM_TEAM_CATEGORIES)
+    assert team == _expected(db, DREAM_TEAM_CATEGORIES, 1)
+
+def test_custom_roles_run_one_statement(db):
+    roles = {'writer': 'Best Original Screenplay', 'composer': 'Best Original Score',
+             'actor': 'Best Actor'}
+    team, statements, stats = _run(db, roles)
+    _assert_single_statement(statements, stats)
+    assert team == _expected(db, roles, 1)
+
+@pytest.mark.parametrize("roles", [None, {'director': 'Best Director', 'actress': 'Best Actress'}])
+def test_top_k_runs_one_statement(db, roles):
+    team, statements, stats = _run(db, roles, top_k=3)
+    _assert_single_statement(statements, stats)
+    roles = roles or DREAM_TEAM_CATEGORIES
+    assert team == _expected(db, roles, 3)
+    assert all(len(picks) <= 3 for picks in team.values())
@@ -0,0 +1,88 @@
+"""The rewritten queries avoid full table scans once REQUIRED_INDEXES exist
+
+Runs EXPLAIN QUERY PLAN on SQLite against a copy of the generated dataset
+with the schema's own secondary indexes dropped, so only the advisor's
+REQUIRED_INDEXES can serve the plans. Automatic indexes are turned off, as
+SQLite would otherwise build one per query from a full scan of the table,
+so a full table scan shows as ``SCAN <table>`` with no ``USING`` clause.
+"""
+import re
+import shutil
+
+import pytest
+
+import leaderboards
+from database import SQLiteBackend
+from index_advisor import REQUIRED_INDEXES
+from queries import QUERIES, _sqlite_placeholders, dream_team_sql, staff_stats_sql
+
+_FULL_SCAN = re.compile(r"^SCAN (\w+)(?: LEFT-JOIN)?$")
+
+# Registered queries whose joins and filters REQUIRED_INDEXES are meant to serve
+INDEXED_QUERIES = [
+    "staff_stats", "staff_by_country", "staff_by_country_page", "non_english_winners",
+    "non_english_winners_page", "dream_team", "top_actor_birth_countries_base",
+    "top_production_companies_base", "user_nominations",
+]
+
+# Derived tables built inside the statement, which have no index to use
+DERIVED_TABLES = {"dream_team": {"r", "ranked"}}
+
+def _connect(path):
+    connection = SQLiteBackend(path).connect()
+    connection.raw.execute("PRAGMA automatic_index = OFF")
+    with connection.cursor() as cursor:
+        leaderboards.create_tables(cursor, "sqlite")
+    tables = {spec.table for spec in REQUIRED_INDEXES}
+    indexes = connection.raw.execute(
+        "SELECT name, tbl_name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL").fetchall()
+    for row in indexes:
+        if row['tbl_name'] in tables:
+            connection.raw.execute(f"DROP INDEX {row['name']}")
+    return connection
+
+def _plan(connection, sql):
+    sql = _sqlite_placeholders(sql)
+    rows = connection.raw.execute("EXPLAIN QUERY PLAN " + sql, [None] * sql.count("?")).fetchall()
+    return [row['detail'] for row in rows]
+
+def _full_scans(connection, sql, derived=()):
+    """Tables (or aliases) the plan reads with a full scan"""
+    scans = [_FULL_SCAN.match(detail) for detail in _plan(connection, sql)]
+    return [match.group(1) for match in scans if match and match.group(1) not in derived]
+
+@pytest.fixture
+def bare(seeded_path, tmp_path):
+    path = str(tmp_path / "bare.db")
+    shutil.copy(seeded_path, path)
+    connection = _connect(path)
+    yield connection
+    connection.close()
+
+@pytest.fixture(scope="module")
+def indexed(seeded_path, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("plans") / "indexed.db")
+    shutil.copy(seeded_path, path)
+    connection = _connect(path)
+    for spec in REQUIRED_INDEXES:
+        connection.raw.execute(spec.ddl())
+    yield connection
+    connection.close()
+
+def test_missing_indexes_show_up_as_full_scans(bare):
+    assert {"n", "o"} <= set(_full_scans(bare, QUERIES["staff_by_country"].text("sqlite")))
+    assert "o" in _full_scans(bare, QUERIES["dream_team"].text("sqlite"), DERIVED_TABLES["dream_team"])
+
+@pytest.mark.parametrize("name", INDEXED_QUERIES)
+def test_registered_query_has_no_full_scan(indexed, name):
+    sql = QUERIES[name].text("sqlite")
+    assert _full_scans(indexed, sql, DERIVED_TABLES.get(name, ())) == []
+
+def test_staff_by_country_seeks_the_country(indexed):
+    plan = _plan(indexed, QUERIES["staff_by_country"].text("sqlite"))
+    assert any(detail.startswith("SEARCH s USING INDEX idx_staff_birth_country (birth_country=?")
+               for detail in plan), plan
+
+def test_variable_length_queries_have_no_full_scan(indexed):
+    assert _full_scans(indexed, staff_stats_sql(25)) == []
+    assert _full_scans(indexed, dream_team_sql(2), DERIVED_TABLES["dream_team"]) == []
@@ -0,0 +1,81 @@
+"""Ranking, typo tolerance and incremental adds of search_index.SearchIndex"""
+import threading
+
+from search_index import SearchIndex, normalize
+
+def _rank(name, query):
+    text, words = normalize(query), normalize(query).split()
+    name = normalize(name)
+    if name == text:
+        return 0
+    if name.startswith(text):
+        return 1
+    return 2 if name.startswith(words[0]) else 3
+
+def _brute_force(entries, query, limit=10):
+    """(rank, length) of the best matches, ranking every indexed name"""
+    words = normalize(query).split()
+    keys = [(_rank(name, query), len(normalize(name))) for _, name in entries
+            if all(" " + word in " " + normalize(name) for word in words)]
+    return sorted(keys)[:limit]
+
+def test_best_matches_are_found_beyond_the_first_postings():
+    # Thousands of long "a..." names sort ahead of the short ones
+    entries = [(i, f"Aaron Aardvark Abernathy {i}") for i in range(1, 5001)]
+    entries += [(6001, "Ava"), (6002, "Zoe Ava"), (6003, "Amy Lee")]
+    index = SearchIndex()
+    index.build(entries)
+    assert index.search("a", 3) == [(6001, "Ava"), (6003, "Amy Lee"), (1, "Aaron Aardvark Abernathy 1")]
+    assert index.search("av", 2) == [(6001, "Ava"), (6002, "Zoe Ava")]
+
+def test_ranking_matches_a_full_scan():
+    first = ["Meryl", "Tom", "Tomas", "Cate", "Penélope", "Emma"]
+    last = ["Streep", "Hanks", "Tom", "Blanchett", "Cruz", "Stone"]
+    entries = [(i, f"{first[i % 6]} {last[i // 6 % 6]} {i:x}") for i in range(1, 3000)]
+    entries += [(9001, "Tom"), (9002, "Tom Hanks")]
+    index = SearchIndex()
+    index.build(entries[:2000])
+    index.add(entries[2000:])
+    for query in ["t", "tom", "to", "s", "tom h", "cate bl", "hanks tom", "pe", "1", "e"]:
+        got = [(_rank(name, query), len(normalize(name))) for _, name in index.search(query)]
+        assert got == _brute_force(entries, query), query
+
+def test_misspelled_names_fall_back_to_typo_tolerant_matches():
+    index = SearchIndex()
+    index.build([(1, "Meryl Streep"), (2, "Tom Hanks"), (3, "Denzel Washington"), (4, "Tom Cruz")])
+    assert index.search("Merly") == [(1, "Meryl Streep")]
+    assert index.search("washingon") == [(3, "Denzel Washington")]
+    assert index.search("tom hnaks") == [(2, "Tom Hanks")]
+    assert index.search("streeep") == [(1, "Meryl Streep")]
+    # Prefix matches win over typo matches, and short words need an exact prefix
+    assert index.search("tom")[0] == (4, "Tom Cruz")
+    assert index.search("tmo") == []
+    assert index.search("qqqqqq") == []
+
+def test_add_renames_and_extends():
+    index = SearchIndex()
+    index.build([(1, "Meryl Streep"), (2, "Tom Hanks")])
+    index.add([(2, "Thomas Hanks"), (3, "Cate Blanchett")])
+    assert index.search("tom") == []
+    assert index.search("thomas") == [(2, "Thomas Hanks")]
+    assert index.search("cate") == [(3, "Cate Blanchett")]
+    assert index.max_id == 3
+    assert len(index) == 3
+    # The trigram index is rebuilt after an add
+    assert index.search("blanchet") == [(3, "Cate Blanchett")]
+
+def test_search_is_not_blocked_while_add_reads_its_entries():
+    index = SearchIndex()
+    index.build([(1, "Meryl Streep")])
+    results = []
+
+    def entries():
+        # A search on another thread must finish while the add is still reading
+        searcher = threading.Thread(target=lambda: results.append(index.search("meryl")))
+        searcher.start()
+        searcher.join(timeout=5)
+        yield 2, "Tom Hanks"
+
+    index.add(entries())
+    assert results == [[(1, "Meryl Streep")]]
+    assert index.search("tom") == [(2, "Tom Hanks")]
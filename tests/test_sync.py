@@ -0,0 +1,174 @@
+"""SyncEngine.sync_table against a SQLite source whose streams can be cut off"""
+import shutil
+from contextlib import contextmanager
+
+import pytest
+
+from database import SQLiteBackend
+from snapshot import MIRRORED_TABLES, SnapshotStore
+from sync import SyncEngine
+
+BATCH_SIZE = 100
+STAFF = next(spec for spec in MIRRORED_TABLES if spec.name == "staff")
+OSCARS = next(spec for spec in MIRRORED_TABLES if spec.name == "oscars")
+
+class FlakySource:
+    """SQLite source that drops the next ``failures`` streams after ``fail_after`` batches"""
+
+    def __init__(self, path):
+        self.backend = SQLiteBackend(path)
+        self.failures = 0
+        self.fail_after = 0
+        self.streams = []  # parameters each delta stream was started with
+
+    @contextmanager
+    def connection(self):
+        connection = self.backend.connect()
+        try:
+            yield FlakyConnection(self, connection)
+        finally:
+            connection.close()
+
+    def rows(self, spec):
+        """Every row of a table, read past the failure injection"""
+        connection = self.backend.connect()
+        try:
+            sql = f"SELECT {', '.join(spec.columns)} FROM {spec.name} ORDER BY {spec.key}"
+            return [tuple(row.values()) for row in connection.raw.execute(sql)]
+        finally:
+            connection.close()
+
+    def execute(self, sql, params=()):
+        connection = self.backend.connect()
+        try:
+            connection.raw.execute(sql, params)
+        finally:
+            connection.close()
+
+class FlakyConnection:
+    def __init__(self, source, connection):
+        self.source = source
+        self.connection = connection
+
+    def cursor(self, cursor_class=None):
+        return FlakyCursor(self.source, self.connection.cursor(cursor_class))
+
+class FlakyCursor:
+    def __init__(self, source, cursor):
+        self.source = source
+        self.cursor = cursor
+        self.batches = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.cursor.close()
+
+    def execute(self, sql, params=()):
+        self.source.streams.append(tuple(params))
+        return self.cursor.execute(sql, params)
+
+    def fetchmany(self, size):
+        if self.source.failures and self.batches == self.source.fail_after:
+            self.source.failures -= 1
+            raise ConnectionError("connection lost")
+        self.batches += 1
+        return self.cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+class RecordingStore(SnapshotStore):
+    """Snapshot store that remembers the key of every row applied"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.applied = []
+
+    def apply_batch(self, spec, rows, watermark):
+        super().apply_batch(spec, rows, watermark)
+        self.applied.extend(row[spec.key] for row in rows)
+
+    def rows(self, spec):
+        return [tuple(row.values()) for row in
+                self._query(f"SELECT {', '.join(spec.columns)} FROM {spec.name} ORDER BY {spec.key}")]
+
+@pytest.fixture
+def source(seeded_path, tmp_path):
+    path = str(tmp_path / "source.db")
+    shutil.copy(seeded_path, path)
+    return FlakySource(path)
+
+@pytest.fixture
+def store(tmp_path):
+    store = RecordingStore(str(tmp_path / "snapshot.db"))
+    yield store
+    store.close()
+
+def _engine(source, store, max_retries=3):
+    return SyncEngine(source.connection, store, MIRRORED_TABLES, batch_size=BATCH_SIZE,
+                      max_retries=max_retries, retry_delay=0.0)
+
+def test_failed_stream_resumes_from_the_last_committed_batch(source, store):
+    expected = source.rows(OSCARS)
+    assert len(expected) > 3 * BATCH_SIZE
+    source.failures, source.fail_after = 1, 3
+
+    stats = _engine(source, store).sync_table(OSCARS)
+
+    assert stats.retries == 1
+    assert stats.rows == len(expected)
+    # The retry starts after the third batch instead of from the beginning
+    assert source.streams == [(), (expected[3 * BATCH_SIZE - 1][0],)]
+    assert sorted(store.applied) == [row[0] for row in expected]
+    assert store.rows(OSCARS) == expected
+    assert store.watermarks()["oscars"] == expected[-1][0]
+
+def test_failure_before_the_first_batch_restarts_from_the_watermark(source, store):
+    engine = _engine(source, store)
+    engine.sync_table(OSCARS)
+    watermark = store.watermarks()["oscars"]
+    source.execute("INSERT INTO oscars (id, staff_id, movie_id, category, year) "
+                   "VALUES (?, 1, 1, 'Best Actor', 2024)", (watermark + 1,))
+    store.applied.clear()
+    source.streams.clear()
+    source.failures, source.fail_after = 2, 0
+
+    stats = engine.sync_table(OSCARS, watermark)
+
+    assert stats.retries == 2
+    assert source.streams == [(watermark,)] * 3
+    assert store.applied == [watermark + 1]
+    assert store.rows(OSCARS) == source.rows(OSCARS)
+
+def test_gives_up_after_max_retries(source, store):
+    source.failures, source.fail_after = 10, 1
+    with pytest.raises(ConnectionError):
+        _engine(source, store, max_retries=2).sync_table(OSCARS)
+    # The first attempt and two retries
+    assert len(source.streams) == 3
+    assert source.failures == 7
+    # Each attempt committed one batch, kept for the next sync to resume from
+    assert store.watermarks()["oscars"] == source.rows(OSCARS)[3 * BATCH_SIZE - 1][0]
+
+def test_full_sync_rereads_rows_changed_in_place(source, store):
+    engine = _engine(source, store)
+    engine.sync_table(STAFF)
+    watermark = store.watermarks()["staff"]
+    source.execute("UPDATE staff SET is_alive = 0, name = 'Renamed' WHERE id = 1")
+
+    # An id watermark does not see the update
+    assert engine.sync_table(STAFF, watermark).rows == 0
+    assert store.rows(STAFF)[0][1] != "Renamed"
+
+    store.applied.clear()
+    source.failures, source.fail_after = 1, 2
+    stats = engine.sync_table(STAFF, watermark, full=True)
+
+    expected = source.rows(STAFF)
+    assert stats.full and stats.retries == 1
+    assert source.streams[-2:] == [(), (expected[2 * BATCH_SIZE - 1][0],)]
+    assert sorted(store.applied) == [row[0] for row in expected]
+    assert store.rows(STAFF) == expected
+    assert "staff" in store.refreshed_at()